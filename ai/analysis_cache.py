@@ -0,0 +1,163 @@
+"""
+FunctionGemma Analysis Cache
+
+Bounded in-memory LRU cache with a TTL for FunctionGemma function calls.
+Market text doesn't change between scans, so sentiment, mispricing and
+risk answers for a pair can be reused until they expire.
+
+Keys are the function name plus its inputs, normalized: text is lowercased
+with whitespace collapsed, and numbers (prices, match confidence) are
+bucketed so a one-cent move still hits the cached answer. Safe to share
+between the analyzer's worker threads.
+
+With a store (db.analysis_store.AnalysisStore) the cache becomes the hot
+tier of a persistent one: memory misses are looked up on disk, answers
+are written through, and prefetch() loads many calls in one read.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+DEFAULT_CACHE_SIZE = 2048
+DEFAULT_CACHE_TTL = 3600.0   # seconds; four 15-minute scans
+DEFAULT_PRICE_BUCKET = 0.05  # numeric inputs are rounded to this step
+
+
+def normalize_inputs(inputs: Dict[str, Any], price_bucket: float = DEFAULT_PRICE_BUCKET) -> Dict[str, Any]:
+    """
+    Inputs with formatting noise removed, for use in a cache key.
+
+    Args:
+        inputs: Function inputs
+        price_bucket: Width of the buckets numeric inputs are rounded to
+
+    Returns:
+        Normalized copy of inputs
+    """
+    normalized = {}
+    for name, value in inputs.items():
+        if isinstance(value, str):
+            value = " ".join(value.lower().split())
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and price_bucket:
+            value = round(round(value / price_bucket) * price_bucket, 6)
+        normalized[name] = value
+    return normalized
+
+
+class AnalysisCache:
+    """LRU + TTL cache of FunctionGemma outputs with hit/miss counters."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE, ttl: float = DEFAULT_CACHE_TTL,
+                 price_bucket: float = DEFAULT_PRICE_BUCKET, store=None):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Entries kept before the least recently used is dropped
+            ttl: Seconds an entry stays valid
+            price_bucket: Width of the buckets numeric inputs are rounded to
+            store: Optional AnalysisStore backing the cache on disk
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.price_bucket = price_bucket
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, output)
+        self._lock = threading.Lock()
+        self.store = store
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.store_hits = 0  # hits served from disk (counted in hits too)
+
+    def key(self, function_name: str, inputs: Dict[str, Any]) -> str:
+        """Cache key for a function call."""
+        return json.dumps([function_name, normalize_inputs(inputs, self.price_bucket)], sort_keys=True)
+
+    def get(self, function_name: str, inputs: Dict[str, Any]) -> Optional[Dict]:
+        """
+        Cached output for a call, or None on a miss (counted).
+        """
+        key = self.key(function_name, inputs)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        stored = self.store.get(key) if self.store is not None else None
+        with self._lock:
+            if stored is None:
+                self.misses += 1
+                return None
+            self._insert(key, stored["output"], stored["expires_at"])
+            self.hits += 1
+            self.store_hits += 1
+        return stored["output"]
+
+    def put(self, function_name: str, inputs: Dict[str, Any], output: Dict):
+        """Store an output (empty outputs, i.e. failed calls, are not cached)."""
+        if not output:
+            return
+        key = self.key(function_name, inputs)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, output)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        if self.store is not None:
+            self.store.put(key, function_name, output, self.ttl)
+
+    def _insert(self, key: str, output: Dict, expires_at: float):
+        """Add a stored answer to memory, keeping its wall-clock expiry (lock held)."""
+        self._entries[key] = (time.monotonic() + expires_at - time.time(), output)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def prefetch(self, calls: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Load the stored answers for many calls into memory in one bulk read.
+
+        Args:
+            calls: (function_name, inputs) pairs
+
+        Returns:
+            Number of answers loaded
+        """
+        if self.store is None:
+            return 0
+        with self._lock:
+            keys = [key for key in (self.key(name, inputs) for name, inputs in calls)
+                    if key not in self._entries]
+        stored = self.store.get_many(keys)
+        with self._lock:
+            for key, entry in stored.items():
+                self._insert(key, entry["output"], entry["expires_at"])
+        return len(stored)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        """Hits, misses, expired entries, size and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "store_hits": self.store_hits,
+            "size": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,208 @@
+"""
+Background Opportunity Enrichment
+
+Takes AI (FunctionGemma) and ML scoring off the scan's critical path. The
+scanner logs and reports opportunities as soon as they are priced, then
+submits them here; a small pool of worker threads analyzes them in
+batches and hands every enriched opportunity to the registered callbacks
+(database row update, dashboard, console).
+
+The queue is bounded. When it is full, submit() either drops the oldest
+waiting opportunity (default - a stale opportunity is worth less than a
+fresh one) or blocks the producer until a worker frees a slot. Depth,
+high-water mark, drops and enrichment latency are exposed by stats().
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+from core.opportunity import Opportunity
+
+OVERFLOW_POLICIES = ("drop_oldest", "block")
+
+
+class EnrichmentQueue:
+    """Bounded queue + worker pool adding AI and ML scores to opportunities."""
+
+    def __init__(self, analyzer=None, scorer=None, workers: int = 2, max_depth: int = 200,
+                 batch_size: int = 8, overflow: str = "drop_oldest",
+                 callbacks: Iterable[Callable[[Opportunity], None]] = ()):
+        """
+        Initialize queue and start the workers.
+
+        Args:
+            analyzer: FunctionGemmaAnalyzer (None = no AI analysis)
+            scorer: OpportunityScorer (None = no ML score)
+            workers: Worker threads
+            max_depth: Opportunities waiting before the overflow policy applies
+            batch_size: Most opportunities a worker takes per analyzer call
+            overflow: "drop_oldest" or "block" when the queue is full
+            callbacks: Called with each enriched opportunity (from a worker thread)
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        self.analyzer = analyzer
+        self.scorer = scorer
+        self.max_depth = max_depth
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self.callbacks: List[Callable[[Opportunity], None]] = list(callbacks)
+
+        self._queue = deque()  # (enqueued_at, opportunity)
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._busy = 0
+        self._closed = False
+
+        self.submitted = 0
+        self.enriched = 0
+        self.dropped = 0
+        self.failed = 0
+        self.high_water = 0
+        self._latency_total = 0.0
+
+        self._workers = [
+            threading.Thread(target=self._run, name=f"enricher-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, opportunities: Iterable[Opportunity], timeout: Optional[float] = None) -> int:
+        """
+        Queue opportunities for enrichment; returns immediately unless the
+        overflow policy is "block" and the queue is full.
+
+        Args:
+            opportunities: Opportunities to enrich
+            timeout: Longest wait for a free slot under "block" (None = no limit);
+                     opportunities that still don't fit are dropped
+
+        Returns:
+            Number of opportunities dropped (oldest waiting or, on a block
+            timeout, the ones submitted)
+        """
+        dropped = 0
+        with self._lock:
+            for opportunity in opportunities:
+                if len(self._queue) >= self.max_depth:
+                    if self.overflow == "drop_oldest":
+                        self._queue.popleft()
+                        dropped += 1
+                    elif not self._not_full.wait_for(lambda: len(self._queue) < self.max_depth, timeout):
+                        dropped += 1
+                        continue
+                self._queue.append((time.monotonic(), opportunity))
+                self.submitted += 1
+                self.high_water = max(self.high_water, len(self._queue))
+                self._not_empty.notify()
+            self.dropped += dropped
+        return dropped
+
+    def enrich(self, opportunities: List[Opportunity]):
+        """
+        Add AI analysis and ML score to opportunities in place (the unit of
+        work of a worker; also usable inline).
+        """
+        if self.analyzer is not None:
+            try:
+                analyses = self.analyzer.analyze_opportunities([{
+                    "kalshi_market": opportunity.kalshi_market,
+                    "polymarket_market": opportunity.polymarket_market,
+                    "match_confidence": opportunity.match_confidence,
+                    "net_profit": opportunity.net_profit,
+                    "roi": opportunity.roi
+                } for opportunity in opportunities])
+
+                for opportunity, ai_analysis in zip(opportunities, analyses):
+                    opportunity.ai_analysis = ai_analysis
+                    opportunity.ai_score = ai_analysis.get("ai_score", 0.5)
+                    opportunity.ai_recommendation = ai_analysis.get("recommendation", "UNKNOWN")
+
+            except Exception as e:
+                print(f"  ⚠️  AI analysis failed: {e}")
+                for opportunity in opportunities:
+                    opportunity.ai_analysis = None
+                    opportunity.ai_score = 0.5
+                    opportunity.ai_recommendation = "AI_ERROR"
+
+        if self.scorer is not None:
+            for opportunity in opportunities:
+                try:
+                    result = self.scorer.score_opportunity(opportunity)
+                    opportunity.ml_score = result.get("ml_score")
+                    opportunity.ml_recommendation = result.get("ml_recommendation")
+                except Exception as e:
+                    print(f"  ⚠️  ML scoring failed: {e}")
+                    opportunity.ml_recommendation = "ML_ERROR"
+
+    def _run(self):
+        """Worker loop: take a batch, enrich it, report each opportunity."""
+        while True:
+            with self._lock:
+                self._not_empty.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                self._busy += 1
+                self._not_full.notify_all()
+
+            opportunities = [opportunity for _, opportunity in batch]
+            try:
+                self.enrich(opportunities)
+                for opportunity in opportunities:
+                    for callback in self.callbacks:
+                        callback(opportunity)
+                ok = True
+            except Exception as e:
+                print(f"  ⚠️  Enrichment failed: {e}")
+                ok = False
+
+            done = time.monotonic()
+            with self._lock:
+                self._busy -= 1
+                if ok:
+                    self.enriched += len(batch)
+                    self._latency_total += sum(done - enqueued for enqueued, _ in batch)
+                else:
+                    self.failed += len(batch)
+                self._idle.notify_all()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued opportunity has been enriched.
+
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        with self._lock:
+            return self._idle.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Finish queued work and stop the workers."""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+        for worker in self._workers:
+            worker.join(timeout)
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict:
+        """Queue depth, high-water mark, counters and mean enrichment latency."""
+        with self._lock:
+            return {
+                "depth": len(self._queue),
+                "high_water": self.high_water,
+                "in_flight": self._busy,
+                "submitted": self.submitted,
+                "enriched": self.enriched,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "avg_latency": self._latency_total / self.enriched if self.enriched else 0.0,
+            }
@@ -6,10 +6,41 @@ FunctionGemma is optimal for this because:
 2. Function calling (can trigger different analysis types)
 3. Lightweight 270M params (extremely fast, <1s inference)
 4. Optimized for metadata extraction
+
+An opportunity needs three analyses (sentiment, mispricing, risk). By
+default they are sent to Ollama concurrently, so one opportunity costs
+about one model round-trip instead of three (Ollama runs them in parallel
+when OLLAMA_NUM_PARALLEL > 1). mode="fused" asks for all three in a single
+prompt instead, and falls back to separate calls for any section missing
+from the answer.
+
+Answers are cached in memory (AnalysisCache, LRU + TTL) keyed by function
+and normalized inputs, so repeat scans of the same pairs skip the model.
+With an AnalysisStore the cache is also kept on disk, tagged with
+model_version, so a restarted process starts warm.
+
+analyze_opportunities() handles a whole scan: uncached calls for many
+opportunities are packed into a few prompts (as many as fit the model's
+context window) and the JSON array answer is split back per opportunity;
+items missing from the answer are retried one call at a time.
 """
 import requests
 import json
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from ai.analysis_cache import AnalysisCache, DEFAULT_CACHE_SIZE, DEFAULT_CACHE_TTL
+
+ANALYSIS_MODES = ("concurrent", "sequential", "fused")
+PROMPT_VERSION = 1  # bump when prompts change, so stored answers are not reused
+PARALLEL_CALLS = 3  # sentiment, mispricing, risk
+
+# Batch sizing: prompt tokens are estimated from characters, and each
+# requested function reserves room for its answer
+DEFAULT_CONTEXT_TOKENS = 8192
+CHARS_PER_TOKEN = 4
+OUTPUT_TOKENS_PER_FUNCTION = 96
+MAX_BATCH_SIZE = 16
 
 class FunctionGemmaAnalyzer:
     """
@@ -22,9 +53,45 @@ class FunctionGemmaAnalyzer:
     - Fast inference (270M params)
     """
     
-    def __init__(self, endpoint="http://192.168.1.176:11434/api/generate"):
+    def __init__(self, endpoint="http://192.168.1.176:11434/api/generate",
+                 mode="concurrent", timeout=10,
+                 cache_ttl=DEFAULT_CACHE_TTL, cache_size=DEFAULT_CACHE_SIZE,
+                 store=None, context_tokens=DEFAULT_CONTEXT_TOKENS, max_batch_size=MAX_BATCH_SIZE):
+        """
+        Initialize analyzer.
+        
+        Args:
+            endpoint: Ollama /api/generate URL
+            mode: How analyze_opportunity calls the model: "concurrent" (three
+                  calls at once), "sequential" (one after another) or "fused"
+                  (one prompt returning all three sections)
+            timeout: Seconds to wait for each model call
+            cache_ttl: Seconds a cached answer is reused (0 disables the cache)
+            cache_size: Answers kept in the cache
+            store: Optional AnalysisStore persisting the cache (its model_version
+                   is set to this analyzer's model_version)
+            context_tokens: Model context window; batches are sized to fit it
+            max_batch_size: Most opportunities packed into one batch prompt
+        """
+        if mode not in ANALYSIS_MODES:
+            raise ValueError(f"mode must be one of {ANALYSIS_MODES}, got {mode!r}")
         self.endpoint = endpoint
         self.model = "functiongemma:2b"  # Or gemma:2b if FunctionGemma not available
+        self.mode = mode
+        self.timeout = timeout
+        self.context_tokens = context_tokens
+        self.max_batch_size = max_batch_size
+        
+        # Pooled keep-alive connections, shared by the concurrent calls
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=PARALLEL_CALLS)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=PARALLEL_CALLS, thread_name_prefix="functiongemma")
+        self.model_version = f"{self.model}/prompt-v{PROMPT_VERSION}"
+        if store is not None:
+            store.model_version = self.model_version
+        self.cache = AnalysisCache(cache_size, cache_ttl, store=store) if cache_ttl else None
         
         # Define analysis functions for FunctionGemma
         self.functions = {
@@ -67,39 +134,44 @@ class FunctionGemmaAnalyzer:
             }
         }
     
-    def _call_function(self, function_name: str, **kwargs) -> Dict:
+    def _generate(self, prompt: str) -> Dict:
         """
-        Call a FunctionGemma function with structured output.
+        Send one prompt to Ollama and parse the JSON answer.
         
-        FunctionGemma is designed for this - it will return clean JSON.
+        Returns:
+            Parsed JSON object ({} on error, invalid JSON or a non-object answer)
         """
-        func_def = self.functions.get(function_name)
-        if not func_def:
-            return {}
+        parsed = self._generate_json(prompt)
+        return parsed if isinstance(parsed, dict) else {}
+    
+    def _generate_json(self, prompt: str, timeout: Optional[float] = None,
+                       num_ctx: Optional[int] = None):
+        """
+        Send one prompt to Ollama and parse the answer as any JSON value.
         
-        # Build prompt for FunctionGemma
-        prompt = f"""Function: {function_name}
-Description: {func_def['description']}
-
-Input:
-{json.dumps(kwargs, indent=2)}
-
-Expected output format:
-{json.dumps(func_def['parameters']['return'], indent=2)}
-
-Generate output as valid JSON:"""
+        Args:
+            prompt: Prompt text
+            timeout: Seconds to wait (default self.timeout)
+            num_ctx: Context window to request (default: the model's own)
+        
+        Returns:
+            Parsed JSON (None on error or invalid JSON)
+        """
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "format": "json",  # Force JSON output
+            "temperature": 0.3,  # Low temp for consistent outputs
+        }
+        if num_ctx:
+            payload["options"] = {"num_ctx": num_ctx}
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.endpoint,
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "format": "json",  # Force JSON output
-                    "temperature": 0.3,  # Low temp for consistent outputs
-                },
-                timeout=10  # FunctionGemma is FAST
+                json=payload,
+                timeout=timeout or self.timeout  # FunctionGemma is FAST
             )
             
             if response.status_code == 200:
@@ -112,12 +184,128 @@ Generate output as valid JSON:"""
                 except json.JSONDecodeError:
                     # FunctionGemma should always return valid JSON
                     print(f"Warning: Invalid JSON from FunctionGemma: {output_text}")
-                    return {}
+                    return None
             
         except Exception as e:
             print(f"Error calling FunctionGemma: {e}")
         
-        return {}
+        return None
+    
+    def _call_function(self, function_name: str, **kwargs) -> Dict:
+        """
+        Call a FunctionGemma function with structured output, from the
+        cache when the same (normalized) call was answered recently.
+        """
+        if self.cache is None:
+            return self._call_uncached(function_name, **kwargs)
+        
+        output = self.cache.get(function_name, kwargs)
+        if output is None:
+            output = self._call_uncached(function_name, **kwargs)
+            self.cache.put(function_name, kwargs, output)
+        return output
+    
+    def _call_uncached(self, function_name: str, **kwargs) -> Dict:
+        """
+        Query FunctionGemma for one function.
+        
+        FunctionGemma is designed for this - it will return clean JSON.
+        """
+        func_def = self.functions.get(function_name)
+        if not func_def:
+            return {}
+        
+        # Build prompt for FunctionGemma
+        prompt = f"""Function: {function_name}
+Description: {func_def['description']}
+
+Input:
+{json.dumps(kwargs, indent=2)}
+
+Expected output format:
+{json.dumps(func_def['parameters']['return'], indent=2)}
+
+Generate output as valid JSON:"""
+        
+        return self._generate(prompt)
+    
+    def _call_fused(self, calls: Dict[str, Dict]) -> Dict[str, Dict]:
+        """
+        Run several FunctionGemma functions from a single prompt.
+        
+        Args:
+            calls: function name -> inputs
+        
+        Returns:
+            function name -> output; cached sections are not asked for, and
+            sections missing from the answer are filled by separate calls
+        """
+        results = {}
+        if self.cache is not None:
+            for name, inputs in calls.items():
+                cached = self.cache.get(name, inputs)
+                if cached is not None:
+                    results[name] = cached
+        calls = {name: inputs for name, inputs in calls.items() if name not in results}
+        if len(calls) <= 1:
+            results.update((name, self._call_remember(name, inputs)) for name, inputs in calls.items())
+            return results
+        
+        sections = "\n\n".join(
+            f"""Function: {name}
+Description: {self.functions[name]['description']}
+Input:
+{json.dumps(inputs, indent=2)}
+Output format:
+{json.dumps(self.functions[name]['parameters']['return'], indent=2)}"""
+            for name, inputs in calls.items()
+        )
+        prompt = f"""Run each function below on its own input.
+
+{sections}
+
+Generate output as one valid JSON object with a key per function name ({", ".join(calls)}):"""
+        
+        output = self._generate(prompt)
+        for name, inputs in calls.items():
+            section = output.get(name)
+            if isinstance(section, dict) and section:
+                results[name] = section
+                if self.cache is not None:
+                    self.cache.put(name, inputs, section)
+            else:
+                results[name] = self._call_remember(name, inputs)
+        return results
+    
+    def _call_remember(self, function_name: str, inputs: Dict) -> Dict:
+        """Uncached call whose answer is stored in the cache (lookup already missed)."""
+        output = self._call_uncached(function_name, **inputs)
+        if self.cache is not None:
+            self.cache.put(function_name, inputs, output)
+        return output
+    
+    def prefetch(self, opportunities) -> int:
+        """
+        Warm the cache from the persistent store for many pairs at once.
+        
+        Args:
+            opportunities: Dicts with kalshi_market, polymarket_market and
+                           match_confidence (e.g. matched pairs at startup)
+        
+        Returns:
+            Number of stored answers loaded
+        """
+        if self.cache is None:
+            return 0
+        return self.cache.prefetch(
+            (name, inputs)
+            for opportunity in opportunities
+            for name, inputs in self._analysis_calls(opportunity).items()
+        )
+    
+    def cache_stats(self) -> Dict:
+        """Hit/miss counters of the analysis cache ({} when disabled)."""
+        return self.cache.stats() if self.cache is not None else {}
     
     def analyze_sentiment(self, market_text: str) -> Dict:
         """
@@ -170,28 +358,158 @@ Generate output as valid JSON:"""
             match_confidence=match_confidence
         )
     
+    def _batch_header(self) -> str:
+        """Instructions shared by every batch prompt."""
+        functions = "\n\n".join(
+            f"""Function: {name}
+Description: {func_def['description']}
+Output format:
+{json.dumps(func_def['parameters']['return'])}"""
+            for name, func_def in self.functions.items()
+        )
+        return f"""Each item below lists functions to run, with the inputs for each.
+
+{functions}
+
+Generate output as one valid JSON object {{"results": [...]}} with one entry per item,
+{{"id": <item id>, <function name>: <output>, ...}}, covering every function the item lists.
+
+Items:
+"""
+    
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        return len(text) // CHARS_PER_TOKEN + 1
+    
+    def _plan_batches(self, pending: List[Tuple[int, Dict[str, Dict]]]) -> List[List[Tuple[int, Dict[str, Dict]]]]:
+        """
+        Split pending (opportunity index, calls) items into batches that fit
+        the context window, leaving room for every item's answer.
+        """
+        budget = self.context_tokens - self._estimate_tokens(self._batch_header())
+        batches, current, used = [], [], 0
+        for item in pending:
+            cost = (self._estimate_tokens(json.dumps(item[1]))
+                    + OUTPUT_TOKENS_PER_FUNCTION * len(item[1]))
+            if current and (used + cost > budget or len(current) >= self.max_batch_size):
+                batches.append(current)
+                current, used = [], 0
+            current.append(item)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _call_batch(self, batch: List[Tuple[int, Dict[str, Dict]]]) -> List[Dict]:
+        """
+        Run one batch prompt.
+        
+        Returns:
+            Answer per batch item, in order ({} for items missing from the answer)
+        """
+        items = [{"id": k, **calls} for k, (_, calls) in enumerate(batch)]
+        # Answer time grows with the batch, so the timeout does too
+        output = self._generate_json(self._batch_header() + json.dumps(items),
+                                     timeout=self.timeout * len(batch), num_ctx=self.context_tokens)
+        
+        # Accept {"results": [...]} or a bare array
+        entries = output.get("results") if isinstance(output, dict) else output
+        if not isinstance(entries, list):
+            entries = []
+        by_id = {entry.get("id"): entry for entry in entries if isinstance(entry, dict)}
+        return [by_id.get(k) or {} for k in range(len(batch))]
+    
+    def analyze_opportunities(self, opportunities: List[Dict]) -> List[Dict]:
+        """
+        Analyze many opportunities with batched prompts.
+        
+        Cached answers are used as is; the remaining calls are packed into
+        context-sized batches (sent in parallel), and any function missing or
+        malformed in a batch answer is retried as a single call.
+        
+        Args:
+            opportunities: Dicts as taken by analyze_opportunity
+        
+        Returns:
+            List of analyze_opportunity results, in the same order
+        """
+        results: List[Dict[str, Dict]] = [{} for _ in opportunities]
+        pending = []
+        for i, opportunity in enumerate(opportunities):
+            calls = self._analysis_calls(opportunity)
+            if self.cache is not None:
+                for name, inputs in calls.items():
+                    cached = self.cache.get(name, inputs)
+                    if cached is not None:
+                        results[i][name] = cached
+            missing = {name: inputs for name, inputs in calls.items() if name not in results[i]}
+            if missing:
+                pending.append((i, missing))
+        
+        batches = self._plan_batches(pending)
+        retries = []
+        for batch, answers in zip(batches, self._pool.map(self._call_batch, batches)):
+            for (i, calls), answer in zip(batch, answers):
+                for name, inputs in calls.items():
+                    section = answer.get(name)
+                    if isinstance(section, dict) and section:
+                        results[i][name] = section
+                        if self.cache is not None:
+                            self.cache.put(name, inputs, section)
+                    else:
+                        retries.append((i, name, inputs))
+        
+        if retries:
+            print(f"  ↻ Retrying {len(retries)} malformed batch answers individually")
+            outputs = self._pool.map(lambda retry: self._call_remember(retry[1], retry[2]), retries)
+            for (i, name, _), output in zip(retries, outputs):
+                results[i][name] = output
+        
+        return [self._summarize(r) for r in results]
+    
+    @staticmethod
+    def _analysis_calls(opportunity: Dict) -> Dict[str, Dict]:
+        """FunctionGemma calls (function name -> inputs) that analyze one opportunity."""
+        return {
+            # 1. Sentiment analysis
+            "analyze_sentiment": {
+                "market_text": f"{opportunity['kalshi_market']} / {opportunity['polymarket_market']}"
+            },
+            # 2. Mispricing detection
+            "detect_mispricing": {"market_text": opportunity['kalshi_market']},
+            # 3. Risk assessment
+            "assess_risk": {
+                "kalshi_market": opportunity['kalshi_market'],
+                "polymarket_market": opportunity['polymarket_market'],
+                "match_confidence": opportunity.get('match_confidence', 0.5)
+            },
+        }
+    
     def analyze_opportunity(self, opportunity: Dict) -> Dict:
         """
         Comprehensive analysis of an arbitrage opportunity.
         
-        Calls multiple FunctionGemma functions and combines results.
+        Calls multiple FunctionGemma functions (as set by self.mode) and
+        combines results.
         """
-        # 1. Sentiment analysis
-        sentiment = self.analyze_sentiment(
-            f"{opportunity['kalshi_market']} / {opportunity['polymarket_market']}"
-        )
+        calls = self._analysis_calls(opportunity)
         
-        # 2. Mispricing detection
-        mispricing = self.detect_mispricing(
-            opportunity['kalshi_market']
-        )
+        if self.mode == "fused":
+            results = self._call_fused(calls)
+        elif self.mode == "concurrent":
+            futures = {name: self._pool.submit(self._call_function, name, **inputs)
+                       for name, inputs in calls.items()}
+            results = {name: future.result() for name, future in futures.items()}
+        else:
+            results = {name: self._call_function(name, **inputs) for name, inputs in calls.items()}
         
-        # 3. Risk assessment
-        risk = self.assess_risk(
-            opportunity['kalshi_market'],
-            opportunity['polymarket_market'],
-            opportunity.get('match_confidence', 0.5)
-        )
+        return self._summarize(results)
+    
+    def _summarize(self, results: Dict[str, Dict]) -> Dict:
+        """Combine the three function outputs into the analysis result."""
+        sentiment = results.get("analyze_sentiment", {})
+        mispricing = results.get("detect_mispricing", {})
+        risk = results.get("assess_risk", {})
         
         # 4. Combined AI score
         ai_score = self._calculate_combined_score(sentiment, mispricing, risk)
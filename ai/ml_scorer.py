@@ -12,7 +12,8 @@ from sklearn.model_selection import train_test_split
 import joblib
 import os
 from typing import Dict, Optional
-from datetime import datetime
+
+from core.opportunity import Opportunity
 
 
 class OpportunityScorer:
@@ -29,7 +30,7 @@ class OpportunityScorer:
         if os.path.exists(model_path):
             self.load()
     
-    def extract_features(self, opportunity: Dict) -> np.array:
+    def extract_features(self, opportunity: Opportunity) -> np.array:
         """
         Extract ML features from opportunity.
         
@@ -47,34 +48,26 @@ class OpportunityScorer:
         11. mispricing_likelihood - AI mispricing signal
         12. risk_score - AI risk assessment
         """
-        # Parse prices
-        k_prices = opportunity.get('kalshi_prices', 'YES: $0.5, NO: $0.5')
-        p_prices = opportunity.get('polymarket_prices', 'YES: $0.5, NO: $0.5')
-        
-        k_yes, k_no = self._parse_prices(k_prices)
-        p_yes, p_no = self._parse_prices(p_prices)
-        
-        # Time features
-        timestamp = opportunity.get('timestamp', datetime.now())
-        if isinstance(timestamp, str):
-            timestamp = datetime.fromisoformat(timestamp)
+        k_yes, k_no = opportunity.kalshi_yes_price, opportunity.kalshi_no_price
+        p_yes, p_no = opportunity.polymarket_yes_price, opportunity.polymarket_no_price
+        timestamp = opportunity.timestamp
         
         # AI features
-        ai_analysis = opportunity.get('ai_analysis', {})
+        ai_analysis = opportunity.ai_analysis
         sentiment = ai_analysis.get('sentiment', {}) if ai_analysis else {}
         mispricing = ai_analysis.get('mispricing', {}) if ai_analysis else {}
         risk = ai_analysis.get('risk', {}) if ai_analysis else {}
         
         features = [
-            opportunity.get('match_confidence', 0.5),
-            opportunity.get('net_profit', 0),
-            opportunity.get('roi', 0),
+            opportunity.match_confidence,
+            opportunity.net_profit,
+            opportunity.roi,
             abs(k_yes - p_yes),  # price_spread
             abs(k_yes - k_no),   # kalshi_spread
             abs(p_yes - p_no),   # poly_spread
             timestamp.hour,
             timestamp.weekday(),
-            opportunity.get('ai_score', 0.5),
+            opportunity.ai_score if opportunity.ai_score is not None else 0.5,
             sentiment.get('sentiment_score', 0),
             mispricing.get('mispricing_likelihood', 0),
             risk.get('overall_risk', 0.5)
@@ -82,16 +75,6 @@ class OpportunityScorer:
         
         return np.array(features).reshape(1, -1)
     
-    def _parse_prices(self, price_str: str) -> tuple:
-        """Parse 'YES: $0.45, NO: $0.55' into (0.45, 0.55)"""
-        try:
-            parts = price_str.split(',')
-            yes = float(parts[0].split('$')[1])
-            no = float(parts[1].split('$')[1])
-            return yes, no
-        except:
-            return 0.5, 0.5
-    
     def train_from_database(self, db_logger):
         """
         Train model from PostgreSQL data.
@@ -218,7 +201,7 @@ class OpportunityScorer:
         self.is_trained = True
         self.save()
     
-    def score_opportunity(self, opportunity: Dict) -> Dict:
+    def score_opportunity(self, opportunity: Opportunity) -> Dict:
         """
         Score an opportunity (0.0 to 1.0).
         
@@ -292,19 +275,21 @@ if __name__ == "__main__":
     scorer.train_from_mock_data(n_samples=200)
     
     # Test scoring
-    test_opp = {
-        'match_confidence': 0.85,
-        'net_profit': 0.12,
-        'roi': 2.5,
-        'kalshi_prices': 'YES: $0.45, NO: $0.55',
-        'polymarket_prices': 'YES: $0.42, NO: $0.58',
-        'ai_score': 0.75,
-        'timestamp': datetime.now(),
-        'ai_analysis': {
-            'sentiment': {'sentiment_score': 0.6},
-            'mispricing': {'mispricing_likelihood': 0.65},
-            'risk': {'overall_risk': 0.25}
-        }
+    test_opp = Opportunity(
+        kalshi_ticker='KXTEST', kalshi_market='Test market',
+        polymarket_id='0xtest', polymarket_market='Test market?',
+        kalshi_side='yes',
+        kalshi_yes_price=0.45, kalshi_no_price=0.55,
+        polymarket_yes_price=0.42, polymarket_no_price=0.58,
+        position_size=5.0, gross_profit=0.15, total_fees=0.03,
+        net_profit=0.12, roi=2.5,
+        match_confidence=0.85,
+    )
+    test_opp.ai_score = 0.75
+    test_opp.ai_analysis = {
+        'sentiment': {'sentiment_score': 0.6},
+        'mispricing': {'mispricing_likelihood': 0.65},
+        'risk': {'overall_risk': 0.25}
     }
     
     result = scorer.score_opportunity(test_opp)
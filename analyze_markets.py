@@ -1,22 +1,16 @@
 #!/usr/bin/env python3
 """Deep dive analysis of Kalshi market conditions"""
-import os, time, requests, base64
+import time
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
 import json
 
-load_dotenv()
+from core.kalshi_client import KalshiClient
+from core.orderbook import OrderBook
 
-key = os.getenv('KALSHI_KEY_ID')
-with open('kalshi.key', 'rb') as f:
-    pk = serialization.load_pem_private_key(f.read(), password=None)
+load_dotenv()
 
-def sign(method, path, ts):
-    msg = f'{ts}{method}{path}'
-    sig = pk.sign(msg.encode(), padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH), hashes.SHA256())
-    return base64.b64encode(sig).decode()
+client = KalshiClient(read_timeout=15)
 
 print("=" * 90)
 print("KALSHI MARKET ANALYSIS - LIQUIDITY & TRADING PATTERNS")
@@ -24,16 +18,12 @@ print(f"Analysis Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S %Z')}")
 print("=" * 90)
 
 # 1. Get all markets
-ts = str(int(time.time() * 1000))
-path = '/trade-api/v2/markets?limit=200&status=open'
-h = {'KALSHI-ACCESS-KEY': key, 'KALSHI-ACCESS-SIGNATURE': sign('GET', path, ts), 'KALSHI-ACCESS-TIMESTAMP': ts}
-r = requests.get('https://api.elections.kalshi.com' + path, headers=h, timeout=15)
+markets = client.get_markets(limit=200, status='open')
 
-if r.status_code != 200:
-    print(f"❌ API Error: {r.status_code}")
+if not markets:
+    print(f"❌ API Error: no markets returned")
     exit(1)
 
-markets = r.json().get('markets', [])
 print(f"\n📊 Total Open Markets: {len(markets)}\n")
 
 # 2. Analyze volume distribution
@@ -80,21 +70,16 @@ total_checked = 0
 
 for m in sample_markets[:30]:
     ticker = m.get('ticker', '')
-    ts = str(int(time.time() * 1000))
-    path = f'/trade-api/v2/markets/{ticker}/orderbook'
-    h = {'KALSHI-ACCESS-KEY': key, 'KALSHI-ACCESS-SIGNATURE': sign('GET', path, ts), 'KALSHI-ACCESS-TIMESTAMP': ts}
     
     try:
-        r = requests.get(f'https://api.elections.kalshi.com{path}', headers=h, timeout=5)
-        if r.status_code == 200:
-            ob = r.json().get('orderbook', {})
-            yes_asks = ob.get('yes', [])
-            yes_bids = ob.get('no', [])
+        ob = client.get_orderbook(ticker)
+        if ob is not None:
+            book = OrderBook.from_json(ob)
             
-            if yes_asks or yes_bids:
+            if not book.is_empty:
                 active_orderbooks += 1
                 print(f"✅ {ticker[:60]}")
-                print(f"   YES asks: {len(yes_asks)} | NO bids: {len(yes_bids)}")
+                print(f"   YES asks: {book.levels('yes')} | Implied YES bids: {book.levels('no')}")
             
             total_checked += 1
         time.sleep(0.3)
@@ -5,19 +5,15 @@ Replay historical data through trading strategies to validate profitability
 """
 
 import os
-import time
 import json
-import requests
-import base64
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from collections import defaultdict
 from dotenv import load_dotenv
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
 
 import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from core.fee_calculator import FeeCalculator
+from core.kalshi_client import KalshiClient
 from strategies.probability_arb import ProbabilityArbitrageDetector
 
 load_dotenv()
@@ -42,14 +38,7 @@ class KalshiBacktester:
         self.fee_calc = FeeCalculator(volume_30d)
         
         # Kalshi API
-        self.base = "https://api.elections.kalshi.com/trade-api/v2"
-        self.key = os.getenv("KALSHI_KEY_ID")
-        
-        try:
-            with open("/Users/rod/Antigravity/kalshi_bot/kalshi.key", "rb") as f:
-                self.pk = serialization.load_pem_private_key(f.read(), password=None)
-        except:
-            self.pk = None
+        self.client = KalshiClient()
         
         # Results tracking
         self.trades = []
@@ -59,46 +48,18 @@ class KalshiBacktester:
             'total_volume': 0
         })
     
-    def sign(self, method, path, ts):
-        """Sign API request"""
-        if not self.pk:
-            return "NONE"
-        msg = f"{ts}{method}{path}"
-        sig = self.pk.sign(
-            msg.encode(),
-            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
-            hashes.SHA256()
-        )
-        return base64.b64encode(sig).decode()
-    
-    def get_historical_markets(self, cursor=None):
+    def get_historical_markets(self):
         """
-        Fetch historical markets from Kalshi
+        Stream settled markets in the backtest window from Kalshi
         
         Note: Kalshi API doesn't have direct historical orderbook data,
         so we'll fetch settled markets and analyze their final prices
         """
-        ts = str(int(time.time() * 1000))
-        path = f"/trade-api/v2/markets?limit=200&status=settled"
-        
-        if cursor:
-            path += f"&cursor={cursor}"
-        
-        headers = {
-            "KALSHI-ACCESS-KEY": self.key,
-            "KALSHI-ACCESS-SIGNATURE": self.sign("GET", path, ts),
-            "KALSHI-ACCESS-TIMESTAMP": ts
-        }
-        
-        try:
-            r = requests.get(f"{self.base}/markets?limit=200&status=settled", headers=headers, timeout=10)
-            if r.status_code == 200:
-                data = r.json()
-                return data.get("markets", []), data.get("cursor")
-        except Exception as e:
-            print(f"Error fetching markets: {e}")
-        
-        return [], None
+        return self.client.iter_markets(
+            status="settled",
+            min_close_ts=self.start_date.replace(tzinfo=timezone.utc),
+            max_close_ts=self.end_date.replace(tzinfo=timezone.utc)
+        )
     
     def simulate_probability_arbitrage(self):
         """
@@ -116,25 +77,13 @@ class KalshiBacktester:
         print("⚠️  NOTE: Kalshi API limitation - no historical orderbook data")
         print("   Using settled markets as proxy for opportunities\n")
         
-        # Fetch settled markets
+        # Fetch settled markets (all pages, filtered to the window server-side)
         all_markets = []
-        cursor = None
         
-        while True:
-            markets, cursor = self.get_historical_markets(cursor)
-            if not markets:
-                break
-            
-            # Filter by date range
-            for market in markets:
-                close_time = datetime.fromisoformat(market.get('close_time', '').replace('Z', '+00:00')).replace(tzinfo=None)
-                if self.start_date <= close_time <= self.end_date:
-                    all_markets.append(market)
-            
-            if not cursor:
-                break
-            
-            time.sleep(0.2)  # Rate limit
+        for market in self.get_historical_markets():
+            close_time = datetime.fromisoformat(market.get('close_time', '').replace('Z', '+00:00')).replace(tzinfo=None)
+            if self.start_date <= close_time <= self.end_date:
+                all_markets.append(market)
         
         print(f"📈 Found {len(all_markets)} settled markets in date range\n")
         
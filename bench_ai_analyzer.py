@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark: FunctionGemmaAnalyzer.analyze_opportunity call modes
+
+Runs a local stand-in for Ollama's /api/generate that answers with
+well-formed JSON after a simulated delay: a fixed overhead per request
+(queueing, prompt evaluation) plus generation time per function section
+in the answer. --parallel caps how many requests it serves at once, like
+OLLAMA_NUM_PARALLEL.
+
+Each mode (sequential, concurrent, fused) analyzes the same opportunities
+with the answer cache off and reports latency per opportunity. "batched"
+analyzes them all with one analyze_opportunities() call (latency is the
+call's time per opportunity); --malformed drops that share of batch items
+from the answers to exercise the single-call retries. The last row is the
+concurrent mode with the cache on, measured on a second scan of the same
+opportunities (prices moved by a cent).
+
+    python bench_ai_analyzer.py
+    python bench_ai_analyzer.py --parallel 1 --overhead 0.3 --per-section 0.2
+"""
+import argparse
+import json
+import random
+import re
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ai.functiongemma_analyzer import FunctionGemmaAnalyzer
+
+SAMPLE_OUTPUTS = {
+    "analyze_sentiment": {"sentiment_score": 0.2, "confidence": 0.7, "bias_detected": False,
+                          "reasoning": "Neutral wording"},
+    "detect_mispricing": {"mispricing_likelihood": 0.4, "signals": ["time-sensitive"], "confidence": 0.6},
+    "assess_risk": {"resolution_risk": 0.2, "execution_risk": 0.3, "overall_risk": 0.25,
+                    "risk_factors": ["different resolution sources"]},
+}
+FUNCTION_LINE = re.compile(r"^Function: (\w+)", re.MULTILINE)
+BATCH_ITEMS = re.compile(r"^Items:\n(.*)\Z", re.MULTILINE | re.DOTALL)
+
+
+def make_handler(overhead, per_section, slots, malformed=0.0, seed=5):
+    rng = random.Random(seed)
+
+    class StandIn(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            batch = BATCH_ITEMS.search(body["prompt"])
+            if batch:
+                items = json.loads(batch.group(1))
+                sections = sum(len(item) - 1 for item in items)
+                output = {"results": [
+                    {"id": item["id"], **{name: SAMPLE_OUTPUTS.get(name, {}) for name in item if name != "id"}}
+                    for item in items if rng.random() >= malformed
+                ]}
+            else:
+                names = FUNCTION_LINE.findall(body["prompt"])
+                sections = len(names)
+                if len(names) == 1:
+                    output = SAMPLE_OUTPUTS.get(names[0], {})
+                else:
+                    output = {name: SAMPLE_OUTPUTS.get(name, {}) for name in names}
+            with slots:
+                time.sleep(overhead + per_section * sections)
+
+            payload = json.dumps({"model": body.get("model"), "response": json.dumps(output), "done": True}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return StandIn
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FunctionGemmaAnalyzer call modes")
+    parser.add_argument("--opportunities", type=int, default=10)
+    parser.add_argument("--overhead", type=float, default=0.15, help="Seconds per request")
+    parser.add_argument("--per-section", type=float, default=0.25, help="Seconds per function answered")
+    parser.add_argument("--parallel", type=int, default=4, help="Requests the stand-in serves at once")
+    parser.add_argument("--malformed", type=float, default=0.0, help="Share of batch items left out of answers")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0),
+                                 make_handler(args.overhead, args.per_section,
+                                              threading.Semaphore(args.parallel), args.malformed))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/api/generate"
+
+    opportunities = [{
+        "kalshi_market": f"Will Bitcoin hit ${100 + i}k by Jan 31?",
+        "polymarket_market": f"Bitcoin above ${100 + i},000 on January 31?",
+        "match_confidence": 0.86,
+    } for i in range(args.opportunities)]
+
+    print("=" * 70)
+    print(f"AI ANALYZER BENCHMARK - stand-in: {args.overhead}s/request + "
+          f"{args.per_section}s/section, {args.parallel} parallel")
+    print("=" * 70)
+    print(f"{'Mode':>12} | {'mean':>8} | {'p95':>8} | {'total':>8} | {'speedup':>7}")
+    print("-" * 70)
+
+    baseline = None
+    for label in ("sequential", "concurrent", "fused", "batched", "cached"):
+        if label == "batched":
+            analyzer = FunctionGemmaAnalyzer(endpoint=endpoint, cache_ttl=0)
+            start = time.perf_counter()
+            results = analyzer.analyze_opportunities(opportunities)
+            elapsed = time.perf_counter() - start
+            assert all(result["risk"] for result in results), "batched: empty risk section"
+            mean = elapsed / len(opportunities)
+            print(f"{label:>12} | {mean * 1000:6.0f}ms | {'-':>8} | {elapsed:7.2f}s | {baseline / mean:6.2f}x")
+            continue
+        if label == "cached":
+            analyzer = FunctionGemmaAnalyzer(endpoint=endpoint, mode="concurrent")
+            for opportunity in opportunities:
+                analyzer.analyze_opportunity(opportunity)
+                opportunity["match_confidence"] += 0.01
+        else:
+            analyzer = FunctionGemmaAnalyzer(endpoint=endpoint, mode=label, cache_ttl=0)
+
+        latencies = []
+        for opportunity in opportunities:
+            start = time.perf_counter()
+            result = analyzer.analyze_opportunity(opportunity)
+            latencies.append(time.perf_counter() - start)
+            assert result["risk"], f"{label}: empty risk section"
+
+        mean = statistics.mean(latencies)
+        p95 = sorted(latencies)[round(0.95 * (len(latencies) - 1))]
+        baseline = baseline or mean
+        print(f"{label:>12} | {mean * 1000:6.0f}ms | {p95 * 1000:6.0f}ms | {sum(latencies):7.2f}s | "
+              f"{baseline / mean:6.2f}x")
+        if analyzer.cache is not None:
+            print(f"{'':>12}   cache: {analyzer.cache_stats()}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pooled KalshiClient vs bare requests.get
+
+Measures per-request orderbook latency with a keep-alive connection pool
+and with a fresh connection per call (how the old per-script clients worked).
+
+By default it runs against a local TLS stand-in server (self-signed cert)
+so it works offline and still pays a real TLS handshake per unpooled call.
+Point it at the real API to include network round trips:
+
+    python bench_kalshi_client.py --base-url https://api.elections.kalshi.com/trade-api/v2 \\
+        --ticker KXBTC-25DEC31-T100000
+"""
+import argparse
+import datetime
+import ipaddress
+import json
+import os
+import ssl
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from core.kalshi_client import KalshiClient, KalshiAuth
+
+
+class _OrderbookHandler(BaseHTTPRequestHandler):
+    """Serves a fixed orderbook over HTTP/1.1 keep-alive."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    body = json.dumps({"orderbook": {"yes": [[45, 100], [46, 250]], "no": [[54, 80]]}}).encode()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _write_self_signed_cert(directory):
+    """Create a throwaway cert/key for 127.0.0.1 and return their paths."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(hours=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_path = os.path.join(directory, "bench_cert.pem")
+    key_path = os.path.join(directory, "bench_key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                  serialization.NoEncryption()))
+    return cert_path, key_path
+
+
+def start_local_server(cert_path, key_path):
+    """Start the TLS stand-in server on a free port and return its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OrderbookHandler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"https://127.0.0.1:{server.server_address[1]}/trade-api/v2"
+
+
+def time_calls(fn, n):
+    """Call fn n times and return per-call latencies in milliseconds."""
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:28} mean {statistics.mean(latencies):7.2f} ms | "
+          f"median {statistics.median(latencies):7.2f} ms | p95 {p95:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs unpooled Kalshi requests")
+    parser.add_argument("--base-url", help="Trade API base URL (default: local stand-in server)")
+    parser.add_argument("--ticker", default="BENCH-TICKER", help="Market ticker to poll")
+    parser.add_argument("-n", type=int, default=200, help="Requests per mode")
+    args = parser.parse_args()
+
+    server = None
+    verify = True
+    base_url = args.base_url
+    tmpdir = tempfile.TemporaryDirectory()
+    if not base_url:
+        cert_path, key_path = _write_self_signed_cert(tmpdir.name)
+        server, base_url = start_local_server(cert_path, key_path)
+        verify = cert_path
+
+    auth = KalshiAuth()
+    client = KalshiClient(base_url=base_url, auth=auth)
+    if server:
+        client.session.verify = verify
+        client.session.trust_env = False  # keep REQUESTS_CA_BUNDLE from overriding verify
+    path = f"/markets/{args.ticker}/orderbook"
+
+    def unpooled():
+        # Old pattern: module-level requests.get opens a new connection per call
+        headers = auth.headers("GET", f"{client.base_path}{path}")
+        requests.get(f"{base_url}{path}", headers=headers, timeout=8, verify=verify)
+
+    def pooled():
+        client.get_orderbook(args.ticker)
+
+    print("=" * 80)
+    print(f"KALSHI CLIENT BENCHMARK - {args.n} orderbook requests per mode")
+    print(f"Target: {base_url}")
+    print("=" * 80)
+
+    # Warm the pool once so the pooled numbers reflect steady state
+    pooled()
+
+    unpooled_ms = time_calls(unpooled, args.n)
+    pooled_ms = time_calls(pooled, args.n)
+
+    report("Without pool (requests.get)", unpooled_ms)
+    report("With pool (KalshiClient)", pooled_ms)
+    print(f"\nSpeedup (mean): {statistics.mean(unpooled_ms) / statistics.mean(pooled_ms):.2f}x")
+
+    client.close()
+    if server:
+        server.shutdown()
+    tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
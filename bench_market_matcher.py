@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MarketMatcher.batch_match scaling (indexed vs full scan)
+
+Generates synthetic Kalshi/Polymarket universes of growing size, where a
+share of Polymarket questions are rewordings of Kalshi titles and the
+rest are unrelated. The entity vocabulary grows with the universe, as it
+does in practice (more markets = more teams, tickers, people).
+
+For small sizes it also runs the old full O(N*M) scan and reports how many
+of its pairs the indexed matcher also finds.
+
+    python bench_market_matcher.py                      # up to 20k x 20k
+    python bench_market_matcher.py --sizes 1000 5000 --brute-max 500
+    python bench_market_matcher.py --method matrix       # TF-IDF score_matrix
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from strategies.market_matcher import MarketMatcher, MarketRecord
+
+MONTHS = ["january", "february", "march", "april", "may", "june", "july",
+          "august", "september", "october", "november", "december"]
+EVENTS = ["championship", "election", "playoffs", "final", "summit", "award", "series", "cup"]
+SYLLABLES = ["ka", "lo", "mi", "ran", "tor", "vel", "zen", "qui", "bar", "dex",
+             "nor", "sal", "pim", "fu", "ga", "hel", "jor", "wix", "yal", "oc"]
+
+
+def _vocabulary(n, rng):
+    """n distinct pseudo-words (team names, tickers, people)."""
+    words = set()
+    while len(words) < n:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def _kalshi_title(rng, vocab):
+    a, b = rng.sample(vocab, 2)
+    n = rng.choice([50, 100, 150, 200, 500, 1000, 5000])
+    month, day = rng.choice(MONTHS), rng.randint(1, 28)
+    template = rng.randrange(3)
+    if template == 0:
+        return f"Will {a} win the {b} {rng.choice(EVENTS)}?"
+    if template == 1:
+        return f"Will {a} price be above {n} on {month} {day}?"
+    return f"Will {a} and {b} sign a deal before {month}?"
+
+
+def _reword(title, rng):
+    """Polymarket-style rewording of a Kalshi title."""
+    q = title.replace("Will ", "").rstrip("?")
+    q = q.replace(" win the ", " to win the ").replace(" price be above ", " above ")
+    if rng.random() < 0.5:
+        q += f" in {rng.choice(['2026', '2027'])}"
+    return q + "?"
+
+
+def generate(n, seed=11, match_share=0.3):
+    """Build n Kalshi and n Polymarket markets."""
+    rng = random.Random(seed)
+    vocab = _vocabulary(max(200, n // 2), rng)
+    base = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+    kalshi = []
+    for i in range(n):
+        close = base + timedelta(days=rng.randint(0, 180), hours=rng.randint(0, 23))
+        kalshi.append({"ticker": f"KX-BENCH-{i}", "title": _kalshi_title(rng, vocab),
+                       "close_time": close.isoformat().replace("+00:00", "Z")})
+
+    poly = []
+    for i in range(n):
+        if rng.random() < match_share:
+            k = rng.choice(kalshi)
+            question = _reword(k["title"], rng)
+            end = datetime.fromisoformat(k["close_time"].replace("Z", "+00:00")) + timedelta(hours=rng.randint(-12, 12))
+        else:
+            question = _reword(_kalshi_title(rng, vocab), rng)
+            end = base + timedelta(days=rng.randint(0, 180))
+        poly.append({"condition_id": f"0xbench{i:06d}", "question": question,
+                     "end_date": end.isoformat().replace("+00:00", "Z"), "closed": rng.random() < 0.05})
+    return kalshi, poly
+
+
+def brute_force(matcher, kalshi, poly, min_confidence):
+    """Old path: score every Kalshi market against every Polymarket market."""
+    pairs = []
+    for k in kalshi:
+        result = matcher.find_match(k, poly, min_confidence)
+        if result:
+            pairs.append((k["ticker"], result[0]["condition_id"], result[1]))
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MarketMatcher.batch_match scaling")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2500, 5000, 10000, 20000],
+                        help="Markets per platform")
+    parser.add_argument("--brute-max", type=int, default=500, help="Largest size to also run the full scan on")
+    parser.add_argument("--min-confidence", type=float, default=0.75)
+    parser.add_argument("--method", choices=["fuzzy", "matrix"], default="fuzzy",
+                        help="batch_match scoring: indexed fuzz.ratio or TF-IDF score_matrix")
+    args = parser.parse_args()
+
+    matcher = MarketMatcher(override_file="")
+
+    print("=" * 90)
+    print(f"MARKET MATCHER BENCHMARK - batch_match ({args.method}) vs full fuzzy scan")
+    print("=" * 90)
+    print(f"{'Size (N x M)':>16} | {'Time':>10} | {'per market':>10} | {'cands/mkt':>9} | "
+          f"{'Full scan':>12} | {'Matches':>7}")
+    print("-" * 90)
+
+    baseline = None
+    recall = None
+    for n in args.sizes:
+        kalshi, poly = generate(n)
+
+        start = time.perf_counter()
+        matches = matcher.batch_match(kalshi, poly, min_confidence=args.min_confidence, method=args.method)
+        indexed_s = time.perf_counter() - start
+
+        scored = n * n  # matrix mode computes every similarity
+        if args.method == "fuzzy":
+            scored = 0
+            index = matcher.build_index(poly)
+            min_jaccard = matcher._min_keyword_jaccard(args.min_confidence)
+            for k in kalshi:
+                record = MarketRecord.from_kalshi(k)
+                scored += len(index.candidates(record.keywords, min_jaccard, record.expiry))
+
+        full = "-"
+        if n <= args.brute_max:
+            start = time.perf_counter()
+            expected = brute_force(matcher, kalshi, poly, args.min_confidence)
+            brute_s = time.perf_counter() - start
+            got = {(m["kalshi_ticker"], m["polymarket_id"]) for m in matches}
+            recall = len(got & {(k, p) for k, p, _ in expected}) / max(1, len(expected))
+            baseline = brute_s / (n * n)
+            full = f"{brute_s:10.2f}s"
+        elif baseline:
+            full = f"~{baseline * n * n:9.0f}s*"
+
+        print(f"{n:>7} x {n:<6} | {indexed_s:9.2f}s | {indexed_s / n * 1000:8.2f}ms | {scored / n:9.1f} | "
+              f"{full:>12} | {len(matches):>7}")
+
+    print("-" * 90)
+    print("* extrapolated from the largest full scan (O(N*M))")
+    if recall is not None:
+        print(f"batch_match finds {recall:.1%} of the full scan's pairs (largest checked size)")
+
+
+if __name__ == "__main__":
+    main()
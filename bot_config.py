@@ -45,6 +45,11 @@ class BotConfig:
     CHECK_INTERVAL_SEC = int(os.getenv("CHECK_INTERVAL_SEC", "10"))
     MAX_NO_PRICE_COUNT = int(os.getenv("MAX_NO_PRICE_COUNT", "30"))  # 5 min at 10s intervals
     
+    # ========================
+    # Market Data
+    # ========================
+    USE_WS_FEED = os.getenv("USE_WS_FEED", "true").lower() == "true"  # Stream orderbook instead of polling
+    
     @classmethod
     def print_config(cls):
         """Display current configuration"""
@@ -68,6 +73,8 @@ class BotConfig:
         print(f"Risk Management:")
         print(f"  Max Losses:      {cls.MAX_CONSECUTIVE_LOSSES}")
         print(f"  Check Interval:  {cls.CHECK_INTERVAL_SEC}s")
+        print(f"")
+        print(f"Market Data:       {'WebSocket feed' if cls.USE_WS_FEED else 'REST polling'}")
         print(f"{'='*60}\n")
     
     @classmethod
@@ -14,6 +14,7 @@ from cryptography.hazmat.primitives import serialization
 from kelly_criterion import calculate_kelly_bet
 from circuit_breaker import CircuitBreaker
 from trade_db import TradeDB
+from core.orderbook import OrderBook
 # win_probability model now inline (simple +5% edge)
 
 load_dotenv()
@@ -83,8 +84,8 @@ class KalshiClient:
                 print(f"⚠️ Kalshi API Error {resp.status_code}: {resp.text}")
                 return 0.0
             data = resp.json()
-            yes_asks = data.get('orderbook', {}).get('yes', [])
-            return min([x[0] for x in yes_asks]) / 100.0 if yes_asks else 0.0
+            best = OrderBook.from_json(data).best_yes_ask
+            return best / 100.0 if best is not None else 0.0
         except Exception as e:
             print(f"Error fetching Kalshi price: {e}")
             return 0.0
@@ -1,15 +1,15 @@
 #!/usr/bin/env python3
 """Kalshi Bot - PRODUCTION v4 - With fee calculator and enhanced profit validation"""
-import os, time, requests, base64, json
+import time
 from datetime import datetime
 from dotenv import load_dotenv
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import padding
-from cryptography.hazmat.primitives import serialization
 
 # Import bot modules
 from bot_config import BotConfig
 from core.fee_calculator import FeeCalculator
+from core.kalshi_client import KalshiClient
+from core.kalshi_ws import KalshiOrderbookFeed
+from core.orderbook import OrderBook
 import kelly_criterion
 from strategies.timing_optimizer import TimingOptimizer
 from strategies.timing_optimizer import TimingOptimizer
@@ -30,48 +30,37 @@ TARGET_RETURN_PCT = config.TARGET_RETURN_PCT / 100
 
 class Kalshi:
     def __init__(self):
-        self.base = "https://api.elections.kalshi.com/trade-api/v2"
-        self.key = os.getenv("KALSHI_KEY_ID")
-        try:
-            with open("kalshi.key", "rb") as f:
-                self.pk = serialization.load_pem_private_key(f.read(), password=None)
+        self.client = KalshiClient()
+        self.feed = None
+        if self.client.authenticated:
             print(f"✅ Key loaded")
-        except Exception as e:
-            print(f"❌ Key error: {e}")
-            self.pk = None
+        else:
+            print(f"❌ Key error: missing KALSHI_KEY_ID or kalshi.key")
     
-    def sign(self, method, path, ts):
-        """Sign request - path must start with /trade-api/v2"""
-        if not self.pk: return "NONE"
-        msg = f"{ts}{method}{path}"
-        sig = self.pk.sign(msg.encode(), padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH), hashes.SHA256())
-        return base64.b64encode(sig).decode()
+    def start_feed(self, tickers):
+        """Stream orderbooks over WebSocket so price() reads a local book"""
+        if not self.client.authenticated: return
+        self.feed = KalshiOrderbookFeed(tickers, auth=self.client.auth)
+        self.feed.start()
+        if self.feed.wait_until_synced(timeout=10):
+            print(f"✅ Orderbook feed synced ({len(tickers)} market)")
+        else:
+            print(f"⚠️  Orderbook feed not synced yet, using REST until it is")
     
     def get_market_info(self, ticker):
         """Get market details including volume"""
-        if not self.key or not self.pk: return None
-        ts = str(int(time.time() * 1000))
-        path = f"/trade-api/v2/markets/{ticker}"
-        h = {"KALSHI-ACCESS-KEY": self.key, "KALSHI-ACCESS-SIGNATURE": self.sign("GET", path, ts), "KALSHI-ACCESS-TIMESTAMP": ts}
-        try:
-            r = requests.get(f"{self.base}/markets/{ticker}", headers=h, timeout=8)
-            if r.status_code == 200:
-                return r.json().get("market", {})
-        except:
-            pass
-        return None
+        if not self.client.authenticated: return None
+        return self.client.get_market(ticker)
     
     def price(self, ticker):
-        if not self.key or not self.pk: return None
-        ts = str(int(time.time() * 1000))
-        path = f"/trade-api/v2/markets/{ticker}/orderbook"
-        h = {"KALSHI-ACCESS-KEY": self.key, "KALSHI-ACCESS-SIGNATURE": self.sign("GET", path, ts), "KALSHI-ACCESS-TIMESTAMP": ts}
-        try:
-            r = requests.get(f"{self.base}/markets/{ticker}/orderbook", headers=h, timeout=8)
-            if r.status_code == 200:
-                asks = r.json().get("orderbook", {}).get("yes", [])
-                return min([x[0]/100 for x in asks]) if asks else None
-        except: pass
+        if not self.client.authenticated: return None
+        # Local book from the WebSocket feed; REST only while it is (re)syncing
+        if self.feed and self.feed.is_synced(ticker):
+            return self.feed.best_yes_ask(ticker)
+        ob = self.client.get_orderbook(ticker)
+        if ob:
+            best = OrderBook.from_json(ob).best_yes_ask
+            return best / 100 if best is not None else None
         return None
     
     def buy(self, ticker, n, cents):
@@ -81,22 +70,14 @@ class Kalshi:
             print(f"  [DRY] Would place order")
             return True
         
-        if not self.key or not self.pk:
+        if not self.client.authenticated:
             print(f"  ❌ Missing credentials")
             return False
         
-        ts = str(int(time.time() * 1000))
-        path = "/trade-api/v2/portfolio/orders"  # FULL PATH for signature
         data = {"ticker": ticker, "action": "buy", "side": "yes", "count": n, "type": "limit", "yes_price": cents}
-        h = {
-            "KALSHI-ACCESS-KEY": self.key,
-            "KALSHI-ACCESS-SIGNATURE": self.sign("POST", path, ts),
-            "KALSHI-ACCESS-TIMESTAMP": ts,
-            "Content-Type": "application/json"
-        }
         
         try:
-            r = requests.post(f"{self.base}/portfolio/orders", json=data, headers=h, timeout=8)
+            r = self.client.create_order(data)
             print(f"  [API] {r.status_code}")
             
             if r.status_code in [200, 201]:
@@ -169,6 +150,9 @@ if market_info:
 else:
     print(f"   ⚠️  Could not verify market info, proceeding with caution...")
 
+if config.USE_WS_FEED:
+    k.start_feed([ticker])
+
 print("\n🚀 Starting trading loop...\n")
 
 while True:
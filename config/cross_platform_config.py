@@ -17,10 +17,18 @@ POLYMARKET = {
 
 # Cross-Platform Arbitrage Settings
 CROSS_PLATFORM = {
-    "position_size": 5.0,  # $5 per arbitrage trade
+    "position_size": 5,  # contracts on each leg per arbitrage trade
     "min_profit_threshold": 0.02,  # $0.02 minimum profit
     "max_position_per_platform": 10,  # max contracts per side
     "match_confidence_threshold": 0.75,  # 75% confidence for auto-match
+    "match_method": "fuzzy",  # "fuzzy" (fuzz.ratio) or "matrix" (TF-IDF, for very large universes)
+    "match_top_k": 5,  # cosine candidates per Kalshi market that "matrix" reranks
+    "ai_mode": "concurrent",  # FunctionGemma calls per opportunity: "concurrent", "sequential" or "fused"
+    "ai_cache_ttl": 3600,  # seconds a FunctionGemma answer is reused across scans (0 = no cache)
+    "ai_background": True,  # AI/ML scoring in worker threads after alerting (False = inline, before logging)
+    "ai_workers": 2,  # background enrichment threads
+    "ai_queue_depth": 200,  # opportunities waiting for enrichment before the overflow policy applies
+    "ai_overflow": "drop_oldest",  # full queue: "drop_oldest" or "block" the scanner
     "enable_auto_matching": False,  # manual review by default
     "scan_interval": 900,  # 15 minutes in seconds
     "alert_only": True,  # no auto-execution
@@ -3,5 +3,7 @@ Kalshi Bot - Core Modules
 """
 
 from .fee_calculator import FeeCalculator
+from .orderbook import OrderBook
+from .opportunity import Opportunity
 
-__all__ = ['FeeCalculator']
+__all__ = ['FeeCalculator', 'OrderBook', 'Opportunity']
@@ -0,0 +1,157 @@
+"""
+Depth-Aware Arbitrage Sizing
+
+Sizes a cross-platform arb (one leg on Kalshi, the opposite outcome on
+Polymarket) against both orderbooks instead of a single quote per leg.
+
+The two ask ladders are merged contract by contract: the n-th pair costs
+the Kalshi price of the n-th contract plus the Polymarket price of the
+n-th share, so profit per pair only falls as size grows. Fees are charged
+on the cumulative position at every size, which gives the net profit
+curve; its argmax is the size to trade.
+
+Everything is array math over at most a few thousand contracts, so it is
+cheap enough to run on every matched pair in a scan.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .fee_calculator import FeeCalculator
+from .orderbook import OrderBook
+
+OPPOSITE = {"yes": "no", "no": "yes"}
+
+
+class ArbSizer:
+    """Profit curve and best size for a Kalshi leg hedged on Polymarket."""
+
+    def __init__(self, fee_calc: Optional[FeeCalculator] = None,
+                 pm_fee_rate: float = 0.02,
+                 pm_gas_fee: float = 0.01,
+                 max_contracts: int = 5000):
+        """
+        Initialize sizer.
+
+        Args:
+            fee_calc: Kalshi fee model (taker fees; default: lowest volume tier)
+            pm_fee_rate: Polymarket fee as a share of gross profit
+            pm_gas_fee: Fixed Polymarket cost per trade in dollars
+            max_contracts: Longest profit curve computed
+        """
+        self.fee_calc = fee_calc or FeeCalculator()
+        self.pm_fee_rate = pm_fee_rate
+        self.pm_gas_fee = pm_gas_fee
+        self.max_contracts = max_contracts
+
+    @staticmethod
+    def _kalshi_ladder(book: OrderBook, side: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(prices in dollars, sizes) of a Kalshi ask ladder, best first."""
+        levels = getattr(book, side)
+        sizes = np.frombuffer(levels, dtype=np.dtype(levels.typecode))
+        prices = np.flatnonzero(sizes)
+        return prices / 100.0, sizes[prices].astype(float)
+
+    @staticmethod
+    def _pm_ladder(levels: List[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """(prices, sizes) of Polymarket ask levels from book_levels(), best first."""
+        if not levels:
+            return np.empty(0), np.empty(0)
+        prices, sizes = np.array(levels, dtype=float).T
+        return prices, sizes
+
+    @staticmethod
+    def _per_contract(prices: np.ndarray, sizes: np.ndarray, n: int) -> np.ndarray:
+        """Price of each of the first n contracts walking up the ladder."""
+        # A share split across two levels is priced at the worse one
+        return prices[np.searchsorted(np.cumsum(sizes), np.arange(1, n + 1), side="left")]
+
+    def profit_curve(self, kalshi_book: OrderBook, kalshi_side: str,
+                     pm_levels: List[Tuple[float, float]],
+                     max_cost: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        Net profit for every size, buying kalshi_side on Kalshi and the
+        opposite outcome on Polymarket.
+
+        Args:
+            kalshi_book: Kalshi orderbook
+            kalshi_side: "yes" or "no" (Kalshi leg)
+            pm_levels: Polymarket asks of the opposite token (book_levels(book, "BUY"))
+            max_cost: Capital cap in dollars for both legs together (None = no cap)
+
+        Returns:
+            Dict of arrays indexed by size - 1: kalshi_price, pm_price (price of
+            that contract), cost, gross_profit, fees, net_profit (cumulative)
+        """
+        k_prices, k_sizes = self._kalshi_ladder(kalshi_book, kalshi_side)
+        pm_prices, pm_sizes = self._pm_ladder(pm_levels)
+        n = int(min(k_sizes.sum(), np.floor(pm_sizes.sum()), self.max_contracts))
+
+        kalshi_price = self._per_contract(k_prices, k_sizes, n)
+        pm_price = self._per_contract(pm_prices, pm_sizes, n)
+        cost = np.cumsum(kalshi_price + pm_price)
+        if max_cost is not None:
+            n = int(np.searchsorted(cost, max_cost, side="right"))
+            kalshi_price, pm_price, cost = kalshi_price[:n], pm_price[:n], cost[:n]
+
+        # One contract of the pair pays $1 whichever way the market resolves
+        size = np.arange(1, n + 1)
+        gross = size - cost
+
+        # Kalshi fee from the fee table per contract, rounded up to the cent for the order
+        fee_cents = np.cumsum(self.fee_calc.per_contract_fees(np.rint(kalshi_price * 100)))
+        kalshi_fee = np.ceil(fee_cents - 1e-9) / 100
+        pm_fee = np.maximum(gross, 0.0) * self.pm_fee_rate + self.pm_gas_fee
+        fees = kalshi_fee + pm_fee
+
+        return {
+            "kalshi_price": kalshi_price,
+            "pm_price": pm_price,
+            "cost": cost,
+            "gross_profit": gross,
+            "fees": fees,
+            "net_profit": gross - fees,
+        }
+
+    def best_size(self, kalshi_book: OrderBook, pm_books: Dict[str, List[Tuple[float, float]]],
+                  max_cost: Optional[float] = None) -> Dict:
+        """
+        Most profitable size over both directions of the arb.
+
+        Args:
+            kalshi_book: Kalshi orderbook
+            pm_books: {"yes": levels, "no": levels} Polymarket asks per outcome
+            max_cost: Capital cap in dollars for both legs together
+
+        Returns:
+            Dict with kalshi_side, pm_side, size, cost, gross_profit, fees,
+            net_profit, kalshi_vwap, pm_vwap and the full curve; size is 0
+            when no size is profitable
+        """
+        best = {"kalshi_side": None, "pm_side": None, "size": 0, "cost": 0.0,
+                "gross_profit": 0.0, "fees": 0.0, "net_profit": 0.0,
+                "kalshi_vwap": None, "pm_vwap": None, "curve": None}
+
+        for kalshi_side, pm_side in OPPOSITE.items():
+            curve = self.profit_curve(kalshi_book, kalshi_side, pm_books.get(pm_side) or [], max_cost)
+            net = curve["net_profit"]
+            if not len(net):
+                continue
+            i = int(np.argmax(net))
+            if net[i] <= best["net_profit"]:
+                continue
+
+            size = i + 1
+            best = {
+                "kalshi_side": kalshi_side,
+                "pm_side": pm_side,
+                "size": size,
+                "cost": float(curve["cost"][i]),
+                "gross_profit": float(curve["gross_profit"][i]),
+                "fees": float(curve["fees"][i]),
+                "net_profit": float(net[i]),
+                "kalshi_vwap": float(curve["kalshi_price"][:size].mean()),
+                "pm_vwap": float(curve["pm_price"][:size].mean()),
+                "curve": curve,
+            }
+        return best
@@ -0,0 +1,172 @@
+"""
+Async Kalshi Client
+
+asyncio/aiohttp client for fanning out many read requests at once,
+mainly orderbook sweeps across hundreds of tickers. Concurrency is
+bounded by an in-flight limit and the shared "kalshi" token-bucket
+limiter (the same read budget KalshiClient draws from) so a sweep stays
+inside Kalshi's rate allowance.
+
+Synchronous callers use fetch_orderbooks(), which runs the event loop
+for them.
+"""
+import asyncio
+import os
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from core.kalshi_client import KALSHI_API_BASE, KalshiAuth, kalshi_limiter
+from core.rate_limiter import RateLimiter, parse_retry_after
+
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("KALSHI_MAX_IN_FLIGHT", "50"))
+
+
+class AsyncKalshiClient:
+    """Bounded-concurrency async Kalshi client (use as an async context manager)."""
+
+    def __init__(self, base_url: str = KALSHI_API_BASE,
+                 auth: Optional[KalshiAuth] = None,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 reads_per_sec: Optional[float] = None,
+                 limiter: Optional[RateLimiter] = None,
+                 connect_timeout: float = 3.05,
+                 read_timeout: float = 8.0,
+                 max_retries: int = 2):
+        """
+        Initialize async client.
+
+        Args:
+            base_url: Trade API base URL (must end in /trade-api/v2)
+            auth: Shared KalshiAuth (loaded from .env / kalshi.key if None)
+            max_in_flight: Max concurrent requests on the wire
+            reads_per_sec: Private read budget per second (default: share
+                           the process-wide "kalshi" limiter)
+            limiter: Rate limiter to use instead of the shared one
+            connect_timeout: Seconds to wait for the TCP/TLS connection
+            read_timeout: Seconds to wait for the response body
+            max_retries: Retries on 429/5xx and transport errors
+        """
+        self.base_url = base_url.rstrip("/")
+        self.base_path = urlparse(self.base_url).path
+        self.auth = auth or KalshiAuth()
+        self.max_in_flight = max_in_flight
+        if limiter is None:
+            limiter = RateLimiter({"read": (reads_per_sec, None)}) if reads_per_sec else kalshi_limiter()
+        self.limiter = limiter
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self.max_retries = max_retries
+
+        self.session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight, keepalive_timeout=30)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.timeout,
+            headers={'User-Agent': 'Kalshi-Arbitrage-Bot/1.0'}
+        )
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+        self.session = None
+
+    async def _get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        GET an endpoint under the concurrency limit and rate budget.
+
+        Returns:
+            JSON response as dict, or None after retries are exhausted
+        """
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire_async("read")
+            async with self._semaphore:
+                headers = self.auth.headers("GET", f"{self.base_path}{endpoint}")
+                try:
+                    async with self.session.get(f"{self.base_url}{endpoint}", params=params,
+                                                headers=headers) as r:
+                        if r.status == 429:
+                            # The limiter pauses and slows the shared budget before the retry
+                            self.limiter.on_429("read", parse_retry_after(r.headers.get("Retry-After")))
+                            continue
+                        self.limiter.on_success("read")
+                        if r.status == 200:
+                            return await r.json()
+                        if r.status < 500:
+                            print(f"⚠️  Kalshi API {r.status} on {endpoint}")
+                            return None
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if attempt == self.max_retries:
+                        print(f"Error fetching {endpoint}: {e}")
+                        return None
+
+            # 5xx or transport error: back off before retrying
+            await asyncio.sleep(0.5 * (2 ** attempt))
+
+        return None
+
+    async def get_market(self, ticker: str) -> Optional[Dict]:
+        """Get market details."""
+        data = await self._get(f"/markets/{ticker}")
+        return data.get("market", {}) if data else None
+
+    async def get_orderbook(self, ticker: str, depth: Optional[int] = None) -> Optional[Dict]:
+        """Get the raw orderbook for a market (None on error)."""
+        params = {"depth": depth} if depth else None
+        data = await self._get(f"/markets/{ticker}/orderbook", params=params)
+        if data is None:
+            return None
+        return data.get("orderbook") or {}
+
+    async def get_orderbooks(self, tickers: Iterable[str],
+                             depth: Optional[int] = None) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch many orderbooks concurrently.
+
+        Args:
+            tickers: Market tickers
+            depth: Optional book depth per side
+
+        Returns:
+            Dict of ticker -> raw orderbook (None where the fetch failed)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        books = await asyncio.gather(*(self.get_orderbook(t, depth) for t in tickers))
+        return dict(zip(tickers, books))
+
+
+def fetch_orderbooks(tickers: List[str], depth: Optional[int] = None,
+                     **client_kwargs) -> Dict[str, Optional[Dict]]:
+    """
+    Synchronous wrapper around AsyncKalshiClient.get_orderbooks.
+
+    Runs its own event loop, so it can't be called from async code; await
+    AsyncKalshiClient.get_orderbooks there instead.
+
+    Args:
+        tickers: Market tickers
+        depth: Optional book depth per side
+        **client_kwargs: Passed to AsyncKalshiClient (max_in_flight, reads_per_sec, ...)
+
+    Returns:
+        Dict of ticker -> raw orderbook (None where the fetch failed)
+    """
+    async def _run():
+        async with AsyncKalshiClient(**client_kwargs) as client:
+            return await client.get_orderbooks(tickers, depth=depth)
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError("fetch_orderbooks() can't run inside an event loop; "
+                           "await AsyncKalshiClient.get_orderbooks() instead")
+
+    if not tickers:
+        return {}
+    return asyncio.run(_run())
@@ -2,7 +2,43 @@
 """
 Kalshi Fee Calculator - Accurate fee calculation based on tiered structure
 Based on research from vladmeer/kalshi-arbitrage-bot
+
+Per-contract fees are precomputed for every cent price (1-99), volume tier
+and maker/taker into FEE_TABLE, so fees for a whole batch of trades are one
+array lookup. Kalshi rounds each trade's total fee up to the next cent.
 """
+import numpy as np
+
+# (minimum 30-day volume in dollars, taker fee rate on payout), highest tier first
+FEE_TIERS = (
+    (25000, 0.035),
+    (10000, 0.045),
+    (2500, 0.055),
+    (0, 0.07),
+)
+MAKER_DISCOUNT = 0.5  # limit orders pay half
+
+
+def _build_fee_table():
+    """Fee per contract in cents, indexed [tier, is_maker, price_cents] (price 0 unused)"""
+    table = np.zeros((len(FEE_TIERS), 2, 100))
+    payout_cents = np.full(99, 100.0)  # fee is on the $1.00 payout at every price
+    for tier, (_, rate) in enumerate(FEE_TIERS):
+        table[tier, 0, 1:] = payout_cents * rate
+        table[tier, 1, 1:] = payout_cents * rate * MAKER_DISCOUNT
+    return table
+
+
+FEE_TABLE = _build_fee_table()
+
+
+def _tier_index(volume_30d):
+    """Row of FEE_TABLE for a 30-day volume"""
+    for tier, (min_volume, _) in enumerate(FEE_TIERS):
+        if volume_30d >= min_volume:
+            return tier
+    return len(FEE_TIERS) - 1
+
 
 class FeeCalculator:
     """
@@ -27,17 +63,41 @@ class FeeCalculator:
         """
         self.volume_30d = volume_30d
         self.base_fee_rate = self._get_base_fee_rate()
+        self._table = FEE_TABLE[_tier_index(volume_30d)]
     
     def _get_base_fee_rate(self):
         """Get base fee rate based on 30-day volume"""
-        if self.volume_30d >= 25000:
-            return 0.035  # 3.5%
-        elif self.volume_30d >= 10000:
-            return 0.045  # 4.5%
-        elif self.volume_30d >= 2500:
-            return 0.055  # 5.5%
-        else:
-            return 0.07   # 7.0% (default for new traders)
+        return FEE_TIERS[_tier_index(self.volume_30d)][1]
+    
+    def per_contract_fees(self, prices, is_maker=False):
+        """
+        Unrounded fee per contract, looked up from FEE_TABLE
+        
+        Args:
+            prices: Contract prices in cents (1-99), scalar or array
+            is_maker: True for limit orders, False for market orders (scalar or array)
+        
+        Returns:
+            Fee per contract in cents (same shape as prices)
+        """
+        prices = np.clip(np.asarray(prices, dtype=np.int64), 1, 99)
+        return self._table[np.asarray(is_maker, dtype=np.int64), prices]
+    
+    def fees(self, prices, quantities, is_maker=False):
+        """
+        Fees for many trades at once
+        
+        Args:
+            prices: Contract prices in cents (1-99), scalar or array
+            quantities: Contracts per trade (broadcast against prices)
+            is_maker: True for limit orders, False for market orders (scalar or array)
+        
+        Returns:
+            Fee per trade in dollars, rounded up to the cent
+        """
+        fee_cents = self.per_contract_fees(prices, is_maker) * np.asarray(quantities)
+        # Round up to the cent; the epsilon keeps exact cents from float noise
+        return np.ceil(fee_cents - 1e-9) / 100
     
     def calculate_trade_fee(self, price, quantity, is_maker=False):
         """
@@ -49,20 +109,11 @@ class FeeCalculator:
             is_maker: True for limit orders (50% discount), False for market orders
         
         Returns:
-            float: Total fee in dollars
+            float: Total fee in dollars (rounded up to the cent)
         
         Note: Fees are charged on the PAYOUT, not the cost!
         """
-        fee_rate = self.base_fee_rate
-        
-        if is_maker:
-            fee_rate = fee_rate * 0.5  # 50% discount for makers
-        
-        # Fee is on $1.00 payout if contract wins
-        max_payout = quantity * 1.00
-        fee = max_payout * fee_rate
-        
-        return fee
+        return float(self.fees(round(price * 100), quantity, is_maker))
     
     def calculate_round_trip_fee(self, buy_price, sell_price, quantity):
         """
@@ -160,10 +211,41 @@ class FeeCalculator:
             'is_profitable': net_profit > 0
         }
     
+    def calculate_arbitrage_profits(self, yes_prices, no_prices, quantity):
+        """
+        Vectorized calculate_arbitrage_profit over many markets
+        
+        Args:
+            yes_prices: YES prices in cents (array)
+            no_prices: NO prices in cents (array)
+            quantity: Contracts on each side (scalar or array)
+        
+        Returns:
+            dict: Arrays of total_cost, gross_profit, total_fees, net_profit
+                  and the is_profitable mask
+        """
+        yes_prices = np.asarray(yes_prices)
+        no_prices = np.asarray(no_prices)
+        quantity = np.asarray(quantity)
+        
+        total_cost = (yes_prices + no_prices) / 100 * quantity
+        gross_profit = quantity * 1.00 - total_cost
+        total_fees = self.fees(yes_prices, quantity) + self.fees(no_prices, quantity)
+        net_profit = gross_profit - total_fees
+        
+        return {
+            'total_cost': total_cost,
+            'gross_profit': gross_profit,
+            'total_fees': total_fees,
+            'net_profit': net_profit,
+            'is_profitable': net_profit > 0
+        }
+    
     def update_volume(self, new_volume_30d):
         """Update 30-day volume and recalculate fee rate"""
         self.volume_30d = new_volume_30d
         self.base_fee_rate = self._get_base_fee_rate()
+        self._table = FEE_TABLE[_tier_index(new_volume_30d)]
 
 
 if __name__ == "__main__":
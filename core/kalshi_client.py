@@ -0,0 +1,393 @@
+"""
+Kalshi REST Client (Pooled)
+
+One shared client for every script that talks to the Kalshi trade API.
+Keeps a keep-alive connection pool so repeated orderbook polls reuse the
+same TCP+TLS connection instead of handshaking on every request.
+
+Authentication follows Kalshi's RSA-PSS scheme: the signed message is
+timestamp + method + path, where path starts with /trade-api/v2 and
+excludes the query string. Market data endpoints are public, so the
+client still works (unsigned) when no key is configured.
+
+Requests draw from the process-wide "kalshi" token-bucket limiter (read
+and write budgets), which AsyncKalshiClient shares; a 429 backs the
+budget off and the request is retried.
+"""
+import base64
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
+from dotenv import load_dotenv
+
+from core.rate_limiter import RateLimiter, get_limiter, parse_retry_after
+
+load_dotenv()
+
+KALSHI_API_BASE = "https://api.elections.kalshi.com/trade-api/v2"
+
+# Kalshi basic tier allows 20 reads and 10 writes per second; raise via .env on higher tiers
+DEFAULT_READS_PER_SEC = float(os.getenv("KALSHI_READS_PER_SEC", "20"))
+DEFAULT_WRITES_PER_SEC = float(os.getenv("KALSHI_WRITES_PER_SEC", "10"))
+KALSHI_RATE_LIMITS = {
+    "read": (DEFAULT_READS_PER_SEC, None),
+    "write": (DEFAULT_WRITES_PER_SEC, None),
+}
+
+# Key file lives in the bot directory unless KALSHI_KEY_PATH says otherwise
+DEFAULT_KEY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "kalshi.key"
+)
+
+
+def _to_epoch(value: Optional[Union[int, float, datetime]]) -> Optional[int]:
+    """Convert a datetime or epoch value to integer epoch seconds."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(value)
+
+
+def kalshi_limiter() -> RateLimiter:
+    """Process-wide Kalshi limiter shared by the sync and async clients."""
+    return get_limiter("kalshi", KALSHI_RATE_LIMITS)
+
+
+class KalshiAuth:
+    """Holds the API key and signs requests for the Kalshi trade API."""
+
+    def __init__(self, key_id: Optional[str] = None, key_path: Optional[str] = None):
+        """
+        Load Kalshi credentials.
+
+        Args:
+            key_id: API key id (defaults to KALSHI_KEY_ID from .env)
+            key_path: Path to the PEM private key (defaults to KALSHI_KEY_PATH
+                      or kalshi.key in the bot directory)
+        """
+        self.key_id = key_id or os.getenv("KALSHI_KEY_ID")
+        self.key_path = key_path or os.getenv("KALSHI_KEY_PATH", DEFAULT_KEY_PATH)
+
+        try:
+            with open(self.key_path, "rb") as f:
+                self.private_key = serialization.load_pem_private_key(f.read(), password=None)
+        except Exception as e:
+            print(f"⚠️  Kalshi key not loaded ({self.key_path}): {e}")
+            self.private_key = None
+
+    @property
+    def is_ready(self) -> bool:
+        """True when both the key id and private key are available."""
+        return bool(self.key_id and self.private_key)
+
+    def sign(self, method: str, path: str, ts: str) -> str:
+        """Sign a request - path must start with /trade-api/v2"""
+        msg = f"{ts}{method}{path}"
+        sig = self.private_key.sign(
+            msg.encode(),
+            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
+            hashes.SHA256()
+        )
+        return base64.b64encode(sig).decode()
+
+    def headers(self, method: str, path: str) -> Dict[str, str]:
+        """
+        Build authentication headers for a request.
+
+        Args:
+            method: HTTP method
+            path: Full request path (query string is ignored for signing)
+
+        Returns:
+            Header dict (empty when credentials are missing)
+        """
+        if not self.is_ready:
+            return {}
+
+        ts = str(int(time.time() * 1000))
+        return {
+            "KALSHI-ACCESS-KEY": self.key_id,
+            "KALSHI-ACCESS-SIGNATURE": self.sign(method, path.split("?")[0], ts),
+            "KALSHI-ACCESS-TIMESTAMP": ts,
+        }
+
+
+class KalshiClient:
+    """Pooled, keep-alive Kalshi REST client with typed endpoint helpers."""
+
+    def __init__(self, base_url: str = KALSHI_API_BASE,
+                 auth: Optional[KalshiAuth] = None,
+                 connect_timeout: float = 3.05,
+                 read_timeout: float = 8.0,
+                 pool_size: int = 20,
+                 max_retries: int = 2,
+                 limiter: Optional[RateLimiter] = None):
+        """
+        Initialize Kalshi client.
+
+        Args:
+            base_url: Trade API base URL (must end in /trade-api/v2)
+            auth: Shared KalshiAuth (loaded from .env / kalshi.key if None)
+            connect_timeout: Seconds to wait for the TCP/TLS connection
+            read_timeout: Seconds to wait for the response body
+            pool_size: Max keep-alive connections kept per host
+            max_retries: Connection-level retries (never retries a sent POST),
+                         also used for retries after a 429
+            limiter: Rate limiter (default: the shared "kalshi" limiter)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.base_path = urlparse(self.base_url).path
+        self.auth = auth or KalshiAuth()
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.limiter = limiter or kalshi_limiter()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                              max_retries=max_retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            'User-Agent': 'Kalshi-Arbitrage-Bot/1.0'
+        })
+
+    @property
+    def authenticated(self) -> bool:
+        """True when requests will be signed."""
+        return self.auth.is_ready
+
+    def request(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                json: Optional[Dict] = None) -> requests.Response:
+        """
+        Send a signed request over the pooled session.
+
+        Args:
+            method: HTTP method
+            endpoint: Path relative to the base URL (e.g. "/markets")
+            params: Query parameters
+            json: JSON body
+
+        Returns:
+            Raw response (raises requests exceptions on transport errors)
+        """
+        family = "read" if method == "GET" else "write"
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(family)
+            headers = self.auth.headers(method, f"{self.base_path}{endpoint}")
+            r = self.session.request(method, f"{self.base_url}{endpoint}", params=params,
+                                     json=json, headers=headers, timeout=self.timeout)
+            if r.status_code != 429:
+                self.limiter.on_success(family)
+                return r
+            # Rejected before execution, so safe to retry once the budget recovers
+            self.limiter.on_429(family, parse_retry_after(r.headers.get("Retry-After")))
+        return r
+
+    def _get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        GET an endpoint and return the JSON body.
+
+        Returns:
+            JSON response as dict, or None on any error
+        """
+        try:
+            r = self.request("GET", endpoint, params=params)
+            if r.status_code == 200:
+                return r.json()
+            print(f"⚠️  Kalshi API {r.status_code} on {endpoint}: {r.text[:200]}")
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching {endpoint}: {e}")
+        return None
+
+    def get_markets_page(self, limit: int = 100, status: Optional[str] = "open",
+                         cursor: Optional[str] = None, **filters) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Fetch one page of markets.
+
+        Args:
+            limit: Page size (Kalshi allows up to 1000)
+            status: Market status filter (None for any)
+            cursor: Pagination cursor from the previous page
+            **filters: Extra server-side filters (series_ticker, event_ticker, ...)
+
+        Returns:
+            Tuple of (markets, next_cursor)
+        """
+        params = {"limit": limit, **{k: v for k, v in filters.items() if v is not None}}
+        if status:
+            params["status"] = status
+        if cursor:
+            params["cursor"] = cursor
+
+        data = self._get("/markets", params=params)
+        if not data:
+            return [], None
+        return data.get("markets", []), data.get("cursor") or None
+
+    def get_markets(self, limit: int = 100, status: Optional[str] = "open", **filters) -> List[Dict]:
+        """Fetch a single page of markets (see get_markets_page)."""
+        markets, _ = self.get_markets_page(limit=limit, status=status, **filters)
+        return markets
+
+    def iter_markets(self, status: Optional[str] = "open",
+                     series_ticker: Optional[str] = None,
+                     event_ticker: Optional[str] = None,
+                     min_close_ts: Optional[Union[int, float, datetime]] = None,
+                     max_close_ts: Optional[Union[int, float, datetime]] = None,
+                     page_size: int = 1000,
+                     max_pages: Optional[int] = None,
+                     **extra_filters) -> Iterator[Dict]:
+        """
+        Stream the market universe, following the pagination cursor lazily.
+
+        Markets are yielded as each page arrives, so callers can filter
+        while later pages are still being fetched and only one page is
+        held in memory at a time.
+
+        Args:
+            status: Market status filter (unopened, open, closed, settled; None for any)
+            series_ticker: Only markets in this series
+            event_ticker: Only markets in this event
+            min_close_ts: Only markets closing at/after this time (epoch seconds or datetime)
+            max_close_ts: Only markets closing at/before this time (epoch seconds or datetime)
+            page_size: Markets per request (Kalshi max is 1000)
+            max_pages: Stop after this many pages (None = whole universe)
+            **extra_filters: Any other /markets query filter (e.g. tickers)
+
+        Yields:
+            Market dicts
+        """
+        filters = {
+            "series_ticker": series_ticker,
+            "event_ticker": event_ticker,
+            "min_close_ts": _to_epoch(min_close_ts),
+            "max_close_ts": _to_epoch(max_close_ts),
+            **extra_filters,
+        }
+
+        cursor = None
+        pages = 0
+        while True:
+            markets, cursor = self.get_markets_page(limit=page_size, status=status,
+                                                    cursor=cursor, **filters)
+            pages += 1
+            yield from markets
+
+            if not cursor or not markets or (max_pages and pages >= max_pages):
+                return
+
+    def get_events_page(self, limit: int = 200, status: Optional[str] = "open",
+                        cursor: Optional[str] = None, with_nested_markets: bool = True,
+                        **filters) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Fetch one page of events.
+
+        Args:
+            limit: Page size (Kalshi allows up to 200)
+            status: Event status filter (None for any)
+            cursor: Pagination cursor from the previous page
+            with_nested_markets: Include each event's markets under "markets"
+            **filters: Extra server-side filters (series_ticker, ...)
+
+        Returns:
+            Tuple of (events, next_cursor)
+        """
+        params = {"limit": limit, **{k: v for k, v in filters.items() if v is not None}}
+        if status:
+            params["status"] = status
+        if cursor:
+            params["cursor"] = cursor
+        if with_nested_markets:
+            params["with_nested_markets"] = "true"
+
+        data = self._get("/events", params=params)
+        if not data:
+            return [], None
+        return data.get("events", []), data.get("cursor") or None
+
+    def iter_events(self, status: Optional[str] = "open",
+                    series_ticker: Optional[str] = None,
+                    with_nested_markets: bool = True,
+                    page_size: int = 200,
+                    max_pages: Optional[int] = None,
+                    **extra_filters) -> Iterator[Dict]:
+        """
+        Stream events (optionally with their markets), following the cursor lazily.
+
+        Args:
+            status: Event status filter (open, closed, settled; None for any)
+            series_ticker: Only events in this series
+            with_nested_markets: Include each event's markets under "markets"
+            page_size: Events per request (Kalshi max is 200)
+            max_pages: Stop after this many pages (None = all events)
+            **extra_filters: Any other /events query filter
+
+        Yields:
+            Event dicts (event_ticker, title, mutually_exclusive, markets, ...)
+        """
+        cursor = None
+        pages = 0
+        while True:
+            events, cursor = self.get_events_page(limit=page_size, status=status, cursor=cursor,
+                                                  with_nested_markets=with_nested_markets,
+                                                  series_ticker=series_ticker, **extra_filters)
+            pages += 1
+            yield from events
+
+            if not cursor or not events or (max_pages and pages >= max_pages):
+                return
+
+    def get_market(self, ticker: str) -> Optional[Dict]:
+        """Get market details (title, volume, close_time, quotes)."""
+        data = self._get(f"/markets/{ticker}")
+        return data.get("market", {}) if data else None
+
+    def get_orderbook(self, ticker: str, depth: Optional[int] = None) -> Optional[Dict]:
+        """
+        Get the orderbook for a market.
+
+        Returns:
+            Raw orderbook dict ({"yes": [[price, qty], ...], "no": [...]}) or None
+        """
+        params = {"depth": depth} if depth else None
+        data = self._get(f"/markets/{ticker}/orderbook", params=params)
+        if data is None:
+            return None
+        return data.get("orderbook") or {}
+
+    def get_orders(self, ticker: Optional[str] = None, status: Optional[str] = None) -> List[Dict]:
+        """List portfolio orders, optionally filtered by ticker and status."""
+        params = {k: v for k, v in {"ticker": ticker, "status": status}.items() if v}
+        data = self._get("/portfolio/orders", params=params or None)
+        return data.get("orders", []) if data else []
+
+    def get_balance(self) -> Optional[float]:
+        """Get account balance in dollars (None on error)."""
+        data = self._get("/portfolio/balance")
+        if data is None:
+            return None
+        return data.get("balance", 0) / 100.0  # Convert cents to dollars
+
+    def create_order(self, order: Dict) -> requests.Response:
+        """
+        Place an order.
+
+        Args:
+            order: Order payload (ticker, action, side, count, type, yes_price/no_price)
+
+        Returns:
+            Raw response so callers can report status and error text
+        """
+        return self.request("POST", "/portfolio/orders", json=order)
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
@@ -0,0 +1,281 @@
+"""
+Kalshi WebSocket Orderbook Feed
+
+Subscribes to the orderbook_delta channel and keeps an in-memory book
+per ticker, so price reads are local lookups instead of REST polls.
+
+Protocol (trade-api/ws/v2):
+- orderbook_snapshot replaces the book for a ticker
+- orderbook_delta adds `delta` contracts at `price` on `side`
+- every message on a subscription carries `seq`, which must increase by 1
+
+A sequence gap means a delta was lost, so the affected subscription is
+dropped and re-created, which makes the server send fresh snapshots.
+A frame that can't be decoded or applied is logged and skipped (its
+subscription, if known, is re-snapshotted the same way).
+The feed reconnects with backoff if the socket closes.
+
+Requires websockets>=13 (asyncio client API).
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from websockets.asyncio.client import connect
+from websockets.exceptions import WebSocketException
+
+from core.kalshi_client import KalshiAuth
+from core.orderbook import OrderBook
+
+KALSHI_WS_URL = os.getenv("KALSHI_WS_URL", "wss://api.elections.kalshi.com/trade-api/ws/v2")
+
+
+class KalshiOrderbookFeed:
+    """Background WebSocket subscriber that maintains local orderbooks."""
+
+    def __init__(self, tickers: Iterable[str], ws_url: str = KALSHI_WS_URL,
+                 auth: Optional[KalshiAuth] = None,
+                 reconnect_delay: float = 1.0,
+                 max_reconnect_delay: float = 30.0):
+        """
+        Initialize feed (call start() to connect).
+
+        Args:
+            tickers: Market tickers to subscribe to
+            ws_url: WebSocket endpoint (point at a local stand-in for offline runs)
+            auth: Shared KalshiAuth (loaded from .env / kalshi.key if None)
+            reconnect_delay: Initial reconnect backoff in seconds
+            max_reconnect_delay: Backoff cap in seconds
+        """
+        self.tickers = list(dict.fromkeys(tickers))
+        self.ws_url = ws_url
+        self.ws_path = urlparse(ws_url).path
+        self.auth = auth or KalshiAuth()
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.books: Dict[str, OrderBook] = {}
+        self._lock = threading.Lock()
+        self._synced: Dict[str, threading.Event] = {t: threading.Event() for t in self.tickers}
+
+        # Subscription bookkeeping (only touched on the feed's event loop)
+        self._next_id = 1
+        self._pending: Dict[int, List[str]] = {}   # command id -> tickers
+        self._sid_tickers: Dict[int, List[str]] = {}
+        self._last_seq: Dict[int, int] = {}
+
+        self._loop = None
+        self._thread = None
+        self._ws = None
+        self._stopping = False
+
+        # Metrics
+        self.messages = 0
+        self.gaps = 0
+        self.malformed = 0
+        self.resnapshots = 0
+        self.reconnects = 0
+
+    # ------------------------------------------------------------------
+    # Public API (safe to call from any thread)
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Connect and start consuming in a background thread."""
+        self._stopping = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="kalshi-ws-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Close the socket and stop the background thread."""
+        self._stopping = True
+        if self._loop and self._ws:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+        if self._thread:
+            self._thread.join(timeout)
+
+    def wait_until_synced(self, timeout: Optional[float] = None) -> bool:
+        """Block until every ticker has a snapshot. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for event in self._synced.values():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not event.wait(remaining):
+                return False
+        return True
+
+    def is_synced(self, ticker: str) -> bool:
+        """True if the local book for ticker is current (snapshot received, no open gap)."""
+        event = self._synced.get(ticker)
+        return bool(event and event.is_set())
+
+    def best_yes_ask(self, ticker: str) -> Optional[float]:
+        """
+        Best YES price from the local book, in dollars.
+
+        Returns:
+            Price, or None if the book is empty or not currently synced
+        """
+        if not self.is_synced(ticker):
+            return None
+        with self._lock:
+            book = self.books.get(ticker)
+            best = book.best_yes_ask if book else None
+        return best / 100 if best is not None else None
+
+    def get_book(self, ticker: str) -> Optional[Dict]:
+        """Copy of the local book in REST orderbook format (None if not synced)."""
+        if not self.is_synced(ticker):
+            return None
+        with self._lock:
+            book = self.books.get(ticker)
+            return book.to_json() if book else None
+
+    def stats(self) -> Dict:
+        """Feed health counters."""
+        return {
+            "messages": self.messages,
+            "gaps": self.gaps,
+            "malformed": self.malformed,
+            "resnapshots": self.resnapshots,
+            "reconnects": self.reconnects,
+            "synced": sum(1 for e in self._synced.values() if e.is_set()),
+            "tickers": len(self.tickers),
+        }
+
+    # ------------------------------------------------------------------
+    # Event loop side
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._consume_forever())
+        finally:
+            self._loop.close()
+
+    async def _consume_forever(self):
+        delay = self.reconnect_delay
+        while not self._stopping:
+            try:
+                headers = self.auth.headers("GET", self.ws_path)
+                async with connect(self.ws_url, additional_headers=headers) as ws:
+                    self._ws = ws
+                    delay = self.reconnect_delay
+                    self._reset_subscriptions()
+                    await self._subscribe(self.tickers)
+
+                    async for raw in ws:
+                        message = None
+                        try:
+                            message = json.loads(raw)
+                            await self._handle(message)
+                        except (ValueError, KeyError, TypeError, AttributeError) as e:
+                            await self._skip_malformed(message, e)
+
+            except (OSError, WebSocketException, asyncio.TimeoutError) as e:
+                if self._stopping:
+                    break
+                print(f"⚠️  Kalshi WS disconnected: {e}")
+            finally:
+                self._ws = None
+                self._mark_unsynced(self.tickers)
+
+            if self._stopping:
+                break
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _reset_subscriptions(self):
+        self._pending.clear()
+        self._sid_tickers.clear()
+        self._last_seq.clear()
+
+    def _mark_unsynced(self, tickers: Iterable[str]):
+        for t in tickers:
+            event = self._synced.get(t)
+            if event:
+                event.clear()
+
+    async def _send(self, cmd: str, params: Dict) -> int:
+        cmd_id = self._next_id
+        self._next_id += 1
+        await self._ws.send(json.dumps({"id": cmd_id, "cmd": cmd, "params": params}))
+        return cmd_id
+
+    async def _subscribe(self, tickers: List[str]):
+        cmd_id = await self._send("subscribe", {
+            "channels": ["orderbook_delta"],
+            "market_tickers": tickers,
+        })
+        self._pending[cmd_id] = tickers
+
+    async def _resnapshot(self, sid: int):
+        """Drop a subscription that missed a message and re-subscribe for fresh snapshots."""
+        tickers = self._sid_tickers.pop(sid, [])
+        self._last_seq.pop(sid, None)
+        self._mark_unsynced(tickers)
+        self.resnapshots += 1
+
+        await self._send("unsubscribe", {"sids": [sid]})
+        if tickers:
+            await self._subscribe(tickers)
+
+    async def _skip_malformed(self, message, error: Exception):
+        """Log a message that couldn't be decoded or applied and keep consuming."""
+        self.malformed += 1
+        print(f"⚠️  Kalshi WS skipped malformed message: {error!r}")
+        # A lost book update leaves the book stale, so re-snapshot its subscription
+        sid = message.get("sid") if isinstance(message, dict) else None
+        if sid in self._sid_tickers:
+            await self._resnapshot(sid)
+
+    async def _handle(self, message: Dict):
+        self.messages += 1
+        msg_type = message.get("type")
+        msg = message.get("msg") or {}
+
+        if msg_type == "subscribed":
+            tickers = self._pending.pop(message.get("id"), None)
+            if tickers is not None:
+                self._sid_tickers[msg["sid"]] = tickers
+            return
+
+        if msg_type == "error":
+            print(f"⚠️  Kalshi WS error: {msg}")
+            return
+
+        if msg_type not in ("orderbook_snapshot", "orderbook_delta"):
+            return
+
+        sid = message.get("sid")
+        if sid not in self._sid_tickers:
+            return  # late message for a subscription we already dropped
+
+        # Sequence gap detection
+        seq = message.get("seq")
+        last = self._last_seq.get(sid)
+        if seq is not None and last is not None and seq != last + 1:
+            self.gaps += 1
+            await self._resnapshot(sid)
+            return
+        if seq is not None:
+            self._last_seq[sid] = seq
+
+        ticker = msg.get("market_ticker")
+        if msg_type == "orderbook_snapshot":
+            with self._lock:
+                self.books.setdefault(ticker, OrderBook()).load(msg)
+            event = self._synced.get(ticker)
+            if event:
+                event.set()
+        else:
+            if not self.is_synced(ticker):
+                return  # delta before snapshot; snapshot will cover it
+            with self._lock:
+                self.books[ticker].apply_delta(msg.get("side"), msg.get("price"), msg.get("delta", 0))
@@ -0,0 +1,123 @@
+"""
+Arbitrage Opportunity Record
+
+One typed record per cross-platform opportunity, carried unchanged from
+the scanner through AI analysis, ML scoring and the database logger.
+Prices stay numeric (dollars) end to end; strings are only built when an
+opportunity is printed.
+"""
+from datetime import datetime
+from typing import Dict, Optional
+
+SIDE_NAMES = {"yes": "YES", "no": "NO"}
+
+
+class Opportunity:
+    """Cross-platform arb: buy one outcome on Kalshi and the other on Polymarket."""
+
+    __slots__ = (
+        "kalshi_ticker", "kalshi_market", "polymarket_id", "polymarket_market",
+        "kalshi_side",
+        "kalshi_yes_price", "kalshi_no_price",
+        "polymarket_yes_price", "polymarket_no_price",
+        "kalshi_quote_time", "polymarket_quote_time",
+        "position_size", "gross_profit", "total_fees", "net_profit", "roi",
+        "max_size", "max_size_cost", "max_size_net_profit",
+        "match_confidence", "match_method", "timestamp",
+        "ai_analysis", "ai_score", "ai_recommendation",
+        "ml_score", "ml_recommendation", "opportunity_id",
+    )
+
+    def __init__(self, kalshi_ticker: str, kalshi_market: str,
+                 polymarket_id: str, polymarket_market: str,
+                 kalshi_side: str,
+                 kalshi_yes_price: float, kalshi_no_price: float,
+                 polymarket_yes_price: float, polymarket_no_price: float,
+                 position_size: float, gross_profit: float, total_fees: float,
+                 net_profit: float, roi: float,
+                 kalshi_quote_time: Optional[float] = None,
+                 polymarket_quote_time: Optional[float] = None,
+                 match_confidence: float = 0.0,
+                 match_method: str = "fuzzy",
+                 timestamp: Optional[datetime] = None):
+        """
+        Initialize opportunity.
+
+        Args:
+            kalshi_ticker: Kalshi market ticker
+            kalshi_market: Kalshi market title
+            polymarket_id: Polymarket condition id
+            polymarket_market: Polymarket question
+            kalshi_side: Outcome bought on Kalshi ("yes" or "no"); the other
+                         outcome is bought on Polymarket
+            kalshi_yes_price, kalshi_no_price: Kalshi asks in dollars
+            polymarket_yes_price, polymarket_no_price: Polymarket prices in dollars
+            position_size: Position the profit figures are for
+            gross_profit, total_fees, net_profit: Dollars for the position
+            roi: Net profit over cost, in percent
+            kalshi_quote_time, polymarket_quote_time: Epoch seconds the quotes were read
+            match_confidence: Matcher score for the pair
+            match_method: How the pair was matched ("fuzzy", "matrix", "manual")
+            timestamp: When the opportunity was found (default: now)
+        """
+        self.kalshi_ticker = kalshi_ticker
+        self.kalshi_market = kalshi_market
+        self.polymarket_id = polymarket_id
+        self.polymarket_market = polymarket_market
+        self.kalshi_side = kalshi_side
+        self.kalshi_yes_price = kalshi_yes_price
+        self.kalshi_no_price = kalshi_no_price
+        self.polymarket_yes_price = polymarket_yes_price
+        self.polymarket_no_price = polymarket_no_price
+        self.kalshi_quote_time = kalshi_quote_time
+        self.polymarket_quote_time = polymarket_quote_time
+        self.position_size = position_size
+        self.gross_profit = gross_profit
+        self.total_fees = total_fees
+        self.net_profit = net_profit
+        self.roi = roi
+        self.match_confidence = match_confidence
+        self.match_method = match_method
+        self.timestamp = timestamp or datetime.now()
+
+        # Filled in later stages (depth sizing, database logging, AI/ML enrichment)
+        self.max_size = 0
+        self.max_size_cost = 0.0
+        self.max_size_net_profit = 0.0
+        self.ai_analysis = None
+        self.ai_score = None
+        self.ai_recommendation = None
+        self.ml_score = None
+        self.ml_recommendation = None
+        self.opportunity_id = None
+
+    @property
+    def polymarket_side(self) -> str:
+        return "no" if self.kalshi_side == "yes" else "yes"
+
+    @property
+    def kalshi_price(self) -> float:
+        """Price of the Kalshi leg."""
+        return self.kalshi_yes_price if self.kalshi_side == "yes" else self.kalshi_no_price
+
+    @property
+    def polymarket_price(self) -> float:
+        """Price of the Polymarket leg."""
+        return self.polymarket_yes_price if self.kalshi_side == "no" else self.polymarket_no_price
+
+    @property
+    def strategy(self) -> str:
+        """Human-readable trade description."""
+        return (f"Buy {SIDE_NAMES[self.kalshi_side]} on Kalshi (${self.kalshi_price:.2f}), "
+                f"{SIDE_NAMES[self.polymarket_side]} on Polymarket (${self.polymarket_price:.2f})")
+
+    def to_dict(self) -> Dict:
+        """Plain dict of every field (numeric prices; timestamp as ISO string)."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["timestamp"] = self.timestamp.isoformat()
+        data["strategy"] = self.strategy
+        return data
+
+    def __repr__(self) -> str:
+        return (f"Opportunity({self.kalshi_ticker} / {self.polymarket_id}: "
+                f"{self.strategy}, net ${self.net_profit:.4f})")
@@ -0,0 +1,202 @@
+"""
+Cent-Level Order Book
+
+Kalshi prices are whole cents from 1 to 99, so each side of a market fits
+in a fixed 100-slot array indexed by price. Best prices are cached and
+cumulative depth is built once per book change, so top-of-book, depth and
+VWAP queries don't allocate or sort.
+
+Conventions (same as the rest of the bot):
+- `yes` levels are offers to sell YES; the best YES ask is the lowest one
+- `no` levels are offers to sell NO; the best NO ask is the lowest one
+- selling NO at p cents is the same as bidding for YES at 100 - p, so the
+  NO ladder is the source of implied YES bids (and vice versa)
+"""
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+SLOTS = 100  # index = price in cents, slot 0 unused
+SIDES = ("yes", "no")
+_EMPTY = array("l", bytes(SLOTS * array("l").itemsize))
+
+
+class OrderBook:
+    """Two fixed 100-slot ladders (yes, no) of resting size per cent."""
+
+    __slots__ = ("yes", "no", "_best", "_cum")
+
+    def __init__(self):
+        self.yes = array("l", _EMPTY)
+        self.no = array("l", _EMPTY)
+        self._best = {"yes": SLOTS, "no": SLOTS}  # SLOTS = empty side
+        self._cum = {"yes": None, "no": None}
+
+    @classmethod
+    def from_json(cls, orderbook: Optional[Dict]) -> "OrderBook":
+        """
+        Build a book from Kalshi orderbook JSON.
+
+        Args:
+            orderbook: {"yes": [[price, qty], ...], "no": [...]} or the full
+                       response wrapping it under "orderbook" (None = empty)
+
+        Returns:
+            OrderBook
+        """
+        book = cls()
+        book.load(orderbook)
+        return book
+
+    def load(self, orderbook: Optional[Dict]):
+        """Replace both ladders from orderbook JSON (snapshot)."""
+        orderbook = orderbook or {}
+        if "orderbook" in orderbook:
+            orderbook = orderbook["orderbook"] or {}
+
+        for side in SIDES:
+            levels = getattr(self, side)
+            levels[:] = _EMPTY
+            best = SLOTS
+            for level in orderbook.get(side) or ():
+                price, qty = int(level[0]), int(level[1])
+                if 0 < price < SLOTS and qty > 0:
+                    levels[price] += qty
+                    if price < best:
+                        best = price
+            self._best[side] = best
+            self._cum[side] = None
+
+    def apply_delta(self, side: str, price: int, delta: int):
+        """
+        Add (or remove, if negative) resting size at one price.
+
+        Args:
+            side: "yes" or "no"
+            price: Price in cents (1-99)
+            delta: Change in contracts
+        """
+        if not 0 < price < SLOTS:
+            return
+        levels = getattr(self, side)
+        levels[price] = max(0, levels[price] + delta)
+        self._cum[side] = None
+
+        best = self._best[side]
+        if levels[price] and price < best:
+            self._best[side] = price
+        elif price == best and not levels[price]:
+            self._best[side] = self._scan_best(levels, price + 1)
+
+    @staticmethod
+    def _scan_best(levels: array, start: int) -> int:
+        for price in range(start, SLOTS):
+            if levels[price]:
+                return price
+        return SLOTS
+
+    # ------------------------------------------------------------------
+    # Top of book (cents, None when the side is empty)
+    # ------------------------------------------------------------------
+
+    @property
+    def best_yes_ask(self) -> Optional[int]:
+        best = self._best["yes"]
+        return best if best < SLOTS else None
+
+    @property
+    def best_no_ask(self) -> Optional[int]:
+        best = self._best["no"]
+        return best if best < SLOTS else None
+
+    @property
+    def best_yes_bid(self) -> Optional[int]:
+        """Implied from the NO ladder: 100 - best NO ask."""
+        best = self._best["no"]
+        return SLOTS - best if best < SLOTS else None
+
+    @property
+    def best_no_bid(self) -> Optional[int]:
+        """Implied from the YES ladder: 100 - best YES ask."""
+        best = self._best["yes"]
+        return SLOTS - best if best < SLOTS else None
+
+    @property
+    def is_empty(self) -> bool:
+        return self._best["yes"] == SLOTS and self._best["no"] == SLOTS
+
+    def size_at(self, side: str, price: int) -> int:
+        """Resting contracts at one price."""
+        return getattr(self, side)[price] if 0 < price < SLOTS else 0
+
+    def levels(self, side: str) -> int:
+        """Number of non-empty price levels on a side."""
+        return sum(1 for qty in getattr(self, side) if qty)
+
+    # ------------------------------------------------------------------
+    # Depth and execution
+    # ------------------------------------------------------------------
+
+    def _cumulative(self, side: str) -> array:
+        cum = self._cum[side]
+        if cum is None:
+            levels = getattr(self, side)
+            cum = array("l", _EMPTY)
+            running = 0
+            for price in range(1, SLOTS):
+                running += levels[price]
+                cum[price] = running
+            self._cum[side] = cum
+        return cum
+
+    def depth(self, side: str, limit: int = SLOTS - 1) -> int:
+        """
+        Contracts available to buy on a side at or below a limit price.
+
+        Args:
+            side: "yes" or "no"
+            limit: Max price in cents (default: whole ladder)
+
+        Returns:
+            Cumulative resting size
+        """
+        return self._cumulative(side)[max(0, min(limit, SLOTS - 1))]
+
+    def vwap(self, side: str, size: int) -> Tuple[Optional[float], int]:
+        """
+        Average price to buy `size` contracts by walking the ladder from the best ask.
+
+        Args:
+            side: "yes" or "no"
+            size: Contracts wanted
+
+        Returns:
+            (vwap in cents, contracts filled) - vwap is None if nothing fills
+        """
+        levels = getattr(self, side)
+        remaining = size
+        cost = 0
+        for price in range(self._best[side], SLOTS):
+            qty = levels[price]
+            if not qty:
+                continue
+            take = min(qty, remaining)
+            cost += take * price
+            remaining -= take
+            if not remaining:
+                break
+
+        filled = size - remaining
+        return (cost / filled if filled else None), filled
+
+    def implied_yes_bids(self) -> List[List[int]]:
+        """NO ladder converted to YES bids, best (highest) first: [[100 - p, qty], ...]."""
+        return [[SLOTS - price, self.no[price]] for price in range(1, SLOTS) if self.no[price]]
+
+    def implied_no_bids(self) -> List[List[int]]:
+        """YES ladder converted to NO bids, best (highest) first: [[100 - p, qty], ...]."""
+        return [[SLOTS - price, self.yes[price]] for price in range(1, SLOTS) if self.yes[price]]
+
+    def to_json(self) -> Dict[str, List[List[int]]]:
+        """Ladders in Kalshi REST format, ascending by price."""
+        return {side: [[price, qty] for price, qty in enumerate(getattr(self, side)) if qty]
+                for side in SIDES}
@@ -5,23 +5,137 @@ A lightweight client for fetching market data from Polymarket.
 No authentication needed for read-only operations.
 
 Based on official py_clob_client but simplified to avoid dependency issues.
+
+Prices and books for many tokens are fetched through the CLOB's
+multi-token POST /prices and /books endpoints (get_prices, get_books),
+so pricing a scan costs a handful of requests instead of one per token.
+get_executable_prices walks those books for a target notional, giving the
+price a real order would pay rather than the top-of-book quote.
+
+Requests draw from the process-wide "polymarket" token-bucket limiter,
+with separate budgets for Gamma market data, CLOB books and CLOB prices.
 """
+import numpy as np
 import requests
-import time
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.rate_limiter import RateLimiter, get_limiter, parse_retry_after
+
+# Tokens per multi-token /prices or /books request
+BATCH_SIZE = 500
+
+# Requests per second and burst per endpoint family (kept under the
+# published per-10s limits so bursts from several scripts still fit)
+POLYMARKET_RATE_LIMITS = {
+    "gamma": (10.0, 20),
+    "book": (15.0, 30),
+    "price": (15.0, 30),
+}
+MAX_429_RETRIES = 2
+
+
+def book_levels(book: Optional[Dict], side: str = "BUY") -> List[Tuple[float, float]]:
+    """
+    Price levels to walk for an order, best first.
+    
+    Args:
+        book: Orderbook from /book or /books
+        side: "BUY" reads the asks (lowest first), "SELL" the bids (highest first)
+        
+    Returns:
+        List of (price, size) floats; malformed and empty levels are skipped
+    """
+    buy = side.upper() == "BUY"
+    levels = []
+    for level in (book or {}).get("asks" if buy else "bids") or ():
+        try:
+            price, size = float(level["price"]), float(level["size"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if price > 0 and size > 0:
+            levels.append((price, size))
+    levels.sort(reverse=not buy)
+    return levels
+
+
+def walk_books(books: Dict[str, Dict], notional: Optional[float] = None, side: str = "BUY",
+               quantity: Optional[float] = None) -> Dict[str, Dict]:
+    """
+    Walk many orderbooks at once for a target notional or share quantity.
+    
+    Levels are sorted best-first and laid out in a (tokens x levels) array,
+    so the walk is a few cumulative sums instead of a loop per token.
+    
+    Args:
+        books: token_id -> orderbook ({"asks": [{"price", "size"}, ...], "bids": [...]})
+        notional: Dollars to spend (BUY) or to receive (SELL) per token
+        side: "BUY" walks the asks upward, "SELL" walks the bids downward
+        quantity: Shares to buy or sell per token (instead of notional)
+        
+    Returns:
+        Dict of token_id -> {vwap, worst_price, filled_size, filled_notional,
+        complete}; vwap and worst_price are None when nothing fills
+    """
+    if (notional is None) == (quantity is None):
+        raise ValueError("walk_books needs exactly one of notional or quantity")
+    
+    tokens = list(books)
+    ladders = [book_levels(books[token], side) for token in tokens]
+    
+    width = max((len(levels) for levels in ladders), default=0)
+    if not tokens or not width:
+        return {t: {"vwap": None, "worst_price": None, "filled_size": 0.0,
+                    "filled_notional": 0.0, "complete": False} for t in tokens}
+    
+    prices = np.zeros((len(tokens), width))
+    sizes = np.zeros((len(tokens), width))
+    for row, levels in enumerate(ladders):
+        if levels:
+            prices[row, :len(levels)], sizes[row, :len(levels)] = zip(*levels)
+    
+    # Amount taken from each level: whatever is still wanted, capped by the level
+    if quantity is None:
+        level_notional = prices * sizes
+        before = np.cumsum(level_notional, axis=1) - level_notional
+        taken = np.clip(notional - before, 0.0, level_notional)
+        taken_size = np.divide(taken, prices, out=np.zeros_like(taken), where=prices > 0)
+    else:
+        before = np.cumsum(sizes, axis=1) - sizes
+        taken_size = np.clip(quantity - before, 0.0, sizes)
+        taken = taken_size * prices
+    
+    filled_notional = taken.sum(axis=1)
+    filled_size = taken_size.sum(axis=1)
+    used = (taken > 0).sum(axis=1)
+    worst = prices[np.arange(len(tokens)), np.maximum(used - 1, 0)]
+    
+    results = {}
+    for row, token in enumerate(tokens):
+        filled = filled_size[row] > 0
+        results[token] = {
+            "vwap": float(filled_notional[row] / filled_size[row]) if filled else None,
+            "worst_price": float(worst[row]) if filled else None,
+            "filled_size": float(filled_size[row]),
+            "filled_notional": float(filled_notional[row]),
+            "complete": bool(filled_notional[row] >= notional * (1 - 1e-9) if quantity is None
+                             else filled_size[row] >= quantity * (1 - 1e-9)),
+        }
+    return results
 
 
 class PolymarketClient:
     """Simplified Polymarket client for read-only market data."""
     
     def __init__(self, base_url: str = "https://clob.polymarket.com",
-                 gamma_url: str = "https://gamma-api.polymarket.com"):
+                 gamma_url: str = "https://gamma-api.polymarket.com",
+                 limiter: Optional[RateLimiter] = None):
         """
         Initialize Polymarket client.
         
         Args:
             base_url: CLOB API endpoint (for orderbooks, prices)
             gamma_url: Gamma API endpoint (for market data)
+            limiter: Rate limiter (default: the shared "polymarket" limiter)
         """
         self.base_url = base_url
         self.gamma_url = gamma_url
@@ -30,19 +144,33 @@ class PolymarketClient:
             'User-Agent': 'Kalshi-Polymarket-Arbitrage-Bot/1.0'
         })
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.5  # 500ms between requests
+        # Rate limiting (shared by every client in the process)
+        self.limiter = limiter or get_limiter("polymarket", POLYMARKET_RATE_LIMITS)
     
-    def _rate_limit(self):
-        """Enforce rate limiting between requests."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last)
+    def _family(self, url: str) -> str:
+        """Rate-limit family for a URL."""
+        if url.startswith(self.gamma_url):
+            return "gamma"
+        if "/book" in url:
+            return "book"
+        return "price"
+    
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request under the family's rate budget, retrying after 429s.
         
-        self.last_request_time = time.time()
+        Returns:
+            Response (raises requests exceptions on transport errors)
+        """
+        family = self._family(url)
+        for attempt in range(MAX_429_RETRIES + 1):
+            self.limiter.acquire(family)
+            response = self.session.request(method, url, timeout=10, **kwargs)
+            if response.status_code != 429:
+                self.limiter.on_success(family)
+                return response
+            self.limiter.on_429(family, parse_retry_after(response.headers.get("Retry-After")))
+        return response
     
     def _get(self, url: str, params: Optional[Dict] = None) -> Dict:
         """
@@ -55,16 +183,33 @@ class PolymarketClient:
         Returns:
             JSON response as dict
         """
-        self._rate_limit()
-        
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = self._send("GET", url, params=params)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             print(f"Error fetching {url}: {e}")
             return {}
     
+    def _post(self, url: str, payload) -> Optional[object]:
+        """
+        Make a POST request with error handling and rate limiting.
+        
+        Args:
+            url: Full URL to request
+            payload: JSON body
+            
+        Returns:
+            Parsed JSON response, or None on error
+        """
+        try:
+            response = self._send("POST", url, json=payload)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            print(f"Error posting to {url}: {e}")
+            return None
+    
     def get_markets(self, limit: int = 100, active: bool = True) -> List[Dict]:
         """
         Get active markets from Polymarket.
@@ -133,6 +278,84 @@ class PolymarketClient:
         
         return 0.0
     
+    def get_prices(self, token_ids: Iterable[str], side: str = "BUY",
+                   batch_size: int = BATCH_SIZE) -> Dict[str, float]:
+        """
+        Get best prices for many tokens via POST /prices.
+        
+        Args:
+            token_ids: Token IDs (YES and NO tokens can be mixed)
+            side: "BUY" or "SELL"
+            batch_size: Tokens per request
+            
+        Returns:
+            Dict of token_id -> price (tokens without a quote are omitted)
+        """
+        token_ids = [t for t in dict.fromkeys(token_ids) if t]
+        side = side.upper()
+        prices = {}
+        
+        for start in range(0, len(token_ids), batch_size):
+            batch = token_ids[start:start + batch_size]
+            result = self._post(f"{self.base_url}/prices",
+                                [{"token_id": t, "side": side} for t in batch])
+            if not isinstance(result, dict):
+                continue
+            
+            for token_id, quote in result.items():
+                price = quote.get(side) if isinstance(quote, dict) else quote
+                if price is not None:
+                    prices[token_id] = float(price)
+        
+        return prices
+    
+    def get_books(self, token_ids: Iterable[str],
+                  batch_size: int = BATCH_SIZE) -> Dict[str, Dict]:
+        """
+        Get full orderbooks for many tokens via POST /books.
+        
+        Args:
+            token_ids: Token IDs
+            batch_size: Tokens per request
+            
+        Returns:
+            Dict of token_id -> orderbook (bids, asks, ...); failed tokens are omitted
+        """
+        token_ids = [t for t in dict.fromkeys(token_ids) if t]
+        books = {}
+        
+        for start in range(0, len(token_ids), batch_size):
+            batch = token_ids[start:start + batch_size]
+            result = self._post(f"{self.base_url}/books", [{"token_id": t} for t in batch])
+            if not isinstance(result, list):
+                continue
+            
+            for book in result:
+                if isinstance(book, dict) and book.get("asset_id"):
+                    books[book["asset_id"]] = book
+        
+        return books
+    
+    def get_executable_prices(self, token_ids: Iterable[str], notional: Optional[float] = None,
+                              side: str = "BUY",
+                              batch_size: int = BATCH_SIZE,
+                              quantity: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Executable prices for a target notional or share quantity, from the full books.
+        
+        Args:
+            token_ids: Token IDs
+            notional: Dollars to spend (BUY) or receive (SELL) per token
+            side: "BUY" or "SELL"
+            batch_size: Tokens per /books request
+            quantity: Shares to buy or sell per token (instead of notional)
+            
+        Returns:
+            Dict of token_id -> {vwap, worst_price, filled_size, filled_notional,
+            complete} (see walk_books); tokens without a book are omitted
+        """
+        return walk_books(self.get_books(token_ids, batch_size), notional, side, quantity=quantity)
+    
     def get_midpoint(self, token_id: str) -> float:
         """
         Get midpoint price for a token.
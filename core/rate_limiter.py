@@ -0,0 +1,172 @@
+"""
+Token-Bucket Rate Limiter
+
+One limiter class for every API client (Kalshi sync/async, Polymarket).
+Each endpoint family gets its own bucket (rate per second + burst), so a
+sweep of orderbook reads doesn't eat the budget of market listing calls.
+
+acquire() reserves a slot under a short lock and sleeps outside it, which
+makes the same bucket safe to share between threads and asyncio tasks
+(acquire_async awaits instead of blocking the event loop). A 429 pauses
+the family for Retry-After and halves its rate; the rate climbs back
+towards the configured budget with each successful request.
+
+Clients in one process share limiters by name via get_limiter().
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# 429 backoff: rate floor (share of configured rate) and recovery per success
+MIN_RATE_SHARE = 0.1
+RECOVERY_SHARE = 0.05
+DEFAULT_RETRY_AFTER = 1.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket with 429 feedback."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Initialize bucket.
+
+        Args:
+            rate: Requests per second allowed on average
+            burst: Requests allowed back to back (default: one second's worth)
+        """
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, int(rate)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.throttled = 0   # 429s seen
+        self.waited = 0.0    # seconds spent waiting for slots
+
+    def _reserve(self) -> float:
+        """Take one token (possibly going into debt) and return the wait in seconds."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self.updated
+            if elapsed > 0:
+                self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+                self.updated = now
+
+            self.tokens -= 1
+            wait = max(0.0, self.updated - now)  # paused after a 429
+            if self.tokens < 0:
+                wait += -self.tokens / self.rate
+            self.waited += wait
+            return wait
+
+    def acquire(self):
+        """Block until a request may start."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait (without blocking the event loop) until a request may start."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_429(self, retry_after: Optional[float] = None):
+        """
+        Back off after a rate-limit response.
+
+        Args:
+            retry_after: Seconds from the Retry-After header (default 1s)
+        """
+        with self._lock:
+            now = time.monotonic()
+            pause = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER
+            self.rate = max(self.base_rate * MIN_RATE_SHARE, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            self.updated = max(self.updated, now + pause)
+            self.throttled += 1
+
+    def on_success(self):
+        """Recover the rate towards the configured budget."""
+        if self.rate < self.base_rate:
+            with self._lock:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * RECOVERY_SHARE)
+
+
+class RateLimiter:
+    """Per-endpoint-family token buckets."""
+
+    def __init__(self, budgets: Dict[str, Tuple[float, Optional[int]]],
+                 default: Tuple[float, Optional[int]] = (5.0, None)):
+        """
+        Initialize limiter.
+
+        Args:
+            budgets: family -> (requests per second, burst)
+            default: Budget for families not listed
+        """
+        self.default = default
+        self._buckets = {family: TokenBucket(rate, burst) for family, (rate, burst) in budgets.items()}
+        self._lock = threading.Lock()
+
+    def bucket(self, family: str) -> TokenBucket:
+        """Bucket for an endpoint family (created from the default budget if new)."""
+        bucket = self._buckets.get(family)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(family, TokenBucket(*self.default))
+        return bucket
+
+    def acquire(self, family: str):
+        self.bucket(family).acquire()
+
+    async def acquire_async(self, family: str):
+        await self.bucket(family).acquire_async()
+
+    def on_429(self, family: str, retry_after: Optional[float] = None):
+        self.bucket(family).on_429(retry_after)
+
+    def on_success(self, family: str):
+        self.bucket(family).on_success()
+
+    def stats(self) -> Dict[str, Dict]:
+        """Current rate, 429 count and total wait per family."""
+        return {
+            family: {"rate": b.rate, "base_rate": b.base_rate,
+                     "throttled": b.throttled, "waited": round(b.waited, 3)}
+            for family, b in self._buckets.items()
+        }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After header in seconds (None if absent or an HTTP date)."""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+_shared: Dict[str, RateLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def get_limiter(name: str, budgets: Dict[str, Tuple[float, Optional[int]]],
+                default: Tuple[float, Optional[int]] = (5.0, None)) -> RateLimiter:
+    """
+    Process-wide limiter by name, so every client of one API shares a budget.
+
+    Args:
+        name: Limiter name (e.g. "kalshi", "polymarket")
+        budgets: Budgets used if the limiter doesn't exist yet
+        default: Default budget used if the limiter doesn't exist yet
+
+    Returns:
+        Shared RateLimiter
+    """
+    with _shared_lock:
+        limiter = _shared.get(name)
+        if limiter is None:
+            limiter = _shared[name] = RateLimiter(budgets, default)
+        return limiter
@@ -10,8 +10,36 @@ import psycopg2
 import subprocess
 import os
 
+from core.orderbook import OrderBook
+
 app = FastAPI(title="Kalshi Bot Dashboard Pro", version="2.0.0")
 
+# Shared pooled Kalshi client, created on first use so the dashboard
+# starts even when credentials are missing
+_kalshi_client = None
+
+
+def _get_kalshi_client():
+    """Return the dashboard's shared KalshiClient (keep-alive pool)."""
+    global _kalshi_client
+    if _kalshi_client is None:
+        from core.kalshi_client import KalshiClient
+        _kalshi_client = KalshiClient()
+    return _kalshi_client
+
+
+# Shared arbitrage opportunity logger, created on first use like the client
+_opportunity_logger = None
+
+
+def _get_opportunity_logger():
+    """Return the dashboard's shared OpportunityLogger."""
+    global _opportunity_logger
+    if _opportunity_logger is None:
+        from db.opportunity_logger import OpportunityLogger
+        _opportunity_logger = OpportunityLogger()
+    return _opportunity_logger
+
 
 @app.get("/")
 async def root():
@@ -204,6 +232,22 @@ async def get_trades():
         return {"trades": []}
 
 
+@app.get("/api/opportunities")
+async def get_opportunities(limit: int = 20):
+    """Recent cross-platform opportunities with their AI/ML scores (filled in by
+    the scanner's background enrichment after the row is logged)"""
+    try:
+        opportunities = _get_opportunity_logger().get_recent_opportunities(limit)
+        for opp in opportunities:
+            opp["timestamp"] = opp["timestamp"].strftime("%H:%M:%S") if hasattr(opp["timestamp"], 'strftime') else str(opp["timestamp"])
+            opp["updated_at"] = opp["updated_at"].strftime("%H:%M:%S") if hasattr(opp["updated_at"], 'strftime') else str(opp["updated_at"])
+            opp["enriched"] = opp["ai_score"] is not None or opp["ml_score"] is not None
+        return {"opportunities": opportunities}
+    except Exception as e:
+        print(f"Database error: {e}")
+        return {"opportunities": []}
+
+
 @app.get("/api/current-market")
 async def get_current_market():
     """Get current market being traded with detailed metrics"""
@@ -221,48 +265,25 @@ async def get_current_market():
             
             # Get market info from Kalshi API
             try:
-                import os, time, base64, requests
-                from dotenv import load_dotenv
-                from cryptography.hazmat.primitives import hashes, serialization
-                from cryptography.hazmat.primitives.asymmetric import padding
-                
-                load_dotenv()
-                key = os.getenv('KALSHI_KEY_ID')
-                
-                with open('kalshi.key', 'rb') as kf:
-                    pk = serialization.load_pem_private_key(kf.read(), password=None)
-                
-                def sign(method, path, ts):
-                    msg = f'{ts}{method}{path}'
-                    sig = pk.sign(msg.encode(), padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH), hashes.SHA256())
-                    return base64.b64encode(sig).decode()
+                client = _get_kalshi_client()
                 
                 # Get market details
-                ts = str(int(time.time() * 1000))
-                path = f'/trade-api/v2/markets/{ticker}'
-                h = {'KALSHI-ACCESS-KEY': key, 'KALSHI-ACCESS-SIGNATURE': sign('GET', path, ts), 'KALSHI-ACCESS-TIMESTAMP': ts}
-                r = requests.get(f'https://api.elections.kalshi.com{path}', headers=h, timeout=10)
+                market = client.get_market(ticker)
                 
-                if r.status_code == 200:
-                    market = r.json().get('market', {})
-                    
+                if market is not None:
                     # Get orderbook for spread
-                    ts2 = str(int(time.time() * 1000))
-                    path2 = f'/trade-api/v2/markets/{ticker}/orderbook'
-                    h2 = {'KALSHI-ACCESS-KEY': key, 'KALSHI-ACCESS-SIGNATURE': sign('GET', path2, ts2), 'KALSHI-ACCESS-TIMESTAMP': ts2}
-                    r2 = requests.get(f'https://api.elections.kalshi.com{path2}', headers=h2, timeout=10)
+                    ob = client.get_orderbook(ticker)
                     
                     bid_ask_spread = "N/A"
                     best_price = 0.05
                     
-                    if r2.status_code == 200:
-                        ob = r2.json().get('orderbook', {})
-                        yes_asks = ob.get('yes', [])
-                        yes_bids = ob.get('no', [])  # No bids are inverse of yes asks
+                    if ob is not None:
+                        book = OrderBook.from_json(ob)
                         
-                        if yes_asks:
-                            best_ask = min([x[0]/100 for x in yes_asks])
-                            best_bid = max([x[0]/100 for x in yes_bids]) if yes_bids else best_ask - 0.01
+                        if book.best_yes_ask is not None:
+                            best_ask = book.best_yes_ask / 100
+                            # YES bid is implied by the NO side (100 - best NO ask)
+                            best_bid = book.best_yes_bid / 100 if book.best_yes_bid is not None else best_ask - 0.01
                             spread = best_ask - best_bid
                             bid_ask_spread = f"${spread:.2f} ({spread/best_ask*100:.1f}%)"
                             best_price = best_ask
@@ -0,0 +1,148 @@
+"""
+Persistent AI Analysis Store
+
+Keeps FunctionGemma answers on disk (SQLite, WAL mode) so a restarted
+process starts with the analyses earlier runs already paid for. It backs
+the in-memory AnalysisCache: lookups that miss in memory fall through to
+disk, and every fresh answer is written through.
+
+Rows are keyed by (cache key, model version). The version tag names the
+model and prompt format, so answers from an older model are never served
+after an upgrade. Each row carries its own expiry time; expired rows are
+ignored on read and evicted when the store is opened.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+DEFAULT_ANALYSIS_STORE_PATH = os.getenv(
+    "ANALYSIS_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "analysis_store.sqlite3")
+)
+
+# SQLite's default limit on host parameters in one statement is 999
+PREFETCH_CHUNK = 500
+
+CREATE_AI_ANALYSES_TABLE = """
+CREATE TABLE IF NOT EXISTS ai_analyses (
+    cache_key TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    function_name TEXT NOT NULL,
+    output TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (cache_key, model_version)
+)
+"""
+
+UPSERT_AI_ANALYSIS = """
+INSERT INTO ai_analyses
+    (cache_key, model_version, function_name, output, expires_at, updated_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (cache_key, model_version) DO UPDATE SET
+    function_name = excluded.function_name,
+    output = excluded.output,
+    expires_at = excluded.expires_at,
+    updated_at = excluded.updated_at
+"""
+
+
+class AnalysisStore:
+    """Disk-backed FunctionGemma answers with per-entry expiry and a model version tag."""
+
+    def __init__(self, path: str = DEFAULT_ANALYSIS_STORE_PATH, model_version: str = "default"):
+        """
+        Open (or create) the analysis store.
+
+        Args:
+            path: SQLite file path (":memory:" for a throwaway store)
+            model_version: Tag written with every answer; only rows with the
+                           same tag are read back
+        """
+        self.path = path
+        self.model_version = model_version
+        # Written from the analyzer's worker threads, so one connection behind a lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(CREATE_AI_ANALYSES_TABLE)
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+        self.evict_expired()
+
+    def get(self, cache_key: str) -> Optional[Dict]:
+        """
+        Stored answer for a cache key.
+
+        Returns:
+            {"output": dict, "expires_at": epoch seconds}, or None if absent,
+            expired or from another model version
+        """
+        return self.get_many([cache_key]).get(cache_key)
+
+    def get_many(self, cache_keys: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Stored answers for many cache keys, read in a few queries.
+
+        Returns:
+            cache_key -> {"output": dict, "expires_at": epoch seconds} for the
+            keys with a live answer
+        """
+        keys = list(dict.fromkeys(cache_keys))
+        now = time.time()
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), PREFETCH_CHUNK):
+                chunk = keys[start:start + PREFETCH_CHUNK]
+                rows = self.conn.execute(
+                    f"SELECT cache_key, output, expires_at FROM ai_analyses "
+                    f"WHERE model_version = ? AND expires_at > ? "
+                    f"AND cache_key IN ({','.join('?' * len(chunk))})",
+                    (self.model_version, now, *chunk)
+                )
+                for key, output, expires_at in rows:
+                    found[key] = {"output": json.loads(output), "expires_at": expires_at}
+        return found
+
+    def put(self, cache_key: str, function_name: str, output: Dict, ttl: float):
+        """
+        Store an answer.
+
+        Args:
+            cache_key: AnalysisCache key
+            function_name: FunctionGemma function that produced it
+            output: Parsed answer
+            ttl: Seconds the answer stays valid
+        """
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(UPSERT_AI_ANALYSIS, (cache_key, self.model_version, function_name,
+                                                   json.dumps(output), now + ttl, now))
+
+    def evict_expired(self, now: Optional[float] = None) -> int:
+        """
+        Drop expired answers (of every model version).
+
+        Returns:
+            Number of rows evicted
+        """
+        now = time.time() if now is None else now
+        with self._lock, self.conn:
+            return self.conn.execute("DELETE FROM ai_analyses WHERE expires_at <= ?", (now,)).rowcount
+
+    def stats(self) -> Dict:
+        """Row counts for the current model version and in total."""
+        with self._lock:
+            current, total = self.conn.execute(
+                "SELECT SUM(model_version = ?), COUNT(*) FROM ai_analyses", (self.model_version,)
+            ).fetchone()
+        return {"model_version": self.model_version, "answers": current or 0, "total_rows": total}
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self.conn.close()
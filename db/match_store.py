@@ -0,0 +1,163 @@
+"""
+Persistent Match Store
+
+Caches MarketMatcher pair scores on disk (SQLite, WAL mode) so a scan only
+scores Kalshi/Polymarket pairs that are new or whose market text changed.
+Pairings almost never change during a market's lifetime, so after the
+first scan nearly every pair is a cache hit.
+
+Rows are keyed by (kalshi_ticker, condition_id) and carry a hash of both
+markets' normalized text and expiry; a changed hash is treated as a miss.
+Both positive (>= threshold) and negative pairs are kept. Closed markets
+are evicted by expiry or by Polymarket's closed flag.
+"""
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+DEFAULT_MATCH_STORE_PATH = os.getenv(
+    "MATCH_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "match_store.sqlite3")
+)
+
+CREATE_MATCH_PAIRS_TABLE = """
+CREATE TABLE IF NOT EXISTS match_pairs (
+    kalshi_ticker TEXT NOT NULL,
+    condition_id TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    score REAL NOT NULL,
+    matched INTEGER NOT NULL,
+    kalshi_expiry REAL,
+    poly_expiry REAL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (kalshi_ticker, condition_id)
+)
+"""
+
+UPSERT_MATCH_PAIR = """
+INSERT INTO match_pairs
+    (kalshi_ticker, condition_id, text_hash, score, matched, kalshi_expiry, poly_expiry, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (kalshi_ticker, condition_id) DO UPDATE SET
+    text_hash = excluded.text_hash,
+    score = excluded.score,
+    matched = excluded.matched,
+    kalshi_expiry = excluded.kalshi_expiry,
+    poly_expiry = excluded.poly_expiry,
+    updated_at = excluded.updated_at
+"""
+
+
+class MatchStore:
+    """Disk-backed cache of pair scores, held in memory during a scan."""
+
+    def __init__(self, path: str = DEFAULT_MATCH_STORE_PATH):
+        """
+        Open (or create) the match store and load it into memory.
+
+        Args:
+            path: SQLite file path (":memory:" for a throwaway store)
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(CREATE_MATCH_PAIRS_TABLE)
+        self.conn.commit()
+
+        # (kalshi_ticker, condition_id) -> (text_hash, score)
+        self._scores: Dict[Tuple[str, str], Tuple[str, float]] = {
+            (k, c): (h, s) for k, c, h, s in
+            self.conn.execute("SELECT kalshi_ticker, condition_id, text_hash, score FROM match_pairs")
+        }
+        self._pending = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kalshi_ticker: str, condition_id: str, text_hash: str) -> Optional[float]:
+        """
+        Cached score for a pair.
+
+        Returns:
+            Score, or None if the pair is new or either market's text changed
+        """
+        cached = self._scores.get((kalshi_ticker, condition_id))
+        if cached is not None and cached[0] == text_hash:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        return None
+
+    def put(self, kalshi_ticker: str, condition_id: str, text_hash: str, score: float,
+            matched: bool, kalshi_expiry: Optional[float] = None,
+            poly_expiry: Optional[float] = None):
+        """Record a freshly scored pair (written to disk on flush)."""
+        key = (kalshi_ticker, condition_id)
+        self._scores[key] = (text_hash, score)
+        self._pending[key] = (kalshi_ticker, condition_id, text_hash, score, int(matched),
+                              kalshi_expiry, poly_expiry, time.time())
+
+    def flush(self) -> int:
+        """
+        Write pending pairs to disk in one transaction.
+
+        Returns:
+            Number of rows written
+        """
+        if not self._pending:
+            return 0
+        rows = list(self._pending.values())
+        with self.conn:
+            self.conn.executemany(UPSERT_MATCH_PAIR, rows)
+        self._pending.clear()
+        return len(rows)
+
+    def evict_closed(self, closed_condition_ids: Iterable[str] = (),
+                     now: Optional[float] = None) -> int:
+        """
+        Drop pairs whose Kalshi or Polymarket market has closed.
+
+        Args:
+            closed_condition_ids: Polymarket markets reported as closed
+            now: Epoch seconds (default: current time); pairs where either
+                 market expired before this are removed
+
+        Returns:
+            Number of pairs evicted
+        """
+        now = time.time() if now is None else now
+        closed = [(c,) for c in set(closed_condition_ids)]
+
+        self.flush()
+        with self.conn:
+            evicted = self.conn.execute(
+                "DELETE FROM match_pairs WHERE kalshi_expiry < ? OR poly_expiry < ?", (now, now)
+            ).rowcount
+            if closed:
+                before = self.conn.total_changes
+                self.conn.executemany("DELETE FROM match_pairs WHERE condition_id = ?", closed)
+                evicted += self.conn.total_changes - before
+
+        if evicted:
+            self._scores = {
+                (k, c): (h, s) for k, c, h, s in
+                self.conn.execute("SELECT kalshi_ticker, condition_id, text_hash, score FROM match_pairs")
+            }
+        return evicted
+
+    def stats(self) -> Dict:
+        """Cache counters for the current process."""
+        lookups = self.hits + self.misses
+        return {
+            "pairs": len(self._scores),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        """Flush and close the database."""
+        self.flush()
+        self.conn.close()
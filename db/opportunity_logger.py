@@ -10,6 +10,8 @@ import uuid
 import json
 from typing import Dict, Optional, List
 
+from core.opportunity import Opportunity
+
 
 class OpportunityLogger:
     """Log arbitrage opportunities to PostgreSQL"""
@@ -77,37 +79,32 @@ class OpportunityLogger:
         finally:
             conn.close()
     
-    def log_opportunity(self, opportunity: Dict) -> bool:
+    def log_opportunity(self, opportunity: Opportunity) -> bool:
         """
         Log an arbitrage opportunity to PostgreSQL.
         
         Args:
-            opportunity: Dict with opportunity details from scanner
+            opportunity: Opportunity record from the scanner
             
         Returns:
-            True if logged successfully
+            True if logged successfully (the row id is stored on
+            opportunity.opportunity_id for update_enrichment)
         """
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
             
             # Extract AI analysis if present
-            ai_analysis = opportunity.get('ai_analysis', {})
+            ai_analysis = opportunity.ai_analysis
             sentiment = ai_analysis.get('sentiment', {}) if ai_analysis else {}
             mispricing = ai_analysis.get('mispricing', {}) if ai_analysis else {}
             risk = ai_analysis.get('risk', {}) if ai_analysis else {}
             
-            # Parse prices from strings
-            kalshi_prices = opportunity.get('kalshi_prices', '')
-            poly_prices = opportunity.get('polymarket_prices', '')
-            
-            k_yes, k_no = self._parse_prices(kalshi_prices)
-            p_yes, p_no = self._parse_prices(poly_prices)
-            
             cursor.execute("""
                 INSERT INTO arbitrage_opportunities (
                     timestamp,
-                    kalshi_market, polymarket_market,
+                    kalshi_market, kalshi_ticker,
+                    polymarket_market, polymarket_id,
                     match_confidence, match_method,
                     kalshi_yes_price, kalshi_no_price,
                     polymarket_yes_price, polymarket_no_price,
@@ -116,38 +113,47 @@ class OpportunityLogger:
                     ai_enabled, ai_score, ai_recommendation,
                     sentiment_score, sentiment_confidence,
                     mispricing_likelihood, risk_score, risk_factors,
+                    ml_score, ml_recommendation,
                     scan_session_id
                 ) VALUES (
                     %s, %s, %s, %s, %s,
                     %s, %s, %s, %s, %s,
                     %s, %s, %s, %s, %s,
                     %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s
+                    %s, %s, %s, %s, %s,
+                    %s, %s, %s
                 )
+                RETURNING id
             """, (
-                datetime.now(),
-                opportunity.get('kalshi_market'),
-                opportunity.get('polymarket_market'),
-                opportunity.get('match_confidence', 0.8),
-                'fuzzy',
-                k_yes, k_no, p_yes, p_no,
-                opportunity.get('strategy'),
-                5.0,  # position_size from config
-                opportunity.get('gross_profit', 0),
-                opportunity.get('total_fees', 0),
-                opportunity.get('net_profit', 0),
-                opportunity.get('roi', 0),
-                'ai_analysis' in opportunity and opportunity['ai_analysis'] is not None,
-                opportunity.get('ai_score'),
-                opportunity.get('ai_recommendation'),
+                opportunity.timestamp,
+                opportunity.kalshi_market,
+                opportunity.kalshi_ticker,
+                opportunity.polymarket_market,
+                opportunity.polymarket_id,
+                opportunity.match_confidence,
+                opportunity.match_method,
+                opportunity.kalshi_yes_price, opportunity.kalshi_no_price,
+                opportunity.polymarket_yes_price, opportunity.polymarket_no_price,
+                opportunity.strategy,
+                opportunity.position_size,
+                opportunity.gross_profit,
+                opportunity.total_fees,
+                opportunity.net_profit,
+                opportunity.roi,
+                opportunity.ai_analysis is not None,
+                opportunity.ai_score,
+                opportunity.ai_recommendation,
                 sentiment.get('sentiment_score'),
                 sentiment.get('confidence'),
                 mispricing.get('mispricing_likelihood'),
                 risk.get('overall_risk'),
                 risk.get('risk_factors', []),
+                opportunity.ml_score,
+                opportunity.ml_recommendation,
                 self.session_id
             ))
             
+            opportunity.opportunity_id = cursor.fetchone()[0]
             conn.commit()
             return True
             
@@ -158,15 +164,63 @@ class OpportunityLogger:
         finally:
             conn.close()
     
-    def _parse_prices(self, price_str: str) -> tuple:
-        """Parse 'YES: $0.45, NO: $0.55' into (0.45, 0.55)"""
+    def update_enrichment(self, opportunity: Opportunity) -> bool:
+        """
+        Write AI analysis and ML score onto an already logged opportunity.
+        
+        Args:
+            opportunity: Opportunity logged by log_opportunity (has opportunity_id)
+            
+        Returns:
+            True if the row was updated
+        """
+        if opportunity.opportunity_id is None:
+            return False
+        
+        ai_analysis = opportunity.ai_analysis
+        sentiment = ai_analysis.get('sentiment', {}) if ai_analysis else {}
+        mispricing = ai_analysis.get('mispricing', {}) if ai_analysis else {}
+        risk = ai_analysis.get('risk', {}) if ai_analysis else {}
+        
+        conn = self._get_connection()
         try:
-            parts = price_str.split(',')
-            yes = float(parts[0].split('$')[1])
-            no = float(parts[1].split('$')[1])
-            return yes, no
-        except:
-            return 0.0, 0.0
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE arbitrage_opportunities
+                SET ai_enabled = %s,
+                    ai_score = %s,
+                    ai_recommendation = %s,
+                    sentiment_score = %s,
+                    sentiment_confidence = %s,
+                    mispricing_likelihood = %s,
+                    risk_score = %s,
+                    risk_factors = %s,
+                    ml_score = %s,
+                    ml_recommendation = %s,
+                    updated_at = %s
+                WHERE id = %s
+            """, (
+                ai_analysis is not None,
+                opportunity.ai_score,
+                opportunity.ai_recommendation,
+                sentiment.get('sentiment_score'),
+                sentiment.get('confidence'),
+                mispricing.get('mispricing_likelihood'),
+                risk.get('overall_risk'),
+                risk.get('risk_factors', []),
+                opportunity.ml_score,
+                opportunity.ml_recommendation,
+                datetime.now(),
+                opportunity.opportunity_id
+            ))
+            conn.commit()
+            return cursor.rowcount > 0
+        except Exception as e:
+            print(f"Error updating enrichment: {e}")
+            conn.rollback()
+            return False
+        finally:
+            conn.close()
     
     def update_execution(self, opportunity_id: int, executed: bool,
                         actual_profit: float = None, notes: str = None):
@@ -243,7 +297,8 @@ class OpportunityLogger:
             cursor.execute("""
                 SELECT 
                     id, timestamp, kalshi_market, polymarket_market,
-                    net_profit, roi, ai_score, ai_recommendation, executed
+                    net_profit, roi, ai_score, ai_recommendation,
+                    ml_score, ml_recommendation, executed, updated_at
                 FROM arbitrage_opportunities
                 ORDER BY timestamp DESC
                 LIMIT %s
@@ -260,7 +315,10 @@ class OpportunityLogger:
                     'roi': row[5],
                     'ai_score': row[6],
                     'ai_recommendation': row[7],
-                    'executed': row[8]
+                    'ml_score': row[8],
+                    'ml_recommendation': row[9],
+                    'executed': row[10],
+                    'updated_at': row[11]
                 }
                 for row in rows
             ]
@@ -299,23 +357,26 @@ if __name__ == "__main__":
     logger = OpportunityLogger()
     
     # Test opportunity
-    test_opp = {
-        'kalshi_market': 'Will Bitcoin hit $100k?',
-        'polymarket_market': 'Will BTC reach $100,000?',
-        'kalshi_prices': 'YES: $0.45, NO: $0.55',
-        'polymarket_prices': 'YES: $0.42, NO: $0.58',
-        'strategy': 'Buy YES on Kalshi, NO on Polymarket',
-        'gross_profit': 0.15,
-        'total_fees': 0.08,
-        'net_profit': 0.07,
-        'roi': 1.36,
-        'ai_score': 0.72,
-        'ai_recommendation': 'CONSIDER',
-        'ai_analysis': {
-            'sentiment': {'sentiment_score': 0.65, 'confidence': 0.82},
-            'mispricing': {'mispricing_likelihood': 0.45},
-            'risk': {'overall_risk': 0.28, 'risk_factors': ['timing', 'resolution']}
-        }
+    test_opp = Opportunity(
+        kalshi_ticker='KXBTC-100K',
+        kalshi_market='Will Bitcoin hit $100k?',
+        polymarket_id='0xtest',
+        polymarket_market='Will BTC reach $100,000?',
+        kalshi_side='yes',
+        kalshi_yes_price=0.45, kalshi_no_price=0.55,
+        polymarket_yes_price=0.42, polymarket_no_price=0.58,
+        position_size=5.0,
+        gross_profit=0.15,
+        total_fees=0.08,
+        net_profit=0.07,
+        roi=1.36,
+    )
+    test_opp.ai_score = 0.72
+    test_opp.ai_recommendation = 'CONSIDER'
+    test_opp.ai_analysis = {
+        'sentiment': {'sentiment_score': 0.65, 'confidence': 0.82},
+        'mispricing': {'mispricing_likelihood': 0.45},
+        'risk': {'overall_risk': 0.28, 'risk_factors': ['timing', 'resolution']}
     }
     
     logger.start_session(ai_enabled=True)
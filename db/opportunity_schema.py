@@ -45,6 +45,10 @@ CREATE TABLE IF NOT EXISTS arbitrage_opportunities (
     risk_score REAL,
     risk_factors TEXT[],
     
+    -- ML Score (OpportunityScorer)
+    ml_score REAL,
+    ml_recommendation TEXT,
+    
     -- Execution
     executed BOOLEAN DEFAULT FALSE,
     execution_timestamp TIMESTAMP,
@@ -59,6 +63,10 @@ CREATE TABLE IF NOT EXISTS arbitrage_opportunities (
     updated_at TIMESTAMP DEFAULT NOW()
 );
 
+-- Columns added after the first release (AI/ML scores arrive after the row is logged)
+ALTER TABLE arbitrage_opportunities ADD COLUMN IF NOT EXISTS ml_score REAL;
+ALTER TABLE arbitrage_opportunities ADD COLUMN IF NOT EXISTS ml_recommendation TEXT;
+
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_opportunities_timestamp ON arbitrage_opportunities(timestamp);
 CREATE INDEX IF NOT EXISTS idx_opportunities_net_profit ON arbitrage_opportunities(net_profit);
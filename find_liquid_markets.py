@@ -3,64 +3,42 @@
 Fetch markets with ACTUAL trading liquidity
 Query orderbooks to find markets with real bids/offers
 """
-import requests
 import time
 from collections import defaultdict
 
-api_base = "https://api.elections.kalshi.com/trade-api/v2"
+from core.kalshi_client import KalshiClient
+from core.orderbook import OrderBook
+
+client = KalshiClient(read_timeout=15)
 
 def get_active_markets():
-    """Get list of active market tickers"""
-    url = f"{api_base}/markets"
-    response = requests.get(url, params={"limit": 1000}, timeout=15)
-    
-    if response.status_code != 200:
-        return []
-    
-    data = response.json()
-    all_markets = data.get("markets", [])
-    active = [m for m in all_markets if m.get("status") == "active"]
-    return active
+    """Get list of active markets (all pages)"""
+    return [m for m in client.iter_markets(status="open") if m.get("status") == "active"]
 
 def get_orderbook(ticker):
     """Get orderbook for a specific market"""
-    url = f"{api_base}/markets/{ticker}/orderbook"
-    
-    try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            return response.json()
-    except:
-        pass
-    return None
+    return client.get_orderbook(ticker)
 
 def has_real_liquidity(orderbook_data):
     """Check if orderbook has real liquidity"""
     if not orderbook_data:
         return False, {}
     
-    orderbook = orderbook_data.get("orderbook", {})
+    book = OrderBook.from_json(orderbook_data)
     
-    # Check yes side
-    yes_bids = orderbook.get("yes", [])
-    
-    # Filter for actual bids (price > 0)
-    real_yes_bids = [bid for bid in yes_bids if bid and bid[0] > 0]
-    
-    if not real_yes_bids:
+    # Liquid means resting orders on the raw YES ladder; the highest of
+    # them is reported as the best bid
+    yes_levels = book.to_json()["yes"]
+    if not yes_levels:
         return False, {}
     
-    # Get best bid/ask
-    best_bid = max(real_yes_bids, key=lambda x: x[0]) if real_yes_bids else [0, 0]
-    
-    # Calculate total liquidity
-    total_bid_size = sum(bid[1] for bid in real_yes_bids)
+    best_price, best_size = yes_levels[-1]
     
     return True, {
-        "best_bid": best_bid[0] / 100,
-        "best_bid_size": best_bid[1],
-        "total_bids": len(real_yes_bids),
-        "total_bid_volume": total_bid_size
+        "best_bid": best_price / 100,
+        "best_bid_size": best_size,
+        "total_bids": len(yes_levels),
+        "total_bid_volume": book.depth("yes")
     }
 
 def main():
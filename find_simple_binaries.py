@@ -3,25 +3,21 @@
 Find simple BINARY markets on Kalshi
 Look for markets with clean yes/no structure
 """
-import requests
 from datetime import datetime
 from collections import defaultdict
 
-api_base = "https://api.elections.kalshi.com/trade-api/v2"
+from core.kalshi_client import KalshiClient
 
 def main():
     print("🔍 Analyzing Kalshi market structure...\n")
     
-    response = requests.get(f"{api_base}/markets", params={"limit": 1000}, timeout=15)
+    client = KalshiClient(read_timeout=15)
+    active_markets = [m for m in client.iter_markets(status="open") if m.get("status") == "active"]
     
-    if response.status_code != 200:
-        print(f"❌ API Error: {response.status_code}")
+    if not active_markets:
+        print(f"❌ API Error: no markets returned")
         return
     
-    data = response.json()
-    all_markets = data.get("markets", [])
-    active_markets = [m for m in all_markets if m.get("status") == "active"]
-    
     print(f"Total active markets: {len(active_markets)}\n")
     
     # Analyze ticker patterns
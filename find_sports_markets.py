@@ -2,25 +2,17 @@
 """
 Find liquid NBA and NFL markets on Kalshi
 """
-import requests
 from datetime import datetime
 
-api_base = "https://api.elections.kalshi.com/trade-api/v2"
+from core.kalshi_client import KalshiClient
 
 def get_sports_markets():
-    """Get NBA and NFL markets"""
-    url = f"{api_base}/markets"
-    response = requests.get(url, params={"limit": 1000}, timeout=15)
-    
-    if response.status_code != 200:
-        return []
-    
-    data = response.json()
-    all_markets = data.get("markets", [])
+    """Get NBA and NFL markets (filtered as each page streams in)"""
+    client = KalshiClient(read_timeout=15)
     
     # Filter for active NBA/NFL markets
     sports_markets = []
-    for m in all_markets:
+    for m in client.iter_markets(status="open"):
         if m.get("status") != "active":
             continue
         
@@ -2,37 +2,14 @@
 """
 Quick script to get Kalshi market statistics
 """
-import requests
 from collections import Counter
 
+from core.kalshi_client import KalshiClient
+
 def get_all_markets():
     """Fetch all markets from Kalshi API"""
-    api_base = "https://api.elections.kalshi.com/trade-api/v2"
-    url = f"{api_base}/markets"
-    
-    all_markets = []
-    cursor = None
-    
-    while True:
-        params = {"limit": 1000}
-        if cursor:
-            params["cursor"] = cursor
-            
-        response = requests.get(url, params=params)
-        if response.status_code != 200:
-            print(f"Error: {response.status_code}")
-            print(response.text)
-            break
-            
-        data = response.json()
-        markets = data.get("markets", [])
-        all_markets.extend(markets)
-        
-        cursor = data.get("cursor")
-        if not cursor:
-            break
-    
-    return all_markets
+    client = KalshiClient()
+    return list(client.iter_markets(status=None))
 
 def analyze_markets(markets):
     """Analyze and display market statistics"""
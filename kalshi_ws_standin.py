@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Kalshi orderbook WebSocket (offline testing)
+
+Speaks the subset of trade-api/ws/v2 that KalshiOrderbookFeed uses:
+subscribe / unsubscribe on the orderbook_delta channel, one snapshot per
+ticker, then a stream of random deltas with a per-subscription seq.
+--drop-every N skips a sequence number every N deltas to exercise the
+feed's gap detection and resnapshot path.
+
+Run a server for the bot:
+    python kalshi_ws_standin.py --port 8765
+    KALSHI_WS_URL=ws://127.0.0.1:8765/trade-api/ws/v2 python bot_v3.py
+
+Self-check (feed vs server books, gap recovery, price() latency):
+    python kalshi_ws_standin.py --check
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import statistics
+import threading
+import time
+
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+
+class StandinExchange:
+    """Server-side books plus the subscription protocol."""
+
+    def __init__(self, interval: float = 0.01, drop_every: int = 0, seed: int = 7):
+        self.interval = interval
+        self.drop_every = drop_every
+        self.rng = random.Random(seed)
+        self.books = {}  # ticker -> {"yes": {price: qty}, "no": {price: qty}}
+        self._sids = itertools.count(1)
+        self.dropped = 0
+
+    def _book(self, ticker):
+        if ticker not in self.books:
+            mid = self.rng.randint(20, 80)
+            self.books[ticker] = {
+                "yes": {p: self.rng.randint(1, 500) for p in range(mid, min(mid + 6, 100))},
+                "no": {p: self.rng.randint(1, 500) for p in range(100 - mid + 1, min(100 - mid + 7, 100))},
+            }
+        return self.books[ticker]
+
+    def _random_delta(self, ticker):
+        book = self._book(ticker)
+        side = self.rng.choice(["yes", "no"])
+        price = self.rng.randint(1, 99)
+        current = book[side].get(price, 0)
+        delta = self.rng.randint(-current, 200) if current else self.rng.randint(1, 200)
+        if delta == 0:
+            delta = 1
+        qty = current + delta
+        if qty > 0:
+            book[side][price] = qty
+        else:
+            book[side].pop(price, None)
+        return {"market_ticker": ticker, "price": price, "delta": delta, "side": side}
+
+    async def handler(self, ws):
+        subs = {}  # sid -> task
+
+        async def stream(sid, tickers):
+            seq = 0
+            for t in tickers:
+                book = self._book(t)
+                seq += 1
+                await ws.send(json.dumps({
+                    "type": "orderbook_snapshot", "sid": sid, "seq": seq,
+                    "msg": {"market_ticker": t,
+                            "yes": sorted([p, q] for p, q in book["yes"].items()),
+                            "no": sorted([p, q] for p, q in book["no"].items())},
+                }))
+            sent = 0
+            while True:
+                await asyncio.sleep(self.interval)
+                msg = self._random_delta(self.rng.choice(tickers))
+                seq += 1
+                sent += 1
+                if self.drop_every and sent % self.drop_every == 0:
+                    self.dropped += 1
+                    continue  # simulate a lost message: book changed, seq skipped
+                await ws.send(json.dumps({"type": "orderbook_delta", "sid": sid, "seq": seq, "msg": msg}))
+
+        try:
+            async for raw in ws:
+                cmd = json.loads(raw)
+                params = cmd.get("params", {})
+                if cmd.get("cmd") == "subscribe":
+                    sid = next(self._sids)
+                    await ws.send(json.dumps({"id": cmd.get("id"), "type": "subscribed",
+                                              "msg": {"channel": "orderbook_delta", "sid": sid}}))
+                    subs[sid] = asyncio.ensure_future(stream(sid, params.get("market_tickers", [])))
+                elif cmd.get("cmd") == "unsubscribe":
+                    for sid in params.get("sids", []):
+                        task = subs.pop(sid, None)
+                        if task:
+                            task.cancel()
+                        await ws.send(json.dumps({"id": cmd.get("id"), "type": "unsubscribed", "sid": sid}))
+        except ConnectionClosed:
+            pass
+        finally:
+            for task in subs.values():
+                task.cancel()
+
+
+def start_in_thread(host="127.0.0.1", port=0, **exchange_kwargs):
+    """
+    Run the stand-in on a background thread.
+
+    Returns:
+        (ws_url, exchange, stop) - stop() shuts the server down
+    """
+    exchange = StandinExchange(**exchange_kwargs)
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    state = {}
+
+    async def main():
+        async with serve(exchange.handler, host, port) as server:
+            state["port"] = server.sockets[0].getsockname()[1]
+            state["stop"] = loop.create_future()
+            ready.set()
+            await state["stop"]
+
+    thread = threading.Thread(target=lambda: loop.run_until_complete(main()), daemon=True)
+    thread.start()
+    ready.wait()
+
+    def stop():
+        loop.call_soon_threadsafe(state["stop"].set_result, None)
+        thread.join(5)
+
+    return f"ws://{host}:{state['port']}/trade-api/ws/v2", exchange, stop
+
+
+def run_check(n_tickers=20, seconds=3.0):
+    """Feed against the stand-in: books must match the server after gaps."""
+    from core.kalshi_client import KalshiAuth
+    from core.kalshi_ws import KalshiOrderbookFeed
+
+    url, exchange, stop = start_in_thread(interval=0.001, drop_every=250)
+    tickers = [f"STANDIN-{i:03d}" for i in range(n_tickers)]
+    feed = KalshiOrderbookFeed(tickers, ws_url=url, auth=KalshiAuth())
+    feed.start()
+
+    assert feed.wait_until_synced(timeout=5), "feed never synced"
+    time.sleep(seconds)
+
+    # Freeze the server, let the feed drain, then compare every book
+    exchange.interval = 3600
+    time.sleep(0.5)
+    feed.wait_until_synced(timeout=5)
+
+    mismatches = 0
+    for t in tickers:
+        server = {side: sorted([p, q] for p, q in levels.items())
+                  for side, levels in exchange.books[t].items()}
+        if feed.get_book(t) != server:
+            mismatches += 1
+
+    latencies = []
+    for _ in range(10000):
+        start = time.perf_counter()
+        feed.best_yes_ask(tickers[0])
+        latencies.append((time.perf_counter() - start) * 1e6)
+
+    stats = feed.stats()
+    feed.stop()
+    stop()
+
+    print("=" * 70)
+    print("KALSHI WS FEED SELF-CHECK (local stand-in)")
+    print("=" * 70)
+    print(f"Messages:        {stats['messages']:,}")
+    print(f"Dropped by server: {exchange.dropped}  |  Gaps detected: {stats['gaps']}  |  Resnapshots: {stats['resnapshots']}")
+    print(f"Books matching:  {n_tickers - mismatches}/{n_tickers}")
+    print(f"price() latency: median {statistics.median(latencies):.2f} µs | max {max(latencies):.2f} µs")
+    print("✅ PASS" if mismatches == 0 and stats["gaps"] >= 1 else "❌ FAIL")
+    return mismatches == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Kalshi orderbook WebSocket stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between deltas")
+    parser.add_argument("--drop-every", type=int, default=0, help="Skip a seq every N deltas (0 = never)")
+    parser.add_argument("--check", action="store_true", help="Run the feed self-check and exit")
+    args = parser.parse_args()
+
+    if args.check:
+        raise SystemExit(0 if run_check() else 1)
+
+    url, _, stop = start_in_thread(args.host, args.port, interval=args.interval, drop_every=args.drop_every)
+    print(f"🔌 Kalshi WS stand-in listening on {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stop()
+
+
+if __name__ == "__main__":
+    main()
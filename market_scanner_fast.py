@@ -1,66 +1,26 @@
 #!/usr/bin/env python3
 """Kalshi Market Scanner - FAST VERSION - Find liquid, near-term markets"""
-import os, time, requests, json
+import json
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
-import base64
+
+from core.kalshi_client import KalshiClient
+from core.async_kalshi_client import fetch_orderbooks
+from core.orderbook import OrderBook
 
 load_dotenv()
 
 class KalshiScanner:
     def __init__(self):
-        self.base = "https://api.elections.kalshi.com/trade-api/v2"
-        self.key = os.getenv("KALSHI_KEY_ID")
-        try:
-            with open("kalshi.key", "rb") as f:
-                self.pk = serialization.load_pem_private_key(f.read(), password=None)
-        except Exception as e:
-            print(f"❌ Key error: {e}")
-            self.pk = None
-    
-    def sign(self, method, path, ts):
-        if not self.pk: return "NONE"
-        msg = f"{ts}{method}{path}"
-        sig = self.pk.sign(msg.encode(), padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH), hashes.SHA256())
-        return base64.b64encode(sig).decode()
+        self.client = KalshiClient()
     
     def get_markets(self, limit=100, status="open"):
         """Fetch all open markets"""
-        ts = str(int(time.time() * 1000))
-        path = f"/trade-api/v2/markets?limit={limit}&status={status}"
-        headers = {
-            "KALSHI-ACCESS-KEY": self.key,
-            "KALSHI-ACCESS-SIGNATURE": self.sign("GET", path, ts),
-            "KALSHI-ACCESS-TIMESTAMP": ts
-        }
-        
-        try:
-            r = requests.get(f"{self.base}/markets?limit={limit}&status={status}", headers=headers, timeout=10)
-            if r.status_code == 200:
-                return r.json().get("markets", [])
-        except Exception as e:
-            print(f"❌ Error: {e}")
-        return []
+        return self.client.get_markets(limit=limit, status=status)
     
     def get_orderbook(self, ticker):
         """Get orderbook for volume/liquidity data"""
-        ts = str(int(time.time() * 1000))
-        path = f"/trade-api/v2/markets/{ticker}/orderbook"
-        headers = {
-            "KALSHI-ACCESS-KEY": self.key,
-            "KALSHI-ACCESS-SIGNATURE": self.sign("GET", path, ts),
-            "KALSHI-ACCESS-TIMESTAMP": ts
-        }
-        
-        try:
-            r = requests.get(f"{self.base}/markets/{ticker}/orderbook", headers=headers, timeout=8)
-            if r.status_code == 200:
-                return r.json().get("orderbook", {})
-        except:
-            pass
-        return {}
+        return self.client.get_orderbook(ticker) or {}
     
     def score_market_fast(self, market):
         """Score market based on volume and time to close ONLY (skip orderbook fetch for speed)"""
@@ -93,14 +53,19 @@ class KalshiScanner:
         
         return score
     
-    def check_liquidity(self, ticker):
+    def get_orderbooks(self, tickers):
+        """Get orderbooks for many markets concurrently (ticker -> orderbook)"""
+        return fetch_orderbooks(tickers, auth=self.client.auth)
+    
+    def check_liquidity(self, ticker, orderbook=None):
         """Check if market has active orderbook (0-20 points)"""
-        orderbook = self.get_orderbook(ticker)
+        if orderbook is None:
+            orderbook = self.get_orderbook(ticker)
         if orderbook:
-            yes_asks = orderbook.get("yes", [])
-            if yes_asks and len(yes_asks) > 2:  # Multiple orders = liquid
+            yes_levels = OrderBook.from_json(orderbook).levels("yes")
+            if yes_levels > 2:  # Multiple orders = liquid
                 return 20
-            elif yes_asks:
+            elif yes_levels:
                 return 10
         return 0
     
@@ -134,10 +99,11 @@ class KalshiScanner:
         candidates = fast_scored[:20]
         
         print(f"🎯 Phase 2: Checking orderbooks for top {len(candidates)} candidates...")
-        # SLOW PASS: Check orderbooks for top candidates only
+        # SLOW PASS: Check orderbooks for top candidates only (fetched concurrently)
+        orderbooks = self.get_orderbooks([m["ticker"] for m in candidates])
         final_scored = []
         for i, m in enumerate(candidates, 1):
-            liquidity_score = self.check_liquidity(m["ticker"])
+            liquidity_score = self.check_liquidity(m["ticker"], orderbooks.get(m["ticker"]) or {})
             final_score = m["score"] + liquidity_score
             final_scored.append({
                 "ticker": m["ticker"],
@@ -148,7 +114,6 @@ class KalshiScanner:
                 "has_orderbook": liquidity_score > 0
             })
             print(f"  [{i}/{len(candidates)}] {m['ticker'][:40]}... Score: {final_score}/100")
-            time.sleep(0.2)  # Rate limit
         
         final_scored.sort(key=lambda x: x["score"], reverse=True)
         return final_scored[:top_n]
@@ -7,17 +7,27 @@ import sys
 import os
 import time
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+import numpy as np
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from core.polymarket_client import PolymarketClient
+from core.polymarket_client import PolymarketClient, book_levels, walk_books
+from core.kalshi_client import KalshiClient
+from core.async_kalshi_client import fetch_orderbooks
+from core.arb_sizer import ArbSizer
+from core.fee_calculator import FeeCalculator
+from core.orderbook import OrderBook
+from core.opportunity import Opportunity
 from strategies.market_matcher import MarketMatcher
 from config.cross_platform_config import CROSS_PLATFORM, POLYMARKET_FEES
 from ai.functiongemma_analyzer import FunctionGemmaAnalyzer
+from ai.enrichment_queue import EnrichmentQueue
 from db.opportunity_logger import OpportunityLogger
-import requests
+from db.match_store import MatchStore
+from db.analysis_store import AnalysisStore
 
 
 class CrossPlatformScanner:
@@ -25,12 +35,16 @@ class CrossPlatformScanner:
     
     def __init__(self):
         self.polymarket = PolymarketClient()
-        self.matcher = MarketMatcher()
-        self.kalshi_api_base = "https://api.elections.kalshi.com/trade-api/v2"
+        self.match_store = MatchStore()
+        self.matcher = MarketMatcher(match_store=self.match_store,
+                                     top_k=CROSS_PLATFORM.get("match_top_k", 5))
+        self.kalshi = KalshiClient()
         
         # Initialize AI analyzer (FunctionGemma)
         try:
-            self.ai_analyzer = FunctionGemmaAnalyzer()
+            self.ai_analyzer = FunctionGemmaAnalyzer(mode=CROSS_PLATFORM.get("ai_mode", "concurrent"),
+                                                     cache_ttl=CROSS_PLATFORM.get("ai_cache_ttl", 3600),
+                                                     store=AnalysisStore())
             self.ai_enabled = True
             print("✅ AI Analysis enabled (FunctionGemma)")
         except Exception as e:
@@ -48,150 +62,295 @@ class CrossPlatformScanner:
             self.db_logger = None
             self.db_enabled = False
         
+        # Initialize ML scorer (needs scikit-learn and a trained model)
+        try:
+            from ai.ml_scorer import OpportunityScorer
+            self.ml_scorer = OpportunityScorer()
+            if self.ml_scorer.is_trained:
+                print("✅ ML scoring enabled")
+            else:
+                print("⚠️  ML scoring disabled: no trained model")
+                self.ml_scorer = None
+        except Exception as e:
+            print(f"⚠️  ML scoring disabled: {e}")
+            self.ml_scorer = None
+        
+        # AI/ML enrichment, in background workers so a slow model never
+        # delays alerting (workers=0 when enrichment runs inline)
+        self.ai_background = CROSS_PLATFORM.get("ai_background", True)
+        self.enricher = None
+        if self.ai_enabled or self.ml_scorer:
+            callbacks = [self._report_enrichment]
+            if self.db_enabled:
+                callbacks.insert(0, self.db_logger.update_enrichment)
+            self.enricher = EnrichmentQueue(self.ai_analyzer, self.ml_scorer,
+                                            workers=CROSS_PLATFORM.get("ai_workers", 2) if self.ai_background else 0,
+                                            max_depth=CROSS_PLATFORM.get("ai_queue_depth", 200),
+                                            overflow=CROSS_PLATFORM.get("ai_overflow", "drop_oldest"),
+                                            callbacks=callbacks)
+        
         self.config = CROSS_PLATFORM
         self.position_size = self.config["position_size"]
         self.min_profit = self.config["min_profit_threshold"]
+        self.fee_calc = FeeCalculator(float(os.getenv("VOLUME_30D", "0")))
+        self.sizer = ArbSizer(self.fee_calc,
+                              pm_fee_rate=POLYMARKET_FEES["trading_fee_rate"],
+                              pm_gas_fee=POLYMARKET_FEES["gas_fee_estimate"])
     
-    def get_kalshi_markets(self, limit=100):
-        """Fetch Kalshi markets (simplified)."""
+    def get_kalshi_markets(self, max_markets=None):
+        """
+        Fetch open Kalshi markets across all pages.
+        
+        Pages are streamed, so sports parlays are dropped as each page
+        arrives instead of after the whole universe is downloaded.
+        
+        Args:
+            max_markets: Stop once this many markets pass the filter (None = all)
+        """
+        markets = []
         try:
-            url = f"{self.kalshi_api_base}/markets"
-            response = requests.get(url, params={"limit": limit}, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                markets = data.get("markets", [])
-                # Filter for active, non-sports markets
-                return [m for m in markets if m.get("status") == "active" and
-                       "SINGLEGAME" not in m.get("ticker", "") and
-                       "MULTIGAME" not in m.get("ticker", "")]
-            return []
+            for m in self.kalshi.iter_markets(status="open"):
+                # Filter out sports parlays
+                ticker = m.get("ticker", "")
+                if "SINGLEGAME" in ticker or "MULTIGAME" in ticker:
+                    continue
+                
+                markets.append(m)
+                if max_markets and len(markets) >= max_markets:
+                    break
         except Exception as e:
             print(f"Error fetching Kalshi markets: {e}")
-            return []
+        return markets
     
-    def calculate_kalshi_fee(self, price_cents, quantity):
-        """Simple Kalshi fee calculation."""
-        # Approximate fee: 2-3.5% based on price
-        if price_cents < 10 or price_cents > 90:
-            fee_rate = 0.01  # 1% at extremes
-        elif 40 <= price_cents <= 60:
-            fee_rate = 0.035  # 3.5% near 50 cents
-        else:
-            fee_rate = 0.025  # 2.5% otherwise
-        
-        cost = (price_cents / 100) * quantity
-        return cost * fee_rate
+    @staticmethod
+    def _pm_token_ids(pm_market: Dict):
+        """(YES token id, NO token id) for a Polymarket market."""
+        tokens = pm_market.get("tokens", [])
+        if len(tokens) < 2:
+            return None, None
+        return tokens[0].get("token_id", ""), tokens[1].get("token_id", "")
     
-    def calculate_arb_opportunity(self, k_market: Dict, pm_market: Dict) -> Dict:
+    def get_pm_books(self, pm_markets: List[Dict]) -> Dict[str, Dict]:
         """
-        Calculate arbitrage opportunity between matched markets.
+        Fetch the YES and NO books of many Polymarket markets in batched requests.
         
-        Returns dict with opportunity details or empty dict if no opportunity.
+        Returns:
+            Dict of token_id -> orderbook
+        """
+        token_ids = []
+        for pm_market in pm_markets:
+            token_ids.extend(t for t in self._pm_token_ids(pm_market) if t)
+        return self.polymarket.get_books(token_ids)
+    
+    def get_pm_prices(self, pm_markets: List[Dict],
+                      pm_books: Optional[Dict[str, Dict]] = None) -> Dict[str, float]:
         """
-        # Get Kalshi YES price
-        k_yes_price = k_market.get("yes_ask", 0) / 100.0  # Convert cents to dollars
-        k_no_price = k_market.get("no_ask", 0) / 100.0
+        Executable BUY prices for the YES and NO tokens of many Polymarket markets.
         
-        # Get Polymarket prices (need to fetch from orderbook)
-        # For now, use simplified approach
-        pm_tokens = pm_market.get("tokens", [])
-        if len(pm_tokens) < 2:
-            return {}
+        Books are walked for position_size shares, the same quantity as the
+        Kalshi leg, so each price is the VWAP a real order for the position
+        would pay.
         
-        # Get YES token price
-        yes_token_id = pm_tokens[0].get("token_id", "") if len(pm_tokens) > 0 else ""
-        pm_yes_price = self.polymarket.get_price(yes_token_id, "BUY") if yes_token_id else 0.0
-        pm_no_price = 1.0 - pm_yes_price  # NO is inverse of YES
+        Args:
+            pm_markets: Polymarket markets (with tokens)
+            pm_books: Books from get_pm_books (fetched if not given)
         
-        if pm_yes_price == 0.0:
-            return {}
+        Returns:
+            Dict of token_id -> VWAP (tokens whose book can't fill the
+            position are omitted)
+        """
+        if pm_books is None:
+            pm_books = self.get_pm_books(pm_markets)
+        fills = walk_books(pm_books, side="BUY", quantity=self.position_size)
+        return {token: fill["vwap"] for token, fill in fills.items() if fill["complete"]}
+    
+    def size_matches(self, matches: List[Dict], pm_books: Dict[str, Dict]) -> Dict[str, Dict]:
+        """
+        Most profitable size for every matched pair, from both orderbooks.
         
-        # Calculate all possible arbitrage combinations
-        opportunities = []
+        Kalshi books are fetched in one concurrent sweep; Polymarket books
+        come from get_pm_books.
         
-        # Opportunity 1: Buy YES on one, NO on other
-        # Buy YES on Kalshi, NO on Polymarket
-        cost_1 = k_yes_price + pm_no_price
-        profit_1 = 1.0 - cost_1
-        
-        # Buy NO on Kalshi, YES on Polymarket
-        cost_2 = k_no_price + pm_yes_price
-        profit_2 = 1.0 - cost_2
-        
-        # Buy YES on Polymarket, NO on Kalshi
-        cost_3 = pm_yes_price + k_no_price
-        profit_3 = 1.0 - cost_3
-        
-        # Buy NO on Polymarket, YES on Kalshi
-        cost_4 = pm_no_price + k_yes_price
-        profit_4 = 1.0 - cost_4
-        
-        # Find best opportunity
-        opportunities = [
-            {"strategy": f"Buy YES on Kalshi (${k_yes_price:.2f}), NO on Polymarket (${pm_no_price:.2f})", 
-             "gross_profit": profit_1, "cost": cost_1},
-            {"strategy": f"Buy NO on Kalshi (${k_no_price:.2f}), YES on Polymarket (${pm_yes_price:.2f})", 
-             "gross_profit": profit_2, "cost": cost_2},
-        ]
-        
-        best_opp = max(opportunities, key=lambda x: x["gross_profit"])
-        
-        # Calculate fees
-        # Kalshi fee
-        k_price = int(k_yes_price * 100 if "YES on Kalshi" in best_opp["strategy"] else k_no_price * 100)
-        k_qty = int(self.position_size / (k_price / 100)) if k_price > 0 else 0
-        k_fee = self.calculate_kalshi_fee(k_price, k_qty)
-        
-        # Polymarket fee (2% on profits)
-        pm_fee = max(0, best_opp["gross_profit"] * self.position_size * POLYMARKET_FEES["trading_fee_rate"])
-        
-        total_fees = k_fee + pm_fee + POLYMARKET_FEES["gas_fee_estimate"]
-        
-        # Net profit
-        gross_profit_dollars = best_opp["gross_profit"] * self.position_size
-        net_profit = gross_profit_dollars - total_fees
-        
-        # Check if profitable
-        if net_profit >= self.min_profit:
-            opportunity = {
-                "kalshi_market": k_market.get("title", ""),
-                "polymarket_market": pm_market.get("question", ""),
-                "strategy": best_opp["strategy"],
-                "gross_profit": gross_profit_dollars,
-                "total_fees": total_fees,
-                "net_profit": net_profit,
-                "roi": (net_profit / (best_opp["cost"] * self.position_size)) * 100 if best_opp["cost"] > 0 else 0,
-                "kalshi_prices": f"YES: ${k_yes_price:.2f}, NO: ${k_no_price:.2f}",
-                "polymarket_prices": f"YES: ${pm_yes_price:.2f}, NO: ${pm_no_price:.2f}",
-            }
-            
-            # Add AI analysis if enabled
-            if self.ai_enabled and self.ai_analyzer:
-                try:
-                    print(f"  🤖 Analyzing with FunctionGemma...")
-                    ai_analysis = self.ai_analyzer.analyze_opportunity({
-                        "kalshi_market": opportunity["kalshi_market"],
-                        "polymarket_market": opportunity["polymarket_market"],
-                        "match_confidence": 0.8,  # Would come from matcher
-                        "net_profit": net_profit,
-                        "roi": opportunity["roi"]
-                    })
-                    
-                    opportunity["ai_analysis"] = ai_analysis
-                    opportunity["ai_score"] = ai_analysis.get("ai_score", 0.5)
-                    opportunity["ai_recommendation"] = ai_analysis.get("recommendation", "UNKNOWN")
-                    
-                except Exception as e:
-                    print(f"  ⚠️  AI analysis failed: {e}")
-                    opportunity["ai_analysis"] = None
-                    opportunity["ai_score"] = 0.5
-                    opportunity["ai_recommendation"] = "AI_ERROR"
-            
-            return opportunity
+        Returns:
+            Dict of Kalshi ticker -> ArbSizer.best_size result
+        """
+        tickers = [m["kalshi_market"].get("ticker") for m in matches if m["kalshi_market"].get("ticker")]
+        k_books = fetch_orderbooks(tickers, auth=self.kalshi.auth)
         
-        return {}
+        sizes = {}
+        for match in matches:
+            ticker = match["kalshi_market"].get("ticker")
+            yes_token_id, no_token_id = self._pm_token_ids(match["polymarket_market"])
+            if not k_books.get(ticker) or not yes_token_id or not no_token_id:
+                continue
+            sizes[ticker] = self.sizer.best_size(OrderBook.from_json(k_books[ticker]), {
+                "yes": book_levels(pm_books.get(yes_token_id)),
+                "no": book_levels(pm_books.get(no_token_id)),
+            })
+        return sizes
     
-    def scan_once(self) -> List[Dict]:
+    def evaluate_pairs(self, k_yes, k_no, pm_yes, pm_no) -> Dict[str, np.ndarray]:
+        """
+        Evaluate both cross-platform combinations for many pairs at once.
+        
+        The position is position_size contracts on each leg (as in ArbSizer);
+        gross profit, fees and ROI are all computed for that quantity.
+        
+        Combination 0 buys YES on Kalshi and NO on Polymarket, combination 1
+        buys NO on Kalshi and YES on Polymarket; the better one (by net
+        profit after fees) is kept per pair.
+        
+        Args:
+            k_yes: Kalshi YES asks in cents
+            k_no: Kalshi NO asks in cents
+            pm_yes: Polymarket YES prices in dollars (0 = not priced)
+            pm_no: Polymarket NO prices in dollars (0 = not priced)
+        
+        Returns:
+            Dict of per-pair arrays: combo, kalshi_cents, pm_price, cost,
+            gross_profit, total_fees, net_profit, roi and the profitable mask
+        """
+        k_cents = np.stack([np.asarray(k_yes, dtype=np.int64), np.asarray(k_no, dtype=np.int64)])
+        pm_price = np.stack([np.asarray(pm_no, dtype=float), np.asarray(pm_yes, dtype=float)])
+        
+        # Per-contract cost of each combination (2 x pairs); the position is
+        # position_size contracts on each leg, so one pair pays out $1.00
+        qty = self.position_size
+        cost = k_cents / 100.0 + pm_price
+        gross = (1.0 - cost) * qty
+        
+        # Kalshi taker fee on the same contracts (fee table lookup)
+        k_fee = self.fee_calc.fees(k_cents, qty * (k_cents > 0))
+        
+        # Polymarket fee (2% on profits) plus gas
+        pm_fee = np.maximum(0.0, gross * POLYMARKET_FEES["trading_fee_rate"])
+        fees = k_fee + pm_fee + POLYMARKET_FEES["gas_fee_estimate"]
+        # A combination missing a quote on either leg can't be traded
+        valid = (k_cents > 0) & (pm_price > 0)
+        net = np.where(valid, gross - fees, -np.inf)
+        
+        combo = np.argmax(net, axis=0)
+        pick = np.arange(net.shape[1])
+        valid = valid[combo, pick]
+        cost, gross, fees, net = cost[combo, pick], gross[combo, pick], fees[combo, pick], net[combo, pick]
+        roi = np.divide(net * 100, cost * qty, out=np.zeros_like(net), where=valid & (cost > 0))
+        
+        return {
+            "combo": combo,
+            "kalshi_cents": k_cents[combo, pick],
+            "pm_price": pm_price[combo, pick],
+            "cost": cost,
+            "gross_profit": gross,
+            "total_fees": fees,
+            "net_profit": net,
+            "roi": roi,
+            "profitable": valid & (net >= self.min_profit),
+        }
+    
+    def _build_opportunity(self, k_market: Dict, pm_market: Dict,
+                           pm_yes_price: float, pm_no_price: float,
+                           evaluation: Dict[str, np.ndarray], i: int,
+                           match_confidence: float = 0.0, match_method: str = "fuzzy",
+                           kalshi_quote_time: Optional[float] = None,
+                           polymarket_quote_time: Optional[float] = None) -> Opportunity:
+        """Opportunity record for pair i of evaluate_pairs (AI analysis is added by analyze)."""
+        opportunity = Opportunity(
+            kalshi_ticker=k_market.get("ticker", ""),
+            kalshi_market=k_market.get("title", ""),
+            polymarket_id=pm_market.get("condition_id", ""),
+            polymarket_market=pm_market.get("question", ""),
+            kalshi_side="yes" if evaluation["combo"][i] == 0 else "no",
+            kalshi_yes_price=(k_market.get("yes_ask") or 0) / 100.0,
+            kalshi_no_price=(k_market.get("no_ask") or 0) / 100.0,
+            polymarket_yes_price=float(pm_yes_price),
+            polymarket_no_price=float(pm_no_price),
+            position_size=self.position_size,
+            gross_profit=float(evaluation["gross_profit"][i]),
+            total_fees=float(evaluation["total_fees"][i]),
+            net_profit=float(evaluation["net_profit"][i]),
+            roi=float(evaluation["roi"][i]),
+            kalshi_quote_time=kalshi_quote_time,
+            polymarket_quote_time=polymarket_quote_time,
+            match_confidence=match_confidence,
+            match_method=match_method,
+        )
+        
+        return opportunity
+    
+    def analyze(self, opportunities: List[Opportunity]):
+        """
+        Add AI analysis (batched FunctionGemma prompts) and ML score to
+        opportunities in place, waiting for the result.
+        """
+        if self.enricher is None or not opportunities:
+            return
+        
+        print(f"  🤖 Analyzing {len(opportunities)} opportunities with FunctionGemma...")
+        self.enricher.enrich(opportunities)
+    
+    def enqueue(self, opportunities: List[Opportunity]):
+        """
+        Hand opportunities to the background enrichment workers and return
+        at once (analyzes them inline when background enrichment is off).
+        Enriched opportunities are written back to their database rows.
+        """
+        if self.enricher is None or not opportunities:
+            return
+        if not self.ai_background:
+            self.analyze(opportunities)
+            return
+        
+        dropped = self.enricher.submit(opportunities)
+        print(f"  🤖 Queued {len(opportunities)} opportunities for AI/ML enrichment "
+              f"({self.enricher.depth} waiting)")
+        if dropped:
+            print(f"  ⚠️  Enrichment queue full: dropped {dropped} oldest opportunities")
+    
+    def _report_enrichment(self, opportunity: Opportunity):
+        """Print the scores of an opportunity enriched in the background."""
+        if not self.ai_background:
+            return
+        line = f"  🤖 {opportunity.kalshi_ticker}:"
+        if opportunity.ai_score is not None:
+            line += f" AI {opportunity.ai_score*100:.0f}/100 ({opportunity.ai_recommendation})"
+        if opportunity.ml_score is not None:
+            line += f" ML {opportunity.ml_score:.2f} ({opportunity.ml_recommendation})"
+        print(line)
+    
+    def calculate_arb_opportunity(self, k_market: Dict, pm_market: Dict,
+                                  pm_prices: Optional[Dict[str, float]] = None) -> Optional[Opportunity]:
+        """
+        Calculate arbitrage opportunity between one matched pair.
+        
+        Args:
+            k_market: Kalshi market (with yes_ask / no_ask)
+            pm_market: Polymarket market (with tokens)
+            pm_prices: token_id -> price from get_pm_prices (fetched for this
+                       pair alone if not given)
+        
+        Returns Opportunity, or None if the pair isn't profitable.
+        """
+        yes_token_id, no_token_id = self._pm_token_ids(pm_market)
+        if not yes_token_id or not no_token_id:
+            return None
+        
+        kalshi_quote_time = time.time()
+        if pm_prices is None:
+            pm_prices = self.get_pm_prices([pm_market])
+        pm_yes_price = pm_prices.get(yes_token_id, 0.0)
+        pm_no_price = pm_prices.get(no_token_id, 0.0)
+        
+        evaluation = self.evaluate_pairs([k_market.get("yes_ask") or 0], [k_market.get("no_ask") or 0],
+                                         [pm_yes_price], [pm_no_price])
+        if not evaluation["profitable"][0]:
+            return None
+        opportunity = self._build_opportunity(k_market, pm_market, pm_yes_price, pm_no_price, evaluation, 0,
+                                              kalshi_quote_time=kalshi_quote_time,
+                                              polymarket_quote_time=time.time())
+        self.enqueue([opportunity])
+        return opportunity
+    
+    def scan_once(self) -> List[Opportunity]:
         """
         Perform a single scan for arbitrage opportunities.
         
@@ -208,7 +367,8 @@ class CrossPlatformScanner:
         
         # Fetch markets
         print("  Fetching Kalshi markets...")
-        k_markets = self.get_kalshi_markets(limit=100)
+        k_markets = self.get_kalshi_markets()
+        kalshi_quote_time = time.time()
         
         print("  Fetching Polymarket markets...")
         pm_markets = self.polymarket.get_simplified_markets(limit=100)
@@ -221,28 +381,90 @@ class CrossPlatformScanner:
                 self.db_logger.end_session("No Kalshi markets available")
             return []
         
-        # Match markets
+        # Match markets (pairs scored on earlier scans come from the match store)
         print("  Matching markets...")
-        matches = self.matcher.batch_match(k_markets, pm_markets, min_confidence=0.75)
-        
-        print(f"  Found {len(matches)} matched market pairs")
-        
-        # Find arbitrage opportunities
+        evicted = self.match_store.evict_closed(m.get("condition_id") for m in pm_markets if m.get("closed"))
+        hits, misses = self.match_store.hits, self.match_store.misses
+        matches = self.matcher.batch_match(k_markets, pm_markets, min_confidence=0.75,
+                                           method=CROSS_PLATFORM.get("match_method", "fuzzy"))
+        
+        print(f"  Found {len(matches)} matched market pairs "
+              f"(scored {self.match_store.misses - misses} new pairs, "
+              f"{self.match_store.hits - hits} cached, {evicted} evicted)")
+        
+        # Warm the AI cache with every stored analysis of the matched pairs in one read
+        if self.ai_enabled and matches:
+            loaded = self.ai_analyzer.prefetch({
+                "kalshi_market": m["kalshi_market"].get("title", ""),
+                "polymarket_market": m["polymarket_market"].get("question", ""),
+                "match_confidence": m["confidence"],
+            } for m in matches)
+            if loaded:
+                print(f"  Loaded {loaded} stored AI analyses for matched pairs")
+        
+        # Price every matched Polymarket market from its book, in a few batched requests
+        matched_pm = [m["polymarket_market"] for m in matches]
+        pm_books = self.get_pm_books(matched_pm) if matches else {}
+        polymarket_quote_time = time.time()
+        pm_prices = self.get_pm_prices(matched_pm, pm_books)
+        
+        # Size every pair against both books (how much the arb can actually take)
+        sizes = self.size_matches(matches, pm_books) if matches else {}
+        
+        # Evaluate every pair in one vectorized pass
+        token_ids = [self._pm_token_ids(m["polymarket_market"]) for m in matches]
+        pm_yes = [pm_prices.get(yes, 0.0) if yes else 0.0 for yes, _ in token_ids]
+        pm_no = [pm_prices.get(no, 0.0) if no else 0.0 for _, no in token_ids]
+        evaluation = self.evaluate_pairs(
+            [m["kalshi_market"].get("yes_ask") or 0 for m in matches],
+            [m["kalshi_market"].get("no_ask") or 0 for m in matches],
+            pm_yes, pm_no
+        )
+        
+        # Build opportunity records only for profitable pairs
+        match_method = CROSS_PLATFORM.get("match_method", "fuzzy")
         opportunities = []
         
-        for match in matches:
-            opp = self.calculate_arb_opportunity(
-                match["kalshi_market"],
-                match["polymarket_market"]
+        for i in np.flatnonzero(evaluation["profitable"]):
+            match = matches[i]
+            ticker = match["kalshi_ticker"]
+            opp = self._build_opportunity(
+                match["kalshi_market"], match["polymarket_market"], pm_yes[i], pm_no[i], evaluation, i,
+                match_confidence=match["confidence"],
+                match_method="manual" if ticker in self.matcher.manual_matches else match_method,
+                kalshi_quote_time=kalshi_quote_time,
+                polymarket_quote_time=polymarket_quote_time,
             )
             
-            if opp:
-                opp["match_confidence"] = match["confidence"]
-                opportunities.append(opp)
-                
-                # Log to database
-                if self.db_enabled:
-                    self.db_logger.log_opportunity(opp)
+            sizing = sizes.get(ticker)
+            if sizing and sizing["size"]:
+                opp.max_size = sizing["size"]
+                opp.max_size_cost = sizing["cost"]
+                opp.max_size_net_profit = sizing["net_profit"]
+            opportunities.append(opp)
+        
+        # Inline AI analysis for the whole scan in a few batched prompts
+        if not self.ai_background:
+            self.analyze(opportunities)
+        
+        # Log to database
+        if self.db_enabled:
+            for opp in opportunities:
+                self.db_logger.log_opportunity(opp)
+        
+        # Background AI/ML enrichment; scores are written back to the logged rows
+        if self.ai_background:
+            self.enqueue(opportunities)
+            stats = self.enricher.stats() if self.enricher is not None else None
+            if stats:
+                print(f"  Enrichment queue: {stats['depth']} waiting (peak {stats['high_water']}), "
+                      f"{stats['enriched']} enriched, {stats['dropped']} dropped, "
+                      f"avg {stats['avg_latency']:.1f}s to enrich")
+        
+        if self.ai_enabled and self.ai_analyzer.cache is not None:
+            stats = self.ai_analyzer.cache_stats()
+            print(f"  AI cache: {stats['hits']} hits, {stats['misses']} misses "
+                  f"({stats['hit_rate']:.0%}), {stats['size']} answers held")
         
         # End session
         if self.db_enabled:
@@ -251,7 +473,7 @@ class CrossPlatformScanner:
         
         return opportunities
     
-    def display_opportunities(self, opportunities: List[Dict]):
+    def display_opportunities(self, opportunities: List[Opportunity]):
         """Display found opportunities in a readable format."""
         if not opportunities:
             print("\n❌ No arbitrage opportunities found.\n")
@@ -263,25 +485,28 @@ class CrossPlatformScanner:
         
         for i, opp in enumerate(opportunities, 1):
             print(f"[{i}] {'='*90}")
-            print(f"Kalshi:      {opp['kalshi_market']}")
-            print(f"Polymarket:  {opp['polymarket_market']}")
-            print(f"\nStrategy: {opp['strategy']}")
+            print(f"Kalshi:      {opp.kalshi_market} ({opp.kalshi_ticker})")
+            print(f"Polymarket:  {opp.polymarket_market}")
+            print(f"\nStrategy: {opp.strategy}")
             print(f"\nPrices:")
-            print(f"  Kalshi:      {opp['kalshi_prices']}")
-            print(f"  Polymarket:  {opp['polymarket_prices']}")
-            print(f"\nProfit Analysis (Position: ${self.position_size}):")
-            print(f"  Gross Profit: ${opp['gross_profit']:.4f}")
-            print(f"  Fees:         ${opp['total_fees']:.4f}")
-            print(f"  NET PROFIT:   ${opp['net_profit']:.4f}")
-            print(f"  ROI:          {opp['roi']:.2f}%")
+            print(f"  Kalshi:      YES: ${opp.kalshi_yes_price:.2f}, NO: ${opp.kalshi_no_price:.2f}")
+            print(f"  Polymarket:  YES: ${opp.polymarket_yes_price:.2f}, NO: ${opp.polymarket_no_price:.2f}")
+            print(f"\nProfit Analysis (Position: {opp.position_size:g} contracts):")
+            print(f"  Gross Profit: ${opp.gross_profit:.4f}")
+            print(f"  Fees:         ${opp.total_fees:.4f}")
+            print(f"  NET PROFIT:   ${opp.net_profit:.4f}")
+            print(f"  ROI:          {opp.roi:.2f}%")
+            if opp.max_size:
+                print(f"  Max Size:     {opp.max_size} contracts (${opp.max_size_cost:.2f}) "
+                      f"-> net ${opp.max_size_net_profit:.4f}")
             
             # Display AI analysis if available
-            if 'ai_analysis' in opp and opp['ai_analysis']:
+            if opp.ai_analysis:
                 print(f"\n🤖 AI Analysis (FunctionGemma):")
-                print(f"  Overall Score:    {opp['ai_score']*100:.1f}/100")
-                print(f"  Recommendation:   {opp['ai_recommendation']}")
+                print(f"  Overall Score:    {opp.ai_score*100:.1f}/100")
+                print(f"  Recommendation:   {opp.ai_recommendation}")
                 
-                ai = opp['ai_analysis']
+                ai = opp.ai_analysis
                 if 'sentiment' in ai and ai['sentiment']:
                     sent = ai['sentiment']
                     print(f"  Sentiment:        {sent.get('sentiment_score', 0):.2f} (confidence: {sent.get('confidence', 0):.2f})")
@@ -306,7 +531,7 @@ class CrossPlatformScanner:
             interval_seconds: Time between scans (default 900 = 15 minutes)
         """
         print(f"\n🔄 Starting continuous scanning mode...")
-        print(f"   Position size: ${self.position_size}")
+        print(f"   Position size: {self.position_size:g} contracts")
         print(f"   Min profit threshold: ${self.min_profit}")
         print(f"   Scan interval: {interval_seconds // 60} minutes\n")
         
@@ -339,7 +564,7 @@ def main():
     parser = argparse.ArgumentParser(description="Cross-platform arbitrage scanner")
     parser.add_argument("--continuous", action="store_true", help="Run continuous scanning")
     parser.add_argument("--interval", type=int, default=900, help="Scan interval in seconds (default: 900)")
-    parser.add_argument("--position-size", type=float, help="Override position size")
+    parser.add_argument("--position-size", type=float, help="Override position size (contracts per leg)")
     parser.add_argument("--min-profit", type=float, help="Override min profit threshold")
     
     args = parser.parse_args()
@@ -360,6 +585,11 @@ def main():
         # Single scan
         opportunities = scanner.scan_once()
         scanner.display_opportunities(opportunities)
+        
+        # Let background enrichment finish before exiting
+        if scanner.enricher is not None and scanner.ai_background and opportunities:
+            print("⏳ Waiting for AI/ML enrichment...")
+            scanner.enricher.close()
 
 
 if __name__ == "__main__":
@@ -23,7 +23,7 @@ echo ""
 
 # 1. Python dependencies
 echo "1️⃣  Python dependencies..."
-pip3 install --user fuzzywuzzy python-Levenshtein psycopg2-binary scikit-learn joblib requests 2>&1 | grep -E "(Successfully|Requirement already)"
+pip3 install --user fuzzywuzzy python-Levenshtein psycopg2-binary scikit-learn numpy joblib requests aiohttp websockets 2>&1 | grep -E "(Successfully|Requirement already)"
 echo -e "${GREEN}✅ Python packages installed${NC}"
 echo ""
 
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Event Sum Arbitrage Detector
+Finds mutually exclusive Kalshi events whose outcomes can be bought as a
+complete set for less than the set is guaranteed to pay
+
+For an event with n mutually exclusive outcomes:
+- YES basket: buy YES on every outcome. If the outcomes are exhaustive,
+  exactly one resolves YES, so the set pays $1; profitable when the YES
+  asks plus fees sum below $1. Kalshi doesn't flag exhaustive events, so
+  only events with a catch-all outcome ("Other", "None of the above",
+  ...) count as exhaustive; YES baskets on other events are skipped, or
+  reported tagged requires_exhaustive with include_non_exhaustive=True.
+- NO basket: buy NO on every outcome. At most one resolves YES, so at least
+  n - 1 NO contracts pay; profitable when the NO asks plus fees sum below
+  $(n - 1).
+
+Events are flattened into one array of legs, so every event is summed in
+one pass. Quotes from /events are checked first; orderbooks are fetched
+(concurrently) only for events within prefilter_margin_cents of an arb.
+"""
+
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.fee_calculator import FeeCalculator
+from core.kalshi_client import KalshiClient
+from core.orderbook import OrderBook
+from core.async_kalshi_client import fetch_orderbooks, DEFAULT_MAX_IN_FLIGHT
+
+load_dotenv()
+
+ACTIVE_STATUSES = ("active", "open")
+
+# Outcome labels that cover everything the other outcomes don't
+CATCH_ALL_LABELS = ("other", "others", "any other", "someone else", "field",
+                    "none", "none of the above", "no one", "nobody")
+
+
+class EventArbitrageDetector:
+    """
+    Detect complete-set arbitrage across the outcomes of one Kalshi event
+    """
+
+    def __init__(self, volume_30d=0, quantity=10, min_net_profit=0.0,
+                 prefilter_margin_cents=3, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 include_non_exhaustive=False):
+        """
+        Initialize detector
+
+        Args:
+            volume_30d: Your 30-day trading volume for fee calculation
+            quantity: Contracts bought on each leg
+            min_net_profit: Minimum net profit (dollars) for the whole basket
+            prefilter_margin_cents: How far (per set) quoted prices may be from
+                                    an arb and still get an orderbook check
+                                    (None = fetch books for every event)
+            max_in_flight: Max concurrent orderbook requests
+            include_non_exhaustive: Also report YES baskets on events without a
+                                    catch-all outcome (tagged requires_exhaustive)
+        """
+        self.fee_calc = FeeCalculator(volume_30d)
+        self.quantity = quantity
+        self.min_net_profit = min_net_profit
+        self.prefilter_margin_cents = prefilter_margin_cents
+        self.max_in_flight = max_in_flight
+        self.include_non_exhaustive = include_non_exhaustive
+        self.client = KalshiClient()
+
+    def get_events(self, **filters) -> List[Dict]:
+        """
+        Mutually exclusive open events with at least two tradable outcomes
+
+        Events where any outcome has stopped trading are skipped, since the
+        complete-set payout no longer holds for the remaining legs.
+        """
+        events = []
+        for event in self.client.iter_events(status="open", with_nested_markets=True, **filters):
+            markets = event.get("markets") or []
+            if not event.get("mutually_exclusive") or len(markets) < 2:
+                continue
+            if any(m.get("status") not in ACTIVE_STATUSES for m in markets):
+                continue
+            events.append(event)
+        return events
+
+    @staticmethod
+    def is_exhaustive(event: Dict) -> bool:
+        """
+        True if one of the event's outcomes is a catch-all, so some outcome
+        is certain to resolve YES
+        """
+        for market in event.get("markets") or []:
+            for field in ("yes_sub_title", "subtitle", "title"):
+                label = (market.get(field) or "").strip().lower().rstrip(".")
+                if label in CATCH_ALL_LABELS:
+                    return True
+        return False
+
+    @staticmethod
+    def _flatten(events: List[Dict]) -> Tuple[np.ndarray, List[str]]:
+        """Event index for every leg, and the leg tickers in the same order"""
+        event_idx, tickers = [], []
+        for i, event in enumerate(events):
+            for market in event["markets"]:
+                event_idx.append(i)
+                tickers.append(market.get("ticker"))
+        return np.array(event_idx, dtype=np.int64), tickers
+
+    def evaluate(self, event_idx: np.ndarray, yes_cents: np.ndarray, no_cents: np.ndarray,
+                 n_events: int, quantity: int) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Cost, payout, fees and net profit of both baskets for every event
+
+        Args:
+            event_idx: Event index of each leg
+            yes_cents: Best YES ask per leg in cents (0 = no offer)
+            no_cents: Best NO ask per leg in cents (0 = no offer)
+            n_events: Number of events
+            quantity: Contracts per leg
+
+        Returns:
+            {"YES": arrays, "NO": arrays}, each with cost, payout, fees,
+            net_profit and complete (every leg has an offer), indexed by event
+        """
+        legs = np.bincount(event_idx, minlength=n_events)
+        results = {}
+        for side, cents in (("YES", yes_cents), ("NO", no_cents)):
+            offered = (cents > 0) & (cents < 100)
+            cost = np.bincount(event_idx, weights=cents / 100 * quantity, minlength=n_events)
+            fees = np.bincount(event_idx, weights=self.fee_calc.fees(cents, quantity) * offered,
+                               minlength=n_events)
+            payout = (1 if side == "YES" else legs - 1) * quantity * 1.00
+            net = payout - cost - fees
+            complete = np.bincount(event_idx, weights=offered, minlength=n_events) == legs
+            results[side] = {
+                "cost": cost,
+                "payout": np.broadcast_to(payout, (n_events,)).astype(float),
+                "fees": fees,
+                "net_profit": np.where(complete, net, -np.inf),
+                "complete": complete,
+            }
+        return results
+
+    def find_opportunities(self, events: List[Dict] = None, **filters) -> List[Dict]:
+        """
+        Scan events for complete-set arbitrage
+
+        Args:
+            events: Events from get_events (fetched if None)
+            **filters: Passed to get_events (e.g. series_ticker)
+
+        Returns:
+            list: Opportunities sorted by net profit
+        """
+        print(f"🔍 Scanning Kalshi events for complete-set arbitrage...")
+        if events is None:
+            events = self.get_events(**filters)
+        if not events:
+            print("❌ No mutually exclusive events found")
+            return []
+
+        event_idx, tickers = self._flatten(events)
+        exhaustive = np.array([self.is_exhaustive(e) for e in events], dtype=bool)
+        yes_ok = exhaustive | self.include_non_exhaustive
+        print(f"📊 {len(events)} mutually exclusive events ({int(exhaustive.sum())} exhaustive), "
+              f"{len(tickers)} outcome markets")
+
+        # Stage 1: quoted asks from the /events payload, no requests
+        candidates = np.arange(len(events))
+        if self.prefilter_margin_cents is not None:
+            markets = [m for e in events for m in e["markets"]]
+            quoted = self.evaluate(event_idx,
+                                   np.array([m.get("yes_ask") or 0 for m in markets]),
+                                   np.array([m.get("no_ask") or 0 for m in markets]),
+                                   len(events), 1)
+            margin = self.prefilter_margin_cents / 100
+            near = (((quoted["YES"]["net_profit"] >= -margin) & yes_ok)
+                    | (quoted["NO"]["net_profit"] >= -margin))
+            candidates = np.flatnonzero(near)
+            print(f"   Prefilter: {len(candidates)} events within {self.prefilter_margin_cents}¢ "
+                  f"of an arb need orderbooks")
+        if not len(candidates):
+            return []
+
+        # Stage 2: best asks and top-of-book size from the orderbooks of candidate legs
+        keep = np.isin(event_idx, candidates)
+        leg_tickers = [t for t, k in zip(tickers, keep) if k]
+        orderbooks = fetch_orderbooks(leg_tickers, auth=self.client.auth, max_in_flight=self.max_in_flight)
+
+        yes_cents = np.zeros(len(leg_tickers), dtype=np.int64)
+        no_cents = np.zeros(len(leg_tickers), dtype=np.int64)
+        yes_size = np.zeros(len(leg_tickers), dtype=np.int64)
+        no_size = np.zeros(len(leg_tickers), dtype=np.int64)
+        for i, ticker in enumerate(leg_tickers):
+            book = OrderBook.from_json(orderbooks.get(ticker))
+            if book.best_yes_ask is not None:
+                yes_cents[i], yes_size[i] = book.best_yes_ask, book.size_at("yes", book.best_yes_ask)
+            if book.best_no_ask is not None:
+                no_cents[i], no_size[i] = book.best_no_ask, book.size_at("no", book.best_no_ask)
+
+        # Re-number the surviving events densely for the array pass
+        sub_events = [events[i] for i in candidates]
+        sub_idx = np.searchsorted(candidates, event_idx[keep])
+        result = self.evaluate(sub_idx, yes_cents, no_cents, len(sub_events), self.quantity)
+
+        opportunities = []
+        for side, cents, sizes in (("YES", yes_cents, yes_size), ("NO", no_cents, no_size)):
+            # Contracts available at the best ask on the thinnest leg
+            fillable = np.full(len(sub_events), np.iinfo(np.int64).max)
+            np.minimum.at(fillable, sub_idx, sizes)
+
+            arrays = result[side]
+            profitable = arrays["net_profit"] >= max(self.min_net_profit, 1e-9)
+            if side == "YES":
+                # The $1 payout only holds if some outcome must resolve YES
+                profitable &= yes_ok[candidates]
+            for i in np.flatnonzero(profitable):
+                event = sub_events[i]
+                legs = np.flatnonzero(sub_idx == i)
+                opportunities.append({
+                    'event_ticker': event.get('event_ticker'),
+                    'title': event.get('title', '')[:75],
+                    'side': side,
+                    'outcomes': len(legs),
+                    'legs': [(leg_tickers[j], int(cents[j])) for j in legs],
+                    'price_sum_cents': int(cents[legs].sum()),
+                    'quantity': self.quantity,
+                    'total_cost': float(arrays['cost'][i]),
+                    'guaranteed_payout': float(arrays['payout'][i]),
+                    'total_fees': float(arrays['fees'][i]),
+                    'net_profit': float(arrays['net_profit'][i]),
+                    'fillable': int(fillable[i]),
+                    'requires_exhaustive': side == "YES" and not exhaustive[candidates[i]],
+                })
+
+        opportunities.sort(key=lambda x: x['net_profit'], reverse=True)
+        return opportunities
+
+    def print_opportunities(self, opportunities):
+        """Print opportunities in a nice format"""
+        if not opportunities:
+            print("\n❌ No complete-set arbitrage found")
+            return
+
+        print(f"\n{'='*80}")
+        print(f"✨ EVENT SUM ARBITRAGE: Found {len(opportunities)}!")
+        print(f"{'='*80}\n")
+
+        for i, opp in enumerate(opportunities, 1):
+            print(f"[{i}] {'='*76}")
+            print(f"Event: {opp['title']}")
+            print(f"Ticker: {opp['event_ticker']}")
+            print(f"Basket: buy {opp['side']} on all {opp['outcomes']} outcomes "
+                  f"(sum {opp['price_sum_cents']}¢)")
+            if opp['requires_exhaustive']:
+                print("⚠️  No catch-all outcome: the payout assumes these outcomes are exhaustive")
+            for ticker, cents in opp['legs']:
+                print(f"  {ticker}: {cents}¢")
+            print(f"\nProfit Analysis ({opp['quantity']} contracts per leg):")
+            print(f"  Total Cost: ${opp['total_cost']:.2f}")
+            print(f"  Guaranteed Payout: ${opp['guaranteed_payout']:.2f}")
+            print(f"  Fees: ${opp['total_fees']:.2f}")
+            print(f"  Net Profit: ${opp['net_profit']:.2f}")
+            print(f"  Fillable at best asks: {opp['fillable']} contracts per leg")
+            print(f"{'='*76}\n")
+
+
+if __name__ == "__main__":
+    detector = EventArbitrageDetector(volume_30d=0)
+
+    start = time.time()
+    opportunities = detector.find_opportunities()
+    detector.print_opportunities(opportunities)
+    print(f"⏱️  Scan took {time.time() - start:.1f}s")
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Ladder (Monotonicity) Arbitrage Detector
+Finds strike markets on the same underlying and expiry whose prices
+contradict each other
+
+Every strike market pays YES on a region of the underlying: above X,
+below X, or a bracket [low, high]. If market A's region contains market
+B's, A's YES can never be worth less than B's:
+- Monotonicity: "above X" must cost at least "above Y" for X < Y
+  (and "below X" at least "below Y" for X > Y)
+- Bracket consistency: a bracket inside "above X" must cost less than it
+
+When it doesn't, buy YES on A and NO on B. At least one leg always pays
+$1 (both do when the outcome lands in A but not B), so the pair is an arb
+whenever the two asks plus fees come in under $1.
+
+Markets are parsed into (ladder, region) once, sorted into ladders, and
+the cheapest NO inside every threshold's region is found with a running
+minimum over the whole universe at once - no per-ladder loops.
+"""
+
+import math
+import os
+import re
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.fee_calculator import FeeCalculator
+from core.kalshi_client import KalshiClient
+from core.orderbook import OrderBook
+from core.async_kalshi_client import fetch_orderbooks, DEFAULT_MAX_IN_FLIGHT
+
+load_dotenv()
+
+# Threshold ("above/below X") series and the range series on the same underlying
+# share one ladder per expiry
+LADDER_ROOTS = {
+    "KXBTCD": "KXBTC",
+    "KXETHD": "KXETH",
+    "KXINXU": "KXINX",
+    "KXNASDAQ100U": "KXNASDAQ100",
+}
+
+# Kalshi strike tickers end in T<threshold> or B<bracket midpoint>
+TICKER_STRIKE = re.compile(r"-([TB])(-?\d+(?:\.\d+)?)$")
+NUM = r"\$?(-?\d[\d,]*(?:\.\d+)?)"
+ABOVE_TEXT = re.compile(rf"(?:above|over|more than|greater than|at least)\s+{NUM}|{NUM}\S*\s+or (?:above|higher|more)")
+BELOW_TEXT = re.compile(rf"(?:below|under|less than|at most)\s+{NUM}|{NUM}\S*\s+or (?:below|lower|less)")
+RANGE_TEXT = re.compile(rf"{NUM}\s*(?:to|-|–)\s*{NUM}")
+
+NO_OFFER = 1000  # Price (cents) given to legs without an ask, so they never win a minimum
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", ""))
+
+
+def _first(match) -> float:
+    return _number(next(g for g in match.groups() if g is not None))
+
+
+def parse_strike(market: Dict) -> Optional[Tuple[str, float, float]]:
+    """
+    Region of the underlying where a strike market pays YES
+
+    Uses strike_type / floor_strike / cap_strike when present, and falls
+    back to the ticker suffix and the title/subtitle text.
+
+    Args:
+        market: Kalshi market dict
+
+    Returns:
+        (kind, low, high) with kind "greater" (value > low), "less"
+        (value < high) or "between" (low <= value <= high), or None if the
+        market isn't a strike market
+    """
+    strike_type = market.get("strike_type")
+    floor, cap = market.get("floor_strike"), market.get("cap_strike")
+    if strike_type in ("greater", "greater_or_equal") and floor is not None:
+        return "greater", float(floor), math.inf
+    if strike_type in ("less", "less_or_equal") and cap is not None:
+        return "less", -math.inf, float(cap)
+    if strike_type == "between" and floor is not None and cap is not None:
+        return "between", float(floor), float(cap)
+
+    text = " ".join(market.get(k) or "" for k in ("title", "subtitle", "yes_sub_title")).lower()
+    ticker_strike = TICKER_STRIKE.search(market.get("ticker") or "")
+
+    if not ticker_strike or ticker_strike.group(1) == "B":
+        bracket = RANGE_TEXT.search(text)
+        if bracket:
+            low, high = sorted((_number(bracket.group(1)), _number(bracket.group(2))))
+            return "between", low, high
+
+    above, below = ABOVE_TEXT.search(text), BELOW_TEXT.search(text)
+    if above or below:
+        # The ticker carries the exact threshold; titles may round it
+        strike = float(ticker_strike.group(2)) if ticker_strike and ticker_strike.group(1) == "T" \
+            else _first(above or below)
+        return ("greater", strike, math.inf) if above else ("less", -math.inf, strike)
+    return None
+
+
+def ladder_key(market: Dict) -> Tuple[str, str]:
+    """(underlying series, close time) shared by every rung of one ladder"""
+    series = market.get("series_ticker") or (market.get("event_ticker") or "").split("-")[0]
+    return LADDER_ROOTS.get(series, series), market.get("close_time") or ""
+
+
+def segmented_running_min(values: np.ndarray, runs: np.ndarray) -> np.ndarray:
+    """
+    Position of the running minimum of values, restarted at every run
+
+    Args:
+        values: Integer values in [0, NO_OFFER]
+        runs: Non-decreasing run id of each element
+
+    Returns:
+        For every element, the index of the smallest value seen so far in its run
+    """
+    n = len(values)
+    # Shifting each run below all earlier ones keeps one accumulate from
+    # carrying minimums across runs; the index rides in the low digits
+    codes = (values.astype(np.int64) - runs * (NO_OFFER + 1)) * n + np.arange(n)
+    return np.mod(np.minimum.accumulate(codes), n)
+
+
+class LadderArbitrageDetector:
+    """
+    Detect arbitrage between strike markets of one underlying and expiry
+    """
+
+    def __init__(self, volume_30d=0, quantity=10, min_net_profit=0.0,
+                 prefilter_margin_cents=3, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        """
+        Initialize detector
+
+        Args:
+            volume_30d: Your 30-day trading volume for fee calculation
+            quantity: Contracts bought on each leg
+            min_net_profit: Minimum net profit (dollars) for the pair
+            prefilter_margin_cents: How far (per pair) quoted prices may be from
+                                    an arb and still get an orderbook check
+                                    (None = fetch books for every rung)
+            max_in_flight: Max concurrent orderbook requests
+        """
+        self.fee_calc = FeeCalculator(volume_30d)
+        self.quantity = quantity
+        self.min_net_profit = min_net_profit
+        self.prefilter_margin_cents = prefilter_margin_cents
+        self.max_in_flight = max_in_flight
+        self.client = KalshiClient()
+
+    def build_ladders(self, markets) -> Dict[str, np.ndarray]:
+        """
+        Parse strike markets into flat ladder arrays
+
+        Args:
+            markets: Iterable of Kalshi market dicts
+
+        Returns:
+            Dict with markets (list), ladder (id per market), kind (0 greater,
+            1 less, 2 between), low, high, yes_ask and no_ask (cents, list quotes)
+        """
+        kinds = {"greater": 0, "less": 1, "between": 2}
+        ladder_ids: Dict[Tuple[str, str], int] = {}
+        rows, kept = [], []
+        for market in markets:
+            strike = parse_strike(market)
+            if strike is None:
+                continue
+            ladder = ladder_ids.setdefault(ladder_key(market), len(ladder_ids))
+            kind, low, high = strike
+            rows.append((ladder, kinds[kind], low, high,
+                         market.get("yes_ask") or 0, market.get("no_ask") or 0))
+            kept.append(market)
+
+        table = np.array(rows, dtype=float).reshape(-1, 6)
+        return {
+            "markets": kept,
+            "ladder": table[:, 0].astype(np.int64),
+            "kind": table[:, 1].astype(np.int64),
+            "low": table[:, 2],
+            "high": table[:, 3],
+            "yes_ask": table[:, 4].astype(np.int64),
+            "no_ask": table[:, 5].astype(np.int64),
+        }
+
+    def detect(self, ladders: Dict[str, np.ndarray], yes_cents: np.ndarray,
+               no_cents: np.ndarray, quantity: int) -> Dict[str, np.ndarray]:
+        """
+        Cheapest contained NO for every threshold, and the pair's profit
+
+        Upward thresholds and brackets are sorted by lower edge: everything
+        after an "above X" rung in its ladder lies inside it. Downward
+        thresholds are the mirror image (sorted by negated upper edge).
+        A reverse running minimum of no_ask then gives each threshold its
+        best hedge in one pass.
+
+        Args:
+            ladders: Arrays from build_ladders
+            yes_cents: YES ask per market in cents (0 or 100+ = no offer)
+            no_cents: NO ask per market in cents (0 or 100+ = no offer)
+            quantity: Contracts per leg
+
+        Returns:
+            Dict of arrays, one entry per threshold with a hedge: yes_leg,
+            no_leg (market indices), cost, fees, net_profit
+        """
+        kind, ladder = ladders["kind"], ladders["ladder"]
+        yes = np.where((yes_cents > 0) & (yes_cents < 100), yes_cents, NO_OFFER)
+        no = np.where((no_cents > 0) & (no_cents < 100), no_cents, NO_OFFER)
+
+        yes_legs, no_legs = [], []
+        for threshold_kind, edge in ((0, ladders["low"]), (1, -ladders["high"])):
+            idx = np.flatnonzero((kind == threshold_kind) | (kind == 2))
+            if not len(idx):
+                continue
+            is_threshold = kind[idx] == threshold_kind
+            # Ladder, then edge; on equal edges brackets sort first, so a bracket
+            # starting exactly at a strike is not counted as inside it
+            order = idx[np.lexsort((is_threshold, edge[idx], ladder[idx]))][::-1]
+
+            runs = np.concatenate(([0], np.cumsum(ladder[order][1:] != ladder[order][:-1])))
+            best = segmented_running_min(no[order], runs)
+            # Exclude the rung itself: take the minimum up to the previous position
+            has_prev = np.concatenate(([False], runs[1:] == runs[:-1]))
+            hedge = np.where(has_prev, np.roll(best, 1), -1)
+
+            at = np.flatnonzero((kind[order] == threshold_kind) & (hedge >= 0))
+            yes_legs.append(order[at])
+            no_legs.append(order[hedge[at]])
+
+        yes_leg = np.concatenate(yes_legs) if yes_legs else np.empty(0, dtype=np.int64)
+        no_leg = np.concatenate(no_legs) if no_legs else np.empty(0, dtype=np.int64)
+        priced = (yes[yes_leg] < NO_OFFER) & (no[no_leg] < NO_OFFER)
+        yes_leg, no_leg = yes_leg[priced], no_leg[priced]
+
+        cost = (yes[yes_leg] + no[no_leg]) / 100 * quantity
+        fees = self.fee_calc.fees(yes[yes_leg], quantity) + self.fee_calc.fees(no[no_leg], quantity)
+        # At least one leg pays $1 whatever the outcome
+        net = quantity * 1.00 - cost - fees
+        return {"yes_leg": yes_leg, "no_leg": no_leg, "cost": cost, "fees": fees, "net_profit": net}
+
+    def find_opportunities(self, markets=None, **filters) -> List[Dict]:
+        """
+        Scan strike ladders for monotonicity and bracket arbitrage
+
+        Args:
+            markets: Market dicts (e.g. a cached universe); fetched if None
+            **filters: Passed to iter_markets when fetching (e.g. series_ticker)
+
+        Returns:
+            list: Opportunities sorted by net profit
+        """
+        print(f"🔍 Scanning Kalshi strike ladders for monotonicity arbitrage...")
+        if markets is None:
+            markets = self.client.iter_markets(status="open", **filters)
+
+        ladders = self.build_ladders(markets)
+        n = len(ladders["markets"])
+        if not n:
+            print("❌ No strike markets found")
+            return []
+        print(f"📊 {n} strike markets in {len(np.unique(ladders['ladder']))} ladders")
+
+        # Stage 1: list quotes; only rungs of near-arb pairs need orderbooks
+        if self.prefilter_margin_cents is None:
+            legs = np.arange(n)
+        else:
+            quoted = self.detect(ladders, ladders["yes_ask"], ladders["no_ask"], 1)
+            near = quoted["net_profit"] >= -self.prefilter_margin_cents / 100
+            legs = np.unique(np.concatenate((quoted["yes_leg"][near], quoted["no_leg"][near])))
+            print(f"   Prefilter: {int(near.sum())} pairs within {self.prefilter_margin_cents}¢ "
+                  f"of an arb, {len(legs)} rungs need orderbooks")
+        if not len(legs):
+            return []
+
+        # Stage 2: best asks from the books of those rungs (others count as unoffered)
+        tickers = [ladders["markets"][i].get("ticker") for i in legs]
+        orderbooks = fetch_orderbooks(tickers, auth=self.client.auth, max_in_flight=self.max_in_flight)
+
+        yes_cents = np.zeros(n, dtype=np.int64)
+        no_cents = np.zeros(n, dtype=np.int64)
+        yes_size = np.zeros(n, dtype=np.int64)
+        no_size = np.zeros(n, dtype=np.int64)
+        for i, ticker in zip(legs, tickers):
+            book = OrderBook.from_json(orderbooks.get(ticker))
+            if book.best_yes_ask is not None:
+                yes_cents[i], yes_size[i] = book.best_yes_ask, book.size_at("yes", book.best_yes_ask)
+            if book.best_no_ask is not None:
+                no_cents[i], no_size[i] = book.best_no_ask, book.size_at("no", book.best_no_ask)
+
+        result = self.detect(ladders, yes_cents, no_cents, self.quantity)
+
+        opportunities = []
+        for k in np.flatnonzero(result["net_profit"] >= max(self.min_net_profit, 1e-9)):
+            i, j = result["yes_leg"][k], result["no_leg"][k]
+            yes_market, no_market = ladders["markets"][i], ladders["markets"][j]
+            opportunities.append({
+                'type': 'bracket' if ladders["kind"][j] == 2 else 'monotonicity',
+                'ladder': ladder_key(yes_market),
+                'yes_ticker': yes_market.get('ticker'),
+                'yes_title': yes_market.get('title', '')[:75],
+                'yes_price': yes_cents[i] / 100,
+                'no_ticker': no_market.get('ticker'),
+                'no_title': no_market.get('title', '')[:75],
+                'no_price': no_cents[j] / 100,
+                'quantity': self.quantity,
+                'total_cost': float(result['cost'][k]),
+                'total_fees': float(result['fees'][k]),
+                'net_profit': float(result['net_profit'][k]),
+                'fillable': int(min(yes_size[i], no_size[j])),
+            })
+
+        opportunities.sort(key=lambda x: x['net_profit'], reverse=True)
+        return opportunities
+
+    def print_opportunities(self, opportunities):
+        """Print opportunities in a nice format"""
+        if not opportunities:
+            print("\n❌ No ladder arbitrage found")
+            return
+
+        print(f"\n{'='*80}")
+        print(f"✨ LADDER ARBITRAGE: Found {len(opportunities)}!")
+        print(f"{'='*80}\n")
+
+        for i, opp in enumerate(opportunities, 1):
+            series, close_time = opp['ladder']
+            print(f"[{i}] {'='*76}")
+            print(f"Ladder: {series} closing {close_time} ({opp['type']})")
+            print(f"  Buy YES {opp['yes_ticker']} @ ${opp['yes_price']:.2f}  {opp['yes_title']}")
+            print(f"  Buy NO  {opp['no_ticker']} @ ${opp['no_price']:.2f}  {opp['no_title']}")
+            print(f"\nProfit Analysis ({opp['quantity']} contracts per leg):")
+            print(f"  Total Cost: ${opp['total_cost']:.2f}")
+            print(f"  Minimum Payout: ${opp['quantity']:.2f}")
+            print(f"  Fees: ${opp['total_fees']:.2f}")
+            print(f"  Net Profit: ${opp['net_profit']:.2f}")
+            print(f"  Fillable at best asks: {opp['fillable']} contracts")
+            print(f"{'='*76}\n")
+
+
+if __name__ == "__main__":
+    detector = LadderArbitrageDetector(volume_30d=0)
+
+    start = time.time()
+    opportunities = detector.find_opportunities()
+    detector.print_opportunities(opportunities)
+    print(f"⏱️  Scan took {time.time() - start:.1f}s")
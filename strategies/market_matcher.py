@@ -3,29 +3,250 @@ Market Matcher
 
 Matches equivalent markets across Kalshi and Polymarket platforms.
 Uses fuzzy text matching and manual overrides.
+
+Batch matching blocks candidates through a keyword inverted index over the
+Polymarket side, so each Kalshi market is only scored against markets that
+share its rare keywords (or expire the same day) instead of the whole universe.
+
+Each market is reduced once to a MarketRecord (normalized text, interned
+keyword set, expiry epoch, numeric entities); scoring works on records only,
+so the hot loop does no text normalization or date parsing per pair.
+
+For large scans, score_matrix() replaces per-pair fuzz.ratio with TF-IDF
+character n-gram cosine similarity computed as one sparse matrix product,
+keeping only the top-k Polymarket candidates per Kalshi market.
 """
+import hashlib
 import json
+import math
 import os
-from typing import Dict, List, Optional, Tuple
+import sys
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+import numpy as np
 from fuzzywuzzy import fuzz
-from datetime import datetime, timedelta
+from datetime import datetime
+
+# Score weights (see _calculate_match_score)
+TEXT_WEIGHT = 0.5
+KEYWORD_WEIGHT = 0.35
+TIME_WEIGHT = 0.15
+
+DAY_SECONDS = 86400
+
+STOP_WORDS = frozenset({"will", "the", "a", "an", "in", "on", "at", "to", "by", "for"})
+
+
+def _parse_time(value: str) -> Optional[float]:
+    """Parse an ISO timestamp to epoch seconds (None if missing or invalid)."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (ValueError, TypeError):
+        return None
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for matching."""
+    return text.lower().strip().replace("?", "").replace("!", "")
+
+
+class MarketRecord:
+    """Matching view of one market, computed once per scan."""
+    
+    __slots__ = ("market", "key", "text", "keywords", "expiry", "closed", "digest")
+    
+    def __init__(self, market: Dict, key: str, text: str, time_value: str):
+        """
+        Preprocess a market for scoring.
+        
+        Args:
+            market: Source market dict (kept for results)
+            key: Kalshi ticker or Polymarket condition_id
+            text: Kalshi title or Polymarket question
+            time_value: Kalshi close_time or Polymarket end_date (ISO)
+        """
+        self.market = market
+        self.key = key
+        self.text = normalize_text(text or "")
+        self.keywords = frozenset(sys.intern(w) for w in self.text.split()
+                                  if w not in STOP_WORDS and len(w) > 2)
+        self.expiry = _parse_time(time_value)
+        self.closed = bool(market.get("closed", False))
+        # Everything the score depends on, for the persistent match store
+        self.digest = hashlib.blake2b(f"{self.text}|{self.expiry}".encode(), digest_size=8).hexdigest()
+    
+    @classmethod
+    def from_kalshi(cls, market: Dict) -> "MarketRecord":
+        return cls(market, market.get("ticker", ""), market.get("title", ""), market.get("close_time", ""))
+    
+    @classmethod
+    def from_polymarket(cls, market: Dict) -> "MarketRecord":
+        return cls(market, market.get("condition_id", ""), market.get("question", ""), market.get("end_date", ""))
+
+
+def condition_index(polymarket_markets: List[Dict]) -> Dict[str, Dict]:
+    """condition_id -> market (first listing wins, as in a linear scan)."""
+    by_condition = {}
+    for pm_market in polymarket_markets:
+        by_condition.setdefault(pm_market.get("condition_id"), pm_market)
+    return by_condition
+
+
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Keyword set Jaccard similarity (0.0 if either side is empty)."""
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+def _time_proximity_array(k_expiry: np.ndarray, p_expiry: np.ndarray) -> np.ndarray:
+    """Vectorized _time_proximity over expiry arrays (NaN = missing)."""
+    time_diff = np.abs(k_expiry - p_expiry)
+    scores = np.select(
+        [time_diff < 86400, time_diff < 604800, time_diff < 2592000],
+        [1.0, 0.7, 0.3],
+        default=0.0
+    )
+    return np.where(np.isnan(time_diff), 0.5, scores)
+
+
+def _time_proximity(k_expiry: Optional[float], p_expiry: Optional[float]) -> float:
+    """
+    Time proximity score from expiry epochs.
+    
+    Markets with similar expiration times are more likely to be matches.
+    """
+    if k_expiry is None or p_expiry is None:
+        return 0.5  # neutral if time missing
+    
+    time_diff = abs(k_expiry - p_expiry)
+    
+    # Within 1 day = 1.0, 1 week = 0.7, 30 days = 0.3, later = 0.0
+    if time_diff < 86400:  # 1 day
+        return 1.0
+    elif time_diff < 604800:  # 1 week
+        return 0.7
+    elif time_diff < 2592000:  # 30 days
+        return 0.3
+    return 0.0
+
+
+class MarketIndex:
+    """
+    Keyword inverted index over Polymarket markets, built once per scan.
+    
+    Postings hold positions into the original market list, so candidates
+    come back in list order and ties resolve the same way as a full scan.
+    """
+    
+    def __init__(self, records: List[MarketRecord], common_ratio: float = 0.01,
+                 min_common_df: int = 50):
+        """
+        Index market records by keyword and expiry day.
+        
+        Args:
+            records: Polymarket records (positions are indexes into this list)
+            common_ratio: Keywords in more than this share of markets are "common"
+            min_common_df: ...but never below this many markets
+        """
+        self.records = records
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.by_day: Dict[int, List[int]] = defaultdict(list)
+        
+        for i, record in enumerate(records):
+            if record.closed:
+                continue  # never a candidate
+            for token in record.keywords:
+                self.postings[token].append(i)
+            if record.expiry is not None:
+                self.by_day[int(record.expiry // DAY_SECONDS)].append(i)
+        
+        self.markets = [record.market for record in records]
+        self.by_condition = condition_index(self.markets)
+        self.common_df = max(min_common_df, int(common_ratio * len(records)))
+    
+    def doc_freq(self, token: str) -> int:
+        """Number of markets containing a keyword."""
+        postings = self.postings.get(token)
+        return len(postings) if postings else 0
+    
+    def candidates(self, keywords: FrozenSet[str], min_jaccard: float,
+                   expiry: Optional[float] = None) -> List[int]:
+        """
+        Positions of markets worth scoring against a Kalshi market.
+        
+        A market whose keyword Jaccard reaches min_jaccard shares at least
+        ceil(min_jaccard * len(keywords)) keywords, so it must contain one
+        of the rarest len(keywords) - that + 1 keywords (prefix filtering).
+        Only postings of rare keywords in that prefix are read; common ones
+        (month names, round numbers) would pull in a fixed share of the
+        universe. Markets in the +/-1 day expiry window are always added,
+        so a pair sharing only common keywords is still found when the
+        dates line up. Survivors are checked for the Jaccard bound.
+        
+        Args:
+            keywords: Kalshi market keyword set
+            min_jaccard: Keyword Jaccard a pair needs to clear the threshold
+            expiry: Kalshi expiry (epoch seconds)
+            
+        Returns:
+            Sorted market positions
+        """
+        found = set()
+        
+        if keywords:
+            min_shared = max(1, math.ceil(min_jaccard * len(keywords) - 1e-9))
+            rare_first = sorted(keywords, key=lambda t: (self.doc_freq(t), t))
+            for token in rare_first[:len(keywords) - min_shared + 1]:
+                if self.doc_freq(token) > self.common_df:
+                    break
+                found.update(self.postings.get(token, ()))
+        
+        if expiry is not None:
+            day = int(expiry // DAY_SECONDS)
+            for d in (day - 1, day, day + 1):
+                found.update(self.by_day.get(d, ()))
+        
+        if min_jaccard > 0:
+            found = [i for i in found
+                     if _jaccard(keywords, self.records[i].keywords) >= min_jaccard - 1e-9]
+        
+        return sorted(found)
 
 
 class MarketMatcher:
     """Match markets across Kalshi and Polymarket."""
     
-    def __init__(self, override_file: str = "config/market_matches.json"):
+    def __init__(self, override_file: str = "config/market_matches.json", match_store=None,
+                 top_k: int = 5):
         """
         Initialize market matcher.
         
         Args:
             override_file: Path to manual market pair overrides
+            match_store: Optional db.match_store.MatchStore; pair scores found
+                         there (same text hash) are reused instead of rescored
+            top_k: Cosine candidates per Kalshi market that matrix mode
+                   reranks with the full weighting
         """
         self.override_file = override_file
+        self.top_k = top_k
+        self._override_mtime = None
         self.manual_matches = self._load_manual_matches()
+        self.match_store = match_store
+    
+    def _override_file_mtime(self) -> Optional[float]:
+        try:
+            return os.path.getmtime(self.override_file)
+        except OSError:
+            return None
     
     def _load_manual_matches(self) -> Dict:
         """Load manual market pair overrides from JSON file."""
+        self._override_mtime = self._override_file_mtime()
         if os.path.exists(self.override_file):
             try:
                 with open(self.override_file, 'r') as f:
@@ -35,94 +256,199 @@ class MarketMatcher:
         
         return {}
     
+    def refresh_manual_matches(self) -> bool:
+        """
+        Reload manual overrides if the override file changed (mtime) since last load.
+        
+        Returns:
+            True if overrides were reloaded
+        """
+        if self._override_file_mtime() == self._override_mtime:
+            return False
+        
+        self.manual_matches = self._load_manual_matches()
+        print(f"🔄 Reloaded {len(self.manual_matches)} manual market matches from {self.override_file}")
+        return True
+    
     def _normalize_text(self, text: str) -> str:
         """Normalize text for matching."""
-        return text.lower().strip().replace("?", "").replace("!", "")
+        return normalize_text(text)
     
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract important keywords from market text."""
-        # Remove common words
-        stop_words = {"will", "the", "a", "an", "in", "on", "at", "to", "by", "for"}
-        
-        words = self._normalize_text(text).split()
-        keywords = [w for w in words if w not in stop_words and len(w) > 2]
-        
-        return keywords
+        words = normalize_text(text).split()
+        return [w for w in words if w not in STOP_WORDS and len(w) > 2]
     
-    def _calculate_match_score(self, kalshi_market: Dict, poly_market: Dict) -> float:
+    def _score_records(self, k_record: MarketRecord, p_record: MarketRecord) -> float:
         """
-        Calculate match confidence score (0.0 to 1.0).
+        Calculate match confidence score (0.0 to 1.0) from preprocessed records.
         
         Args:
-            kalshi_market: Kalshi market dict
-            poly_market: Polymarket market dict
+            k_record: Kalshi market record
+            p_record: Polymarket market record
             
         Returns:
             Confidence score (0.0 to 1.0)
         """
-        k_title = kalshi_market.get("title", "")
-        p_question = poly_market.get("question", "")
-        
         # Overall text similarity
-        overall_score = fuzz.ratio(
-            self._normalize_text(k_title),
-            self._normalize_text(p_question)
-        ) / 100.0
+        overall_score = fuzz.ratio(k_record.text, p_record.text) / 100.0
         
         # Keyword overlap
-        k_keywords = set(self._extract_keywords(k_title))
-        p_keywords = set(self._extract_keywords(p_question))
-        
-        if k_keywords and p_keywords:
-            keyword_overlap = len(k_keywords & p_keywords) / len(k_keywords | p_keywords)
-        else:
-            keyword_overlap = 0.0
+        keyword_overlap = _jaccard(k_record.keywords, p_record.keywords)
         
         # Time proximity (closer expiration = higher confidence match)
-        time_score = self._calculate_time_proximity(kalshi_market, poly_market)
+        time_score = _time_proximity(k_record.expiry, p_record.expiry)
         
         # Weighted average
         final_score = (
-            overall_score * 0.5 +
-            keyword_overlap * 0.35 +
-            time_score * 0.15
+            overall_score * TEXT_WEIGHT +
+            keyword_overlap * KEYWORD_WEIGHT +
+            time_score * TIME_WEIGHT
         )
         
         return min(1.0, final_score)
     
+    def _cached_score(self, k_record: MarketRecord, p_record: MarketRecord,
+                      min_confidence: float) -> float:
+        """Pair score from the match store, scoring and recording it on a miss."""
+        store = self.match_store
+        if store is None:
+            return self._score_records(k_record, p_record)
+        
+        text_hash = k_record.digest + p_record.digest
+        score = store.get(k_record.key, p_record.key, text_hash)
+        if score is None:
+            score = self._score_records(k_record, p_record)
+            store.put(k_record.key, p_record.key, text_hash, score, score >= min_confidence,
+                      k_record.expiry, p_record.expiry)
+        return score
+    
+    def _calculate_match_score(self, kalshi_market: Dict, poly_market: Dict) -> float:
+        """
+        Calculate match confidence score (0.0 to 1.0) for raw market dicts.
+        
+        Args:
+            kalshi_market: Kalshi market dict
+            poly_market: Polymarket market dict
+            
+        Returns:
+            Confidence score (0.0 to 1.0)
+        """
+        return self._score_records(MarketRecord.from_kalshi(kalshi_market),
+                                   MarketRecord.from_polymarket(poly_market))
+    
     def _calculate_time_proximity(self, kalshi_market: Dict, poly_market: Dict) -> float:
+        """Calculate time proximity score for raw market dicts."""
+        return _time_proximity(_parse_time(kalshi_market.get("close_time", "")),
+                               _parse_time(poly_market.get("end_date", "")))
+    
+    def build_index(self, polymarket_markets: List[Dict]) -> MarketIndex:
         """
-        Calculate time proximity score.
+        Preprocess Polymarket markets and build the keyword inverted index.
         
-        Markets with similar expiration times are more likely to be matches.
+        Args:
+            polymarket_markets: List of Polymarket markets
+            
+        Returns:
+            MarketIndex to pass to find_match
         """
-        try:
-            k_close = kalshi_market.get("close_time", "")
-            p_close = poly_market.get("end_date", "")
+        return MarketIndex([MarketRecord.from_polymarket(m) for m in polymarket_markets])
+    
+    def score_matrix(self, kalshi_markets: List[Dict], polymarket_markets: List[Dict],
+                     top_k: int = 5, chunk_size: int = 1024) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score all Kalshi x Polymarket pairs with TF-IDF character n-grams.
+        
+        Both universes are vectorized with one shared vocabulary, text
+        similarity is the cosine from a sparse matrix product (row chunks
+        of chunk_size bound memory), and the top_k Polymarket markets per
+        Kalshi market are kept. The usual weighting then runs on the
+        top-k only, with cosine similarity in place of fuzz.ratio:
+        TEXT_WEIGHT * cosine + KEYWORD_WEIGHT * keyword Jaccard + TIME_WEIGHT * time proximity.
+        
+        Args:
+            kalshi_markets: List of Kalshi markets
+            polymarket_markets: List of Polymarket markets
+            top_k: Candidates kept per Kalshi market
+            chunk_size: Kalshi rows per sparse product
             
-            if not k_close or not p_close:
-                return 0.5  # neutral if time missing
+        Returns:
+            (indices, scores): int32 and float32 arrays of shape
+            (len(kalshi_markets), top_k), best first. indices are positions in
+            polymarket_markets; -1 (score 0.0) pads rows with fewer open markets.
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
+        n, m = len(kalshi_markets), len(polymarket_markets)
+        indices = np.full((n, top_k), -1, dtype=np.int32)
+        scores = np.zeros((n, top_k), dtype=np.float32)
+        if not n or not m:
+            return indices, scores
+        
+        k_records = [MarketRecord.from_kalshi(mk) for mk in kalshi_markets]
+        p_records = [MarketRecord.from_polymarket(mk) for mk in polymarket_markets]
+        
+        vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(3, 4),
+                                     sublinear_tf=True, dtype=np.float32)
+        vectorizer.fit([r.text for r in k_records] + [r.text for r in p_records])
+        k_vectors = vectorizer.transform([r.text for r in k_records])
+        p_vectors_t = vectorizer.transform([r.text for r in p_records]).T.tocsr()
+        
+        closed = np.array([r.closed for r in p_records])
+        k_expiry = np.array([np.nan if r.expiry is None else r.expiry for r in k_records])
+        p_expiry = np.array([np.nan if r.expiry is None else r.expiry for r in p_records])
+        
+        width = min(top_k, int((~closed).sum()))
+        if width == 0:
+            return indices, scores
+        
+        for start in range(0, n, chunk_size):
+            stop = min(start + chunk_size, n)
+            similarity = (k_vectors[start:stop] @ p_vectors_t).toarray()
+            similarity[:, closed] = -1.0
             
-            k_time = datetime.fromisoformat(k_close.replace('Z', '+00:00'))
-            p_time = datetime.fromisoformat(p_close.replace('Z', '+00:00'))
+            # Top-k by text similarity (unordered), then the full weighting on those only
+            top = np.argpartition(-similarity, width - 1, axis=1)[:, :width]
+            cosine = np.take_along_axis(similarity, top, axis=1)
             
-            time_diff = abs((k_time - p_time).total_seconds())
+            rows = np.arange(start, stop)
+            keyword = np.array([
+                [_jaccard(k_records[i].keywords, p_records[j].keywords) for j in row]
+                for i, row in zip(rows, top)
+            ], dtype=np.float64).reshape(top.shape)
+            time_score = _time_proximity_array(k_expiry[rows][:, None], p_expiry[top])
             
-            # Within 1 day = 1.0, 1 week = 0.5, 1 month+ = 0.0
-            if time_diff < 86400:  # 1 day
-                return 1.0
-            elif time_diff < 604800:  # 1 week
-                return 0.7
-            elif time_diff < 2592000:  # 30 days
-                return 0.3
-            else:
-                return 0.0
+            final = np.minimum(1.0, cosine * TEXT_WEIGHT + keyword * KEYWORD_WEIGHT + time_score * TIME_WEIGHT)
+            order = np.argsort(-final, axis=1, kind="stable")
+            indices[start:stop, :width] = np.take_along_axis(top, order, axis=1)
+            scores[start:stop, :width] = np.take_along_axis(final, order, axis=1)
         
-        except Exception:
-            return 0.5
+        return indices, scores
+    
+    def _min_keyword_jaccard(self, min_confidence: float) -> float:
+        """
+        Keyword Jaccard a pair needs to reach min_confidence.
+        
+        Even with perfect text and time scores the keyword term has to make
+        up the rest: (min_confidence - TEXT_WEIGHT - TIME_WEIGHT) / KEYWORD_WEIGHT.
+        """
+        return (min_confidence - TEXT_WEIGHT - TIME_WEIGHT) / KEYWORD_WEIGHT
+    
+    def _manual_match(self, kalshi_market: Dict,
+                      by_condition: Dict[str, Dict]) -> Optional[Tuple[Dict, float]]:
+        """Manual override pair for a Kalshi market, if configured and listed."""
+        condition_id = self.manual_matches.get(kalshi_market.get("ticker", ""))
+        if condition_id is None:
+            return None
+        
+        pm_market = by_condition.get(condition_id)
+        if pm_market is None:
+            return None
+        return (pm_market, 1.0)  # Manual override = 100% confidence
     
     def find_match(self, kalshi_market: Dict, polymarket_markets: List[Dict],
-                   min_confidence: float = 0.75) -> Optional[Tuple[Dict, float]]:
+                   min_confidence: float = 0.75,
+                   index: Optional[MarketIndex] = None) -> Optional[Tuple[Dict, float]]:
         """
         Find matching Polymarket market for a Kalshi market.
         
@@ -130,33 +456,56 @@ class MarketMatcher:
             kalshi_market: Kalshi market dictionary
             polymarket_markets: List of Polymarket markets
             min_confidence: Minimum confidence threshold (0.0 to 1.0)
+            index: Prebuilt MarketIndex over polymarket_markets; when given,
+                   only candidates sharing rare keywords (or expiring within
+                   a day) are scored
             
         Returns:
             Tuple of (matched_market, confidence_score) or None
         """
         # Check manual overrides first
-        k_ticker = kalshi_market.get("ticker", "")
-        if k_ticker in self.manual_matches:
-            condition_id = self.manual_matches[k_ticker]
-            
-            for pm_market in polymarket_markets:
-                if pm_market.get("condition_id") == condition_id:
-                    return (pm_market, 1.0)  # Manual override = 100% confidence
+        if index is None:
+            self.refresh_manual_matches()
+            if kalshi_market.get("ticker", "") in self.manual_matches:
+                override = self._manual_match(kalshi_market, condition_index(polymarket_markets))
+                if override:
+                    return override
+        else:
+            override = self._manual_match(kalshi_market, index.by_condition)
+            if override:
+                return override
+        
+        return self._best_scored_match(kalshi_market, polymarket_markets, min_confidence, index)
+    
+    def _best_scored_match(self, kalshi_market: Dict, polymarket_markets: List[Dict],
+                           min_confidence: float,
+                           index: Optional[MarketIndex]) -> Optional[Tuple[Dict, float]]:
+        """Highest-scoring Polymarket market above min_confidence (no overrides)."""
+        k_record = MarketRecord.from_kalshi(kalshi_market)
+        if index is not None:
+            positions = index.candidates(
+                k_record.keywords,
+                self._min_keyword_jaccard(min_confidence),
+                k_record.expiry
+            )
+            candidates = [index.records[i] for i in positions]
+        else:
+            candidates = [MarketRecord.from_polymarket(m) for m in polymarket_markets]
         
         # Find best match
         best_match = None
         best_score = 0.0
         
-        for pm_market in polymarket_markets:
+        for p_record in candidates:
             # Skip closed markets
-            if pm_market.get("closed", False):
+            if p_record.closed:
                 continue
             
-            score = self._calculate_match_score(kalshi_market, pm_market)
+            score = self._cached_score(k_record, p_record, min_confidence)
             
             if score > best_score:
                 best_score = score
-                best_match = pm_market
+                best_match = p_record.market
         
         # Return match if above threshold
         if best_score >= min_confidence:
@@ -165,7 +514,7 @@ class MarketMatcher:
         return None
     
     def batch_match(self, kalshi_markets: List[Dict], polymarket_markets: List[Dict],
-                    min_confidence: float = 0.75) -> List[Dict]:
+                    min_confidence: float = 0.75, method: str = "fuzzy") -> List[Dict]:
         """
         Batch match multiple Kalshi markets to Polymarket.
         
@@ -173,15 +522,42 @@ class MarketMatcher:
             kalshi_markets: List of Kalshi markets
             polymarket_markets: List of Polymarket markets
             min_confidence: Minimum confidence threshold
+            method: "fuzzy" (indexed fuzz.ratio scoring) or "matrix"
+                    (TF-IDF score_matrix, faster on large universes)
             
         Returns:
             List of matched pairs with metadata
         """
         matches = []
+        self.refresh_manual_matches()
         
-        for k_market in kalshi_markets:
-            result = self.find_match(k_market, polymarket_markets, min_confidence)
-            
+        # Manual overrides are a join on condition_id; only the rest get scored
+        by_condition = condition_index(polymarket_markets)
+        results = {}
+        unmatched = []
+        for i, k_market in enumerate(kalshi_markets):
+            override = self._manual_match(k_market, by_condition)
+            if override:
+                results[i] = override
+            else:
+                unmatched.append(i)
+        
+        if method == "matrix":
+            # Rows come back ordered by the weighted score, so column 0 is the
+            # best of the top_k cosine candidates
+            best_idx, best_scores = self.score_matrix([kalshi_markets[i] for i in unmatched],
+                                                      polymarket_markets, top_k=self.top_k)
+            for i, j, score in zip(unmatched, best_idx[:, 0], best_scores[:, 0]):
+                if j >= 0 and score >= min_confidence:
+                    results[i] = (polymarket_markets[j], float(score))
+        else:
+            index = self.build_index(polymarket_markets)
+            for i in unmatched:
+                results[i] = self._best_scored_match(kalshi_markets[i], polymarket_markets,
+                                                     min_confidence, index)
+        
+        for i, k_market in enumerate(kalshi_markets):
+            result = results.get(i)
             if result:
                 pm_market, confidence = result
                 
@@ -195,4 +571,7 @@ class MarketMatcher:
                     "polymarket_market": pm_market
                 })
         
+        if self.match_store is not None:
+            self.match_store.flush()
+        
         return matches
@@ -7,17 +7,17 @@ Based on vladmeer/kalshi-arbitrage-bot strategy
 
 import os
 import time
-import requests
-import base64
 from datetime import datetime, timedelta
+import numpy as np
 from dotenv import load_dotenv
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
 
 # Import our fee calculator
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.fee_calculator import FeeCalculator
+from core.kalshi_client import KalshiClient
+from core.orderbook import OrderBook
+from core.async_kalshi_client import fetch_orderbooks, DEFAULT_MAX_IN_FLIGHT
 
 load_dotenv()
 
@@ -28,93 +28,84 @@ class ProbabilityArbitrageDetector:
     
     Strategy: When YES + NO prices != 100%, you can buy/sell both sides
     and lock in guaranteed profit regardless of outcome.
+    
+    Two stages: the yes_ask/no_ask quotes already in the /markets payload
+    are checked for every market at once, and orderbooks are only fetched
+    to confirm markets that come within prefilter_margin_cents of an arb.
     """
     
-    def __init__(self, min_deviation_pct=1.0, volume_30d=0):
+    def __init__(self, min_deviation_pct=1.0, volume_30d=0, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 prefilter_margin_cents=2):
         """
         Initialize detector
         
         Args:
             min_deviation_pct: Minimum price deviation to consider (default 1%)
             volume_30d: Your 30-day trading volume for fee calculation
+            max_in_flight: Max concurrent orderbook requests during a sweep
+            prefilter_margin_cents: How far (per contract) the list quotes may be
+                                    from an arb and still get an orderbook check
+                                    (None = fetch every candidate's orderbook)
         """
         self.min_deviation = min_deviation_pct / 100  # Convert to decimal
         self.fee_calc = FeeCalculator(volume_30d)
+        self.max_in_flight = max_in_flight
+        self.prefilter_margin_cents = prefilter_margin_cents
         
         # Kalshi API setup
-        self.base = "https://api.elections.kalshi.com/trade-api/v2"
-        self.key = os.getenv("KALSHI_KEY_ID")
-        
-        try:
-            with open("/Users/rod/Antigravity/kalshi_bot/kalshi.key", "rb") as f:
-                self.pk = serialization.load_pem_private_key(f.read(), password=None)
-        except:
-            self.pk = None
+        self.client = KalshiClient()
     
-    def sign(self, method, path, ts):
-        """Sign API request"""
-        if not self.pk:
-            return "NONE"
-        msg = f"{ts}{method}{path}"
-        sig = self.pk.sign(
-            msg.encode(),
-            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
-            hashes.SHA256()
-        )
-        return base64.b64encode(sig).decode()
-    
-    def get_all_markets(self, limit=200, status="open"):
-        """Fetch all open markets from Kalshi"""
-        ts = str(int(time.time() * 1000))
-        path = f"/trade-api/v2/markets?limit={limit}&status={status}"
-        headers = {
-            "KALSHI-ACCESS-KEY": self.key,
-            "KALSHI-ACCESS-SIGNATURE": self.sign("GET", path, ts),
-            "KALSHI-ACCESS-TIMESTAMP": ts
-        }
-        
-        try:
-            r = requests.get(f"{self.base}/markets?limit={limit}&status={status}", headers=headers, timeout=10)
-            if r.status_code == 200:
-                return r.json().get("markets", [])
-        except Exception as e:
-            print(f"Error fetching markets: {e}")
-        
-        return []
+    def get_all_markets(self, status="open", **filters):
+        """Stream all open markets from Kalshi (follows the pagination cursor)"""
+        return self.client.iter_markets(status=status, **filters)
     
     def get_orderbook(self, ticker):
         """Get orderbook for a specific market"""
-        ts = str(int(time.time() * 1000))
-        path = f"/trade-api/v2/markets/{ticker}/orderbook"
-        headers = {
-            "KALSHI-ACCESS-KEY": self.key,
-            "KALSHI-ACCESS-SIGNATURE": self.sign("GET", path, ts),
-            "KALSHI-ACCESS-TIMESTAMP": ts
-        }
-        
-        try:
-            r = requests.get(f"{self.base}/markets/{ticker}/orderbook", headers=headers, timeout=8)
-            if r.status_code == 200:
-                return r.json().get("orderbook", {})
-        except:
-            pass
-        
-        return None
+        return self.client.get_orderbook(ticker)
+    
+    def get_orderbooks(self, tickers):
+        """Get orderbooks for many markets concurrently (ticker -> orderbook)"""
+        return fetch_orderbooks(tickers, auth=self.client.auth, max_in_flight=self.max_in_flight)
     
     def get_best_prices(self, orderbook):
         """Extract best YES and NO prices from orderbook"""
-        yes_asks = orderbook.get("yes", [])
-        no_asks = orderbook.get("no", [])
+        book = orderbook if isinstance(orderbook, OrderBook) else OrderBook.from_json(orderbook)
         
-        if not yes_asks or not no_asks:
+        if book.best_yes_ask is None or book.best_no_ask is None:
             return None, None
         
         # Best ask = lowest price someone is willing to sell at
-        yes_price = min([ask[0] for ask in yes_asks]) / 100  # Convert cents to dollars
-        no_price = min([ask[0] for ask in no_asks]) / 100
+        yes_price = book.best_yes_ask / 100  # Convert cents to dollars
+        no_price = book.best_no_ask / 100
         
         return yes_price, no_price
     
+    def prefilter(self, candidates, quantity=100):
+        """
+        Stage 1: keep markets whose /markets quotes are at or near an arb
+        
+        Args:
+            candidates: List of (market, days_left) from the volume/expiry filters
+            quantity: Lot size used for the fee check
+        
+        Returns:
+            list: Candidates worth an orderbook request
+        """
+        if self.prefilter_margin_cents is None or not candidates:
+            return candidates
+        
+        yes_ask = np.array([m.get("yes_ask") or 0 for m, _ in candidates])
+        no_ask = np.array([m.get("no_ask") or 0 for m, _ in candidates])
+        margin = self.prefilter_margin_cents / 100
+        
+        # Both sides must be quoted to be buyable (Kalshi reports 0/100 for no offers)
+        quoted = (yes_ask > 0) & (yes_ask < 100) & (no_ask > 0) & (no_ask < 100)
+        deviation = np.abs((yes_ask + no_ask) / 100 - 1.0)
+        bulk = self.fee_calc.calculate_arbitrage_profits(yes_ask, no_ask, quantity)
+        near = (deviation >= self.min_deviation - margin) & (bulk['net_profit'] / quantity >= -margin)
+        
+        return [candidates[i] for i in np.flatnonzero(quoted & near)]
+    
     def calculate_days_to_expiration(self, close_time_str):
         """Calculate days until market expiration"""
         try:
@@ -137,16 +128,22 @@ class ProbabilityArbitrageDetector:
             list: Sorted opportunities by profit per day
         """
         print(f"🔍 Scanning Kalshi markets for probability arbitrage...")
-        markets = self.get_all_markets(limit=200)
         
-        if not markets:
-            print("❌ No markets found")
-            return []
+        # Close-time window is applied server-side; volume is filtered as pages stream in
+        now = time.time()
+        markets = self.get_all_markets(
+            min_close_ts=now,
+            max_close_ts=now + max_days_to_expiration * 86400
+        )
         
-        print(f"📊 Checking {len(markets)} markets...")
         opportunities = []
         
+        # Filter on list fields first so only candidates cost an orderbook request
+        candidates = []
+        checked = 0
         for market in markets:
+            checked += 1
+            
             # Filter by volume
             if market.get("volume", 0) < min_volume:
                 continue
@@ -156,46 +153,65 @@ class ProbabilityArbitrageDetector:
             if days_left <= 0 or days_left > max_days_to_expiration:
                 continue
             
-            # Get orderbook
-            ticker = market.get("ticker")
-            orderbook = self.get_orderbook(ticker)
-            
+            candidates.append((market, days_left))
+        
+        if not checked:
+            print("❌ No markets found")
+            return []
+        
+        print(f"📊 Checked {checked} markets, {len(candidates)} pass volume/expiry filters...")
+        
+        # Stage 1: quotes from the list payload, no requests
+        passed = len(candidates)
+        candidates = self.prefilter(candidates)
+        if self.prefilter_margin_cents is not None:
+            print(f"   Prefilter: {len(candidates)} of {passed} within "
+                  f"{self.prefilter_margin_cents}¢ of an arb need an orderbook")
+        
+        # Stage 2: confirm against orderbooks, fetched concurrently
+        orderbooks = self.get_orderbooks([m.get("ticker") for m, _ in candidates])
+        
+        # Best asks (cents) for every candidate with a two-sided book
+        priced = []
+        for market, days_left in candidates:
+            orderbook = orderbooks.get(market.get("ticker"))
             if not orderbook:
                 continue
-            
-            # Get best prices
-            yes_price, no_price = self.get_best_prices(orderbook)
-            
-            if yes_price is None or no_price is None:
+            book = OrderBook.from_json(orderbook)
+            if book.best_yes_ask is None or book.best_no_ask is None:
                 continue
+            priced.append((market, days_left, book.best_yes_ask, book.best_no_ask))
+        
+        if not priced:
+            return []
+        
+        # Deviation and fees for every market in one pass (fee table lookup)
+        quantity = 100  # Standard lot size
+        yes_cents = np.array([p[2] for p in priced])
+        no_cents = np.array([p[3] for p in priced])
+        deviation = np.abs((yes_cents + no_cents) / 100 - 1.0)
+        bulk = self.fee_calc.calculate_arbitrage_profits(yes_cents, no_cents, quantity)
+        survivors = np.flatnonzero((deviation >= self.min_deviation) & bulk['is_profitable'])
+        
+        for i in survivors:
+            market, days_left, yes_ask, no_ask = priced[i]
+            yes_price, no_price = yes_ask / 100, no_ask / 100
+            arb_result = self.fee_calc.calculate_arbitrage_profit(yes_price, no_price, quantity)
             
-            # Check for arbitrage
-            total_prob = yes_price + no_price
-            deviation = abs(total_prob - 1.0)
-            
-            if deviation >= self.min_deviation:
-                # Calculate profit potential
-                quantity = 100  # Standard lot size
-                arb_result = self.fee_calc.calculate_arbitrage_profit(yes_price, no_price, quantity)
-                
-                if arb_result['is_profitable']:
-                    opportunities.append({
-                        'market': market,
-                        'ticker': ticker,
-                        'title': market.get('title', '')[:75],
-                        'yes_price': yes_price,
-                        'no_price': no_price,
-                        'total_probability': total_prob,
-                        'deviation_pct': deviation * 100,
-                        'days_to_expiration': days_left,
-                        'volume': market.get('volume', 0),
-                        'close_time': market.get('close_time'),
-                        'arb_result': arb_result,
-                        'profit_per_day': arb_result['net_profit'] / days_left if days_left > 0 else 0
-                    })
-                    
-                    # Rate limit
-                    time.sleep(0.2)
+            opportunities.append({
+                'market': market,
+                'ticker': market.get("ticker"),
+                'title': market.get('title', '')[:75],
+                'yes_price': yes_price,
+                'no_price': no_price,
+                'total_probability': yes_price + no_price,
+                'deviation_pct': deviation[i] * 100,
+                'days_to_expiration': days_left,
+                'volume': market.get('volume', 0),
+                'close_time': market.get('close_time'),
+                'arb_result': arb_result,
+                'profit_per_day': arb_result['net_profit'] / days_left if days_left > 0 else 0
+            })
         
         # Sort by profit per day
         opportunities.sort(key=lambda x: x['profit_per_day'], reverse=True)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test Cross-Platform Evaluation - Verify evaluate_pairs sizes every figure
+from the same contract quantity
+"""
+
+import numpy as np
+
+from config.cross_platform_config import CROSS_PLATFORM
+from core.fee_calculator import FeeCalculator
+from core.polymarket_client import walk_books
+from scan_cross_platform import CrossPlatformScanner
+
+# Evaluation only needs sizing and fees, not the API clients
+scanner = CrossPlatformScanner.__new__(CrossPlatformScanner)
+scanner.position_size = 5
+scanner.min_profit = 0.02
+scanner.fee_calc = FeeCalculator(volume_30d=0)
+
+print("="*70)
+print("🧪 CROSS-PLATFORM EVALUATION TEST")
+print("="*70 + "\n")
+
+# Kalshi YES 50¢ + Polymarket NO 35¢ = 0.85 per pair
+ev = scanner.evaluate_pairs([50], [55], [0.70], [0.35])
+gross, fees, net = ev["gross_profit"][0], ev["total_fees"][0], ev["net_profit"][0]
+print(f"[1] Combined cost ${ev['cost'][0]:.2f}, 5 contracts per leg")
+print(f"    Gross: ${gross:.4f}  Fees: ${fees:.4f}  Net: ${net:.4f}  ROI: {ev['roi'][0]:.2f}%")
+
+assert ev["combo"][0] == 0
+assert abs(ev["cost"][0] - 0.85) < 1e-9
+assert abs(gross - 0.75) < 1e-9
+# 5 Kalshi contracts at 7¢ + 2% of gross on Polymarket + gas
+assert abs(fees - (0.35 + 0.75 * 0.02 + 0.01)) < 1e-9
+assert abs(ev["roi"][0] - net * 100 / (0.85 * 5)) < 1e-9
+assert ev["profitable"][0]
+print("    ✅ profitable\n")
+
+# Pairs at or above $1.00, or missing a quote, never are
+ev = scanner.evaluate_pairs([50, 60, 0], [50, 45, 0], [0.50, 0.55, 0.30], [0.50, 0.45, 0.30])
+print(f"[2] Unprofitable / unquoted pairs: {ev['profitable'].tolist()}")
+assert not ev["profitable"].any()
+assert np.isneginf(ev["net_profit"][2])
+print("    ✅ rejected\n")
+
+# End to end through calculate_arb_opportunity at the configured size and
+# threshold, with fees from the Kalshi fee table
+scanner.position_size = CROSS_PLATFORM["position_size"]
+scanner.min_profit = CROSS_PLATFORM["min_profit_threshold"]
+scanner.enricher = None
+k_market = {"ticker": "KXTEST-26", "title": "Test market", "yes_ask": 50, "no_ask": 55}
+pm_market = {"condition_id": "0xtest", "question": "Test market?",
+             "tokens": [{"outcome": "Yes", "token_id": "yes-token"},
+                        {"outcome": "No", "token_id": "no-token"}]}
+opp = scanner.calculate_arb_opportunity(k_market, pm_market, {"yes-token": 0.70, "no-token": 0.35})
+print(f"[3] calculate_arb_opportunity at {scanner.position_size} contracts: "
+      f"{'net $%.4f' % opp.net_profit if opp else 'None'}")
+assert opp is not None
+assert opp.kalshi_side == "yes"
+assert opp.total_fees < opp.gross_profit
+assert opp.net_profit >= scanner.min_profit
+print("    ✅ reported\n")
+
+# The same Kalshi leg against a 70c Polymarket NO costs $1.20 and is not
+assert scanner.calculate_arb_opportunity(k_market, pm_market, {"yes-token": 0.70, "no-token": 0.70}) is None
+
+# The Polymarket leg is priced for the same 5 contracts: walking $5 instead
+# would take 50 shares of a 10¢ book (too shallow) or reach far up a ladder
+pm_books = {
+    "shallow": {"asks": [{"price": "0.10", "size": "8"}], "bids": []},
+    "ladder": {"asks": [{"price": "0.10", "size": "6"}, {"price": "0.30", "size": "100"}], "bids": []},
+}
+pm_market = {"tokens": [{"token_id": "shallow"}, {"token_id": "ladder"}]}
+prices = scanner.get_pm_prices([pm_market], pm_books)
+by_notional = walk_books(pm_books, scanner.position_size)
+print(f"[4] Polymarket VWAP for {scanner.position_size} shares: {prices}")
+assert abs(prices["shallow"] - 0.10) < 1e-9
+assert abs(prices["ladder"] - 0.10) < 1e-9
+assert not by_notional["shallow"]["complete"]
+assert by_notional["ladder"]["vwap"] > 0.2
+print("    ✅ both legs sized in contracts\n")
+
+print("All cross-platform evaluation checks passed ✅")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test Event Arbitrage - Verify basket sums, fees and the exhaustive-event
+check of EventArbitrageDetector
+"""
+
+import numpy as np
+
+import strategies.event_arb as event_arb
+from strategies.event_arb import EventArbitrageDetector
+
+detector = EventArbitrageDetector(volume_30d=0, quantity=10)
+
+print("="*70)
+print("🧪 EVENT ARBITRAGE TEST")
+print("="*70 + "\n")
+
+# Two events: three outcomes summing to 90¢ YES, two outcomes at 45¢/50¢
+event_idx = np.array([0, 0, 0, 1, 1])
+yes_cents = np.array([30, 30, 30, 45, 50])
+no_cents = np.array([72, 72, 72, 0, 52])
+result = detector.evaluate(event_idx, yes_cents, no_cents, 2, 10)
+
+yes = result["YES"]
+print(f"[1] YES baskets: cost {yes['cost'].tolist()}, fees {yes['fees'].tolist()}")
+assert np.allclose(yes["cost"], [9.0, 9.5])
+assert np.allclose(yes["payout"], [10.0, 10.0])
+assert np.allclose(yes["fees"], [3 * 0.70, 2 * 0.70])  # 7¢ per contract, 10 per leg
+assert np.allclose(yes["net_profit"], [10.0 - 9.0 - 2.10, 10.0 - 9.5 - 1.40])
+print("    ✅ sums and fees\n")
+
+no = result["NO"]
+print(f"[2] NO baskets: payout {no['payout'].tolist()}, complete {no['complete'].tolist()}")
+assert np.allclose(no["payout"], [20.0, 10.0])  # n - 1 legs pay
+assert no["complete"].tolist() == [True, False]
+assert np.isneginf(no["net_profit"][1])  # a leg without an offer can't be bought
+print("    ✅ payouts and missing legs\n")
+
+# YES baskets only on events known to be exhaustive
+def event(ticker, labels, catch_all=None):
+    markets = [{"ticker": f"{ticker}-{i}", "yes_sub_title": label, "yes_ask": 10, "no_ask": 95}
+               for i, label in enumerate(labels)]
+    if catch_all:
+        markets.append({"ticker": f"{ticker}-X", "yes_sub_title": catch_all, "yes_ask": 10, "no_ask": 95})
+    return {"event_ticker": ticker, "title": ticker, "mutually_exclusive": True, "markets": markets}
+
+closed_field = event("OSCARS", ["Film A", "Film B", "Film C"], catch_all="Other")
+open_field = event("PRIMARY", ["Candidate A", "Candidate B", "Candidate C", "Candidate D"])
+assert EventArbitrageDetector.is_exhaustive(closed_field)
+assert not EventArbitrageDetector.is_exhaustive(open_field)
+
+# Every leg quoted at 10¢ YES with 100 contracts resting
+fetch_orderbooks = event_arb.fetch_orderbooks
+event_arb.fetch_orderbooks = lambda tickers, **kwargs: {
+    t: {"orderbook": {"yes": [[10, 100]], "no": []}} for t in tickers
+}
+opps = detector.find_opportunities(events=[closed_field, open_field])
+print(f"[3] Default scan: {[(o['event_ticker'], o['side']) for o in opps]}")
+assert [(o["event_ticker"], o["side"]) for o in opps] == [("OSCARS", "YES")]
+assert not opps[0]["requires_exhaustive"]
+
+detector.include_non_exhaustive = True
+opps = detector.find_opportunities(events=[closed_field, open_field])
+tagged = {o["event_ticker"]: o["requires_exhaustive"] for o in opps}
+print(f"[4] include_non_exhaustive: {tagged}")
+assert tagged == {"OSCARS": False, "PRIMARY": True}
+print("    ✅ YES baskets need a catch-all outcome\n")
+event_arb.fetch_orderbooks = fetch_orderbooks
+
+print("All event arbitrage checks passed ✅")
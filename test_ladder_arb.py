@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test Ladder Arbitrage - Verify the segmented running minimum, strike
+parsing and hedge selection of LadderArbitrageDetector
+"""
+
+import numpy as np
+
+from strategies.ladder_arb import NO_OFFER, LadderArbitrageDetector, parse_strike, segmented_running_min
+
+print("="*70)
+print("🧪 LADDER ARBITRAGE TEST")
+print("="*70 + "\n")
+
+# Running minimum restarts at every run; ties keep the earliest position
+values = np.array([5, 3, 4, 1, 9, 7, 8, 2, 2, NO_OFFER, 6])
+runs = np.array([0, 0, 0, 0, 1, 1, 1, 2, 2, 3, 3])
+best = segmented_running_min(values, runs)
+print(f"[1] {values.tolist()} / runs {runs.tolist()} -> {best.tolist()}")
+assert best.tolist() == [0, 1, 1, 3, 4, 5, 5, 7, 7, 9, 10]
+
+# Same as a plain loop on random input
+rng = np.random.default_rng(7)
+for _ in range(50):
+    n = int(rng.integers(1, 60))
+    values = rng.integers(0, NO_OFFER + 1, n)
+    runs = np.sort(rng.integers(0, 6, n))
+    expected, start = [], 0
+    for i in range(n):
+        if i and runs[i] != runs[i - 1]:
+            start = i
+        expected.append(start + int(np.argmin(values[start:i + 1])))
+    assert segmented_running_min(values, runs).tolist() == expected
+print("    ✅ matches the loop on random runs\n")
+
+assert parse_strike({"strike_type": "greater", "floor_strike": 100}) == ("greater", 100.0, np.inf)
+assert parse_strike({"ticker": "KXBTCD-26JAN01-T99999.99", "title": "Bitcoin above $100,000?"}) \
+    == ("greater", 99999.99, np.inf)
+assert parse_strike({"ticker": "KXBTC-26JAN01-B100250", "subtitle": "$100,000 to $100,499.99"}) \
+    == ("between", 100000.0, 100499.99)
+assert parse_strike({"ticker": "KXFOO-1", "title": "Will it rain?"}) is None
+print("[2] ✅ strike parsing\n")
+
+# One ladder: "above 100" must cost at least "above 110" and the bracket
+# 120-130 inside it, so its YES plus their cheapest NO pays $1 at least
+detector = LadderArbitrageDetector(volume_30d=0, quantity=10)
+close = "2026-01-01T00:00:00Z"
+markets = [
+    {"ticker": "KXBTCD-A-T100", "series_ticker": "KXBTCD", "close_time": close,
+     "strike_type": "greater", "floor_strike": 100, "yes_ask": 40, "no_ask": 62},
+    {"ticker": "KXBTCD-A-T110", "series_ticker": "KXBTCD", "close_time": close,
+     "strike_type": "greater", "floor_strike": 110, "yes_ask": 52, "no_ask": 50},
+    {"ticker": "KXBTC-A-B125", "series_ticker": "KXBTC", "close_time": close,
+     "strike_type": "between", "floor_strike": 120, "cap_strike": 130, "yes_ask": 80, "no_ask": 45},
+    # Another expiry: never hedges the first ladder
+    {"ticker": "KXBTCD-B-T105", "series_ticker": "KXBTCD", "close_time": "2026-02-01T00:00:00Z",
+     "strike_type": "greater", "floor_strike": 105, "yes_ask": 30, "no_ask": 5},
+]
+ladders = detector.build_ladders(markets)
+result = detector.detect(ladders, ladders["yes_ask"], ladders["no_ask"], 10)
+pairs = {(markets[y]["ticker"], markets[n]["ticker"]) for y, n in zip(result["yes_leg"], result["no_leg"])}
+print(f"[3] Hedges: {sorted(pairs)}")
+assert ("KXBTCD-A-T100", "KXBTC-A-B125") in pairs
+assert not any(n == "KXBTCD-B-T105" for _, n in pairs)
+assert not any(y == "KXBTCD-B-T105" for y, _ in pairs)  # top rung of its ladder
+
+best = [i for i, (y, n) in enumerate(zip(result["yes_leg"], result["no_leg"]))
+        if markets[y]["ticker"] == "KXBTCD-A-T100"][0]
+assert abs(result["cost"][best] - (40 + 45) / 100 * 10) < 1e-9
+assert abs(result["fees"][best] - 2 * 0.70) < 1e-9
+assert abs(result["net_profit"][best] - (10 - 8.5 - 1.4)) < 1e-9
+print("    ✅ cheapest contained NO and pair profit\n")
+
+print("All ladder arbitrage checks passed ✅")
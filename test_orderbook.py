@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test OrderBook - Verify snapshot loading, deltas, implied bids, depth and VWAP
+"""
+
+from core.orderbook import OrderBook
+
+print("="*70)
+print("🧪 ORDERBOOK TEST")
+print("="*70 + "\n")
+
+book = OrderBook.from_json({"orderbook": {
+    "yes": [[45, 10], [40, 5], [0, 7], [100, 7], [50, 0]],  # out-of-range and empty levels dropped
+    "no": [[58, 20], [60, 30]],
+}})
+print(f"[1] Snapshot: {book.to_json()}")
+assert book.to_json() == {"yes": [[40, 5], [45, 10]], "no": [[58, 20], [60, 30]]}
+assert book.best_yes_ask == 40 and book.best_no_ask == 58
+assert book.levels("yes") == 2 and book.levels("no") == 2
+print("    ✅ loaded\n")
+
+# Selling NO at p is bidding YES at 100 - p (and vice versa)
+print(f"[2] Implied YES bids: {book.implied_yes_bids()}  NO bids: {book.implied_no_bids()}")
+assert book.best_yes_bid == 42 and book.best_no_bid == 60
+assert book.implied_yes_bids() == [[42, 20], [40, 30]]
+assert book.implied_no_bids() == [[60, 5], [55, 10]]
+print("    ✅ implied bids\n")
+
+# Deltas: a better price becomes the best, emptying the best level falls back
+book.apply_delta("yes", 38, 4)
+assert book.best_yes_ask == 38 and book.best_no_bid == 62
+book.apply_delta("yes", 38, -10)  # clamped at zero
+assert book.size_at("yes", 38) == 0 and book.best_yes_ask == 40
+book.apply_delta("yes", 40, -5)
+assert book.best_yes_ask == 45
+book.apply_delta("no", 99, 1)
+book.apply_delta("no", 100, 1)  # outside 1-99, ignored
+assert book.to_json()["no"] == [[58, 20], [60, 30], [99, 1]]
+print(f"[3] After deltas: {book.to_json()}")
+print("    ✅ deltas\n")
+
+# Depth and VWAP walk the ladder from the best ask
+assert book.depth("no") == 51 and book.depth("no", limit=59) == 20
+vwap, filled = book.vwap("no", 30)
+assert filled == 30 and abs(vwap - (20 * 58 + 10 * 60) / 30) < 1e-9
+vwap, filled = book.vwap("no", 100)
+assert filled == 51
+assert OrderBook().vwap("yes", 5) == (None, 0)
+# Cumulative depth is rebuilt after a change
+book.apply_delta("no", 58, 5)
+assert book.depth("no", limit=58) == 25
+print(f"[4] Depth/VWAP: NO depth {book.depth('no')}, VWAP(30) {book.vwap('no', 30)[0]:.2f}¢")
+print("    ✅ depth and VWAP\n")
+
+empty = OrderBook.from_json(None)
+assert empty.is_empty and empty.best_yes_bid is None and empty.best_no_ask is None
+
+print("All orderbook checks passed ✅")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test Probability Arbitrage Prefilter - Verify which /markets quotes get an
+orderbook check
+"""
+
+from strategies.probability_arb import ProbabilityArbitrageDetector
+
+detector = ProbabilityArbitrageDetector(min_deviation_pct=1.0, volume_30d=0, prefilter_margin_cents=2)
+
+print("="*70)
+print("🧪 PROBABILITY ARBITRAGE PREFILTER TEST")
+print("="*70 + "\n")
+
+# At 7¢ per contract per side, a pair nets 1 - (YES + NO) - 0.14, so with a
+# 2¢ margin the quotes may sum to at most 88¢
+def market(ticker, yes_ask, no_ask):
+    return ({"ticker": ticker, "yes_ask": yes_ask, "no_ask": no_ask}, 5.0)
+
+candidates = [
+    market("ARB", 40, 45),        # 85¢: a real arb after fees
+    market("NEAR", 43, 44),       # 87¢: 1¢ short of an arb, inside the margin
+    market("OUTSIDE", 44, 45),    # 89¢: 3¢ short, just outside the margin
+    market("FAIR", 50, 52),       # 102¢: no arb
+    market("NO-OFFER", 30, 0),    # NO side not quoted
+]
+kept = [m["ticker"] for m, _ in detector.prefilter(candidates, quantity=100)]
+print(f"[1] Margin 2¢: kept {kept}")
+assert "ARB" in kept
+print("    ✅ known deviation survives")
+assert "NEAR" in kept
+assert "OUTSIDE" not in kept
+print("    ✅ market just outside the margin pruned")
+assert "FAIR" not in kept and "NO-OFFER" not in kept
+print("    ✅ fair and unquoted markets pruned\n")
+
+# Widening the margin lets the 3¢-short market through
+detector.prefilter_margin_cents = 4
+kept = [m["ticker"] for m, _ in detector.prefilter(candidates, quantity=100)]
+print(f"[2] Margin 4¢: kept {kept}")
+assert "OUTSIDE" in kept and "FAIR" not in kept
+print("    ✅ margin respected\n")
+
+# None turns the prefilter off: every candidate gets an orderbook check
+detector.prefilter_margin_cents = None
+kept = detector.prefilter(candidates, quantity=100)
+print(f"[3] Margin None: kept {len(kept)} of {len(candidates)}")
+assert kept == candidates
+assert detector.prefilter([], quantity=100) == []
+print("    ✅ prefilter off\n")
+
+print("All probability arbitrage prefilter checks passed ✅")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test Book Walking - Verify walk_books VWAPs across many Polymarket books
+"""
+
+from core.polymarket_client import book_levels, walk_books
+
+def book(asks=(), bids=()):
+    return {"asks": [{"price": str(p), "size": str(s)} for p, s in asks],
+            "bids": [{"price": str(p), "size": str(s)} for p, s in bids]}
+
+print("="*70)
+print("🧪 BOOK WALKING TEST")
+print("="*70 + "\n")
+
+# Levels come back best first; malformed and empty levels are skipped
+raw = {"asks": [{"price": "0.60", "size": "10"}, {"price": "0.50", "size": "4"},
+                {"price": "0.55", "size": "0"}, {"price": "bad", "size": "1"}, {"size": "3"}],
+       "bids": [{"price": "0.40", "size": "5"}, {"price": "0.45", "size": "2"}]}
+assert book_levels(raw) == [(0.50, 4.0), (0.60, 10.0)]
+assert book_levels(raw, "SELL") == [(0.45, 2.0), (0.40, 5.0)]
+assert book_levels(None) == []
+print("[1] ✅ book_levels ordering and filtering\n")
+
+books = {
+    "deep": book(asks=[(0.50, 100)]),
+    "two-levels": book(asks=[(0.60, 10), (0.50, 4)]),  # $2 at 0.50, then 0.60
+    "thin": book(asks=[(0.40, 5)]),                    # only $2 on offer
+    "empty": book(),
+    "bids": book(bids=[(0.45, 2), (0.40, 20)]),
+}
+fills = walk_books(books, 5.0)
+for token, fill in fills.items():
+    print(f"    {token:<11} {fill}")
+
+assert abs(fills["deep"]["vwap"] - 0.50) < 1e-9 and fills["deep"]["complete"]
+assert abs(fills["deep"]["filled_size"] - 10.0) < 1e-9
+
+# $2 buys 4 shares at 0.50, the other $3 buys 5 shares at 0.60
+two = fills["two-levels"]
+assert abs(two["filled_size"] - 9.0) < 1e-9
+assert abs(two["vwap"] - 5.0 / 9.0) < 1e-9
+assert two["worst_price"] == 0.60 and two["complete"]
+
+thin = fills["thin"]
+assert not thin["complete"]
+assert abs(thin["filled_notional"] - 2.0) < 1e-9 and abs(thin["vwap"] - 0.40) < 1e-9
+
+assert fills["empty"]["vwap"] is None and not fills["empty"]["complete"]
+assert fills["bids"]["vwap"] is None  # BUY walks asks only
+print("[2] ✅ BUY walk\n")
+
+# SELL walks bids downward for the notional to receive
+sell = walk_books({"bids": books["bids"]}, 2.0, "SELL")["bids"]
+assert abs(sell["filled_size"] - (2 + 1.1 / 0.40)) < 1e-9
+assert sell["worst_price"] == 0.40 and sell["complete"]
+print("[3] ✅ SELL walk\n")
+
+# Walking a share quantity instead of a notional
+fills = walk_books(books, quantity=9)
+assert abs(fills["two-levels"]["filled_notional"] - (4 * 0.50 + 5 * 0.60)) < 1e-9
+assert fills["two-levels"]["complete"] and not fills["thin"]["complete"]
+assert fills["thin"]["filled_size"] == 5.0
+print("[4] ✅ quantity walk\n")
+
+assert walk_books({}, 5.0) == {}
+
+print("All book walking checks passed ✅")